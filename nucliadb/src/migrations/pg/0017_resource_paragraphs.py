@@ -0,0 +1,36 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from nucliadb.common.maindb.pg import PGTransaction
+
+
+async def migrate(txn: PGTransaction) -> None:
+    """
+    Add a `paragraphs` column to kb_resources with the number of indexed
+    paragraphs of each field of the resource, as a JSONB object
+    {field_key: count}. It's maintained at index time and lets the rebalancer
+    pick resources to move without asking nidx for their paragraph count.
+
+    NULL means the resource has not been indexed since this column exists.
+    """
+    async with txn.connection.cursor() as cur:
+        await cur.execute("""
+            ALTER TABLE kb_resources ADD COLUMN IF NOT EXISTS paragraphs JSONB;
+        """)
@@ -0,0 +1,48 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from nucliadb.common.maindb.pg import PGTransaction
+
+
+async def migrate(txn: PGTransaction) -> None:
+    """
+    Create tus_uploads table to store the state of ongoing TUS uploads in maindb.
+
+    The upload offset has its own column so appends can advance it with a
+    compare-and-swap, and `reserved_until` lets an append reserve the offset
+    before writing its data to storage. The table is UNLOGGED, like distributed_locks, as the state
+    is short lived: an upload lost on a crash just needs to be restarted.
+    """
+    async with txn.connection.cursor() as cur:
+        await cur.execute("""
+            CREATE UNLOGGED TABLE IF NOT EXISTS tus_uploads (
+                upload_id TEXT PRIMARY KEY,
+                upload_offset BIGINT NOT NULL,
+                data JSONB NOT NULL,
+                expires_at DOUBLE PRECISION NOT NULL,
+                reserved_until DOUBLE PRECISION NOT NULL DEFAULT 0
+            );
+        """)
+
+        # Index on expires_at to efficiently find expired uploads for cleanup
+        await cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tus_uploads_expires_at
+            ON tus_uploads(expires_at);
+        """)
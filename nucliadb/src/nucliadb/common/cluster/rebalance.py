@@ -21,7 +21,6 @@ import asyncio
 import dataclasses
 import logging
 import math
-import random
 from typing import cast
 
 from grpc import StatusCode
@@ -49,6 +48,9 @@ REBALANCE_LOCK = "rebalance"
 
 MAX_MOVES_PER_SHARD = 100
 
+# Max number of resources considered on every batch of moves
+MAX_RESOURCES_PER_BATCH = 1000
+
 
 @dataclasses.dataclass
 class RebalanceShard:
@@ -98,35 +100,51 @@ class Rebalancer:
         self, from_shard: RebalanceShard, to_shard: RebalanceShard, max_paragraphs: int
     ) -> int:
         """
-        Takes random resources from the source shard and tries to move at most max_paragraphs.
-        It stops moving paragraphs until the are no more resources to move.
-        """
-        moved_paragraphs = 0
+        Takes resources from the source shard and tries to move at most max_paragraphs.
 
-        resources_batch: list[str] = []
+        Resources are chosen in order using the paragraph counts stored in maindb
+        at index time so a whole batch that fills the target capacity is picked
+        at once, and then they are moved concurrently. It stops moving paragraphs
+        when there are no more resources to move or none of them could be moved.
+        """
+        assert self.kb_shards is not None
+        from_shard_obj = next(s for s in self.kb_shards.shards if s.shard == from_shard.id)
+        to_shard_obj = next(s for s in self.kb_shards.shards if s.shard == to_shard.id)
+        semaphore = asyncio.Semaphore(settings.rebalance_max_concurrent_moves)
+
+        async def _move(resource_id: str) -> bool:
+            async with semaphore:
+                return await move_resource_to_shard(
+                    self.context, self.kbid, resource_id, from_shard_obj, to_shard_obj
+                )
 
+        moved_paragraphs = 0
+        last_resource_id = None
         while moved_paragraphs < max_paragraphs:
-            if len(resources_batch) == 0:
-                resources_batch = await get_resources_from_shard(
-                    self.context.kv_driver, self.kbid, from_shard.id, n=100
+            capacity = max_paragraphs - moved_paragraphs
+            candidates = await get_resources_to_move(
+                self.context.kv_driver,
+                self.kbid,
+                from_shard.id,
+                n=MAX_RESOURCES_PER_BATCH,
+                after=last_resource_id,
+            )
+            if len(candidates) == 0:
+                # No more resources to move or shard not found
+                break
+
+            to_move = await fill_capacity(candidates, from_shard.nidx_id, capacity)
+            last_resource_id = to_move[-1][0]
+            moved = await asyncio.gather(*(_move(resource_id) for resource_id, _ in to_move))
+            if not any(moved):
+                logger.warning(
+                    "Could not move any resource, stop moving paragraphs",
+                    extra={"kbid": self.kbid, "shard": from_shard.to_dict()},
                 )
-                if len(resources_batch) == 0:
-                    # No more resources to move or shard not found
-                    break
-
-            # Take a random resource to move
-            resource_id = random.choice(resources_batch)
-
-            assert self.kb_shards is not None
-            from_shard_obj = next(s for s in self.kb_shards.shards if s.shard == from_shard.id)
-            to_shard_obj = next(s for s in self.kb_shards.shards if s.shard == to_shard.id)
-            paragraphs_count = await get_resource_paragraphs_count(resource_id, from_shard.nidx_id)
-            moved = await move_resource_to_shard(
-                self.context, self.kbid, resource_id, from_shard_obj, to_shard_obj
+                break
+            moved_paragraphs += sum(
+                paragraphs for (_, paragraphs), was_moved in zip(to_move, moved) if was_moved
             )
-            if moved:
-                resources_batch.remove(resource_id)
-                moved_paragraphs += paragraphs_count
 
         return moved_paragraphs
 
@@ -359,6 +377,66 @@ async def get_resources_from_shard(driver: Driver, kbid: str, shard_id: str, n:
         return rids
 
 
+async def get_resources_to_move(
+    driver: Driver, kbid: str, shard_id: str, n: int, after: str | None = None
+) -> list[tuple[str, int | None]]:
+    """
+    Return the next `n` resources of a shard ordered by id, starting after the
+    given one, with their paragraph count.
+
+    Paragraph counts are maintained at index time. Resources not indexed since
+    then have an unknown (None) count.
+    """
+    driver = cast(PGDriver, driver)
+    query = """
+        SELECT
+            rid,
+            CASE
+                WHEN paragraphs IS NULL THEN NULL
+                ELSE COALESCE((SELECT SUM(value::int) FROM jsonb_each_text(paragraphs)), 0)
+            END AS total
+        FROM kb_resources
+        WHERE kbid = %(kbid)s AND shard = %(shard)s
+    """
+    if after is not None:
+        query += " AND rid > %(after)s"
+    query += " ORDER BY rid LIMIT %(n)s;"
+    async with driver._get_connection() as conn:
+        cur = conn.cursor("")
+        await cur.execute(query, {"kbid": kbid, "shard": shard_id, "after": after, "n": n})
+        records = await cur.fetchall()
+        return [(datamanagers.resources._to_rid(rid), total) for rid, total in records]
+
+
+async def fill_capacity(
+    candidates: list[tuple[str, int | None]], nidx_shard_id: str, capacity: int
+) -> list[tuple[str, int]]:
+    """
+    Choose resources from candidates, in order, until capacity is filled.
+
+    Unknown counts are fetched from nidx a few at a time and only until the
+    capacity is filled, so the rest of candidates are never counted.
+    """
+    chunk_size = settings.rebalance_max_concurrent_moves
+    chosen: list[tuple[str, int]] = []
+    total = 0
+    for start in range(0, len(candidates), chunk_size):
+        chunk = candidates[start : start + chunk_size]
+        unknown = [resource_id for resource_id, paragraphs in chunk if paragraphs is None]
+        counted = await asyncio.gather(
+            *(get_resource_paragraphs_count(resource_id, nidx_shard_id) for resource_id in unknown)
+        )
+        counts = dict(zip(unknown, counted))
+        for resource_id, paragraphs in chunk:
+            if paragraphs is None:
+                paragraphs = counts[resource_id]
+            chosen.append((resource_id, paragraphs))
+            total += paragraphs
+            if total >= capacity:
+                return chosen
+    return chosen
+
+
 async def get_resource_paragraphs_count(resource_id: str, nidx_shard_id: str) -> int:
     # Do a search on the fields (paragraph) index and return the number of paragraphs this resource has
     try:
@@ -45,16 +45,14 @@ from nucliadb_utils.utilities import has_feature
 
 from .utils import (
     delete_resource_from_shard,
+    get_nats_consumer_pending_messages,
     get_resource,
     get_rollover_resource_index_message,
     index_resource_to_shard,
-    wait_for_nidx,
 )
 
 logger = logging.getLogger(__name__)
 
-resource_index_semaphore = asyncio.Semaphore(settings.max_concurrent_rollover_resources)
-
 
 class UnexpectedRolloverError(Exception):
     pass
@@ -236,6 +234,10 @@ async def index_to_rollover_index(
 ) -> None:
     """
     Indexes all data in a kb in rollover indexes. This happens before the cutover.
+
+    Resources are read ahead of a pool of indexing workers, progress is
+    recorded in batched transactions and workers are paused while nidx is
+    too far behind.
     """
     extra = {"kbid": kbid, "external_index_provider": None}
     if external is not None:
@@ -253,20 +255,34 @@ async def index_to_rollover_index(
 
     logger.info("Indexing to rollover index", extra=extra)
     # now index on all new shards only
-    while True:
-        async with datamanagers.with_transaction() as txn:
-            resource_ids = await datamanagers.rollover.get_to_index(
-                txn, kbid=kbid, count=settings.max_concurrent_rollover_resources
+    concurrency = settings.max_concurrent_rollover_resources
+    queue: asyncio.Queue[tuple[str, str | None] | None] = asyncio.Queue(
+        maxsize=settings.rollover_prefetch_resources
+    )
+    throttle = _IndexingThrottle(app_context, max_pending=settings.rollover_max_nidx_pending)
+    bookkeeping = _RolloverBookkeeping(kbid, batch_size=settings.rollover_bookkeeping_batch_size)
+
+    throttle_task = asyncio.create_task(throttle.run())
+    tasks = [asyncio.create_task(_read_resources_to_index(kbid, queue, workers=concurrency))]
+    for _ in range(concurrency):
+        tasks.append(
+            asyncio.create_task(
+                _rollover_index_worker(
+                    app_context, rollover_shards, kbid, queue, throttle, bookkeeping, external
+                )
             )
-        if resource_ids is None:
-            break
-
-        batch = [
-            _index_resource_to_rollover_index(app_context, rollover_shards, kbid, rid, external)
-            for rid in resource_ids
-        ]
-        await asyncio.gather(*batch)
-        await wait_for_indexing_to_catch_up(app_context)
+        )
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            # raise the first error found, if any
+            task.result()
+    finally:
+        for task in [throttle_task, *tasks]:
+            task.cancel()
+        await asyncio.gather(throttle_task, *tasks, return_exceptions=True)
+        # record whatever got indexed so a retry does not need to index it again
+        await bookkeeping.flush()
 
     async with datamanagers.with_transaction() as txn:
         state.resources_indexed = True
@@ -275,20 +291,139 @@ async def index_to_rollover_index(
         await txn.commit()
 
 
-async def wait_for_indexing_to_catch_up(app_context: ApplicationContext):
-    try:
-        app_context.nats_manager
-    except AssertionError:
-        logger.warning("Nats manager not initialized. Cannot wait for indexing to catch up")
-        return
-    max_pending = 1000
+async def _read_resources_to_index(
+    kbid: str, queue: asyncio.Queue[tuple[str, str | None] | None], workers: int
+) -> None:
+    """
+    Feeds the indexing workers with the resources pending to be indexed and
+    their shards, reading them in pages. A `None` is sent to every worker once
+    everything has been read.
+    """
+    after = None
     while True:
+        async with datamanagers.with_ro_transaction() as txn:
+            resource_ids = await datamanagers.rollover.get_to_index(
+                txn, kbid=kbid, count=settings.rollover_prefetch_resources, after=after
+            )
+            if resource_ids is None:
+                break
+            shards = await datamanagers.resources.get_shards(txn, kbid=kbid, rids=resource_ids)
+        for resource_id in resource_ids:
+            await queue.put((resource_id, shards.get(resource_id)))
+        after = resource_ids[-1]
+
+    for _ in range(workers):
+        await queue.put(None)
+
+
+async def _rollover_index_worker(
+    app_context: ApplicationContext,
+    rollover_shards: writer_pb2.Shards,
+    kbid: str,
+    queue: asyncio.Queue[tuple[str, str | None] | None],
+    throttle: "_IndexingThrottle",
+    bookkeeping: "_RolloverBookkeeping",
+    external: ExternalIndexManager | None = None,
+) -> None:
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        resource_id, shard_id = item
+        await throttle.wait()
+        await _index_resource_to_rollover_index(
+            app_context, rollover_shards, kbid, resource_id, shard_id, bookkeeping, external
+        )
+
+
+class _IndexingThrottle:
+    """
+    Keeps track of nidx pending messages in the background and lets the
+    indexing workers through only while nidx is keeping up.
+    """
+
+    def __init__(
+        self, app_context: ApplicationContext, max_pending: int, poll_interval_seconds: float = 5
+    ):
+        self.app_context = app_context
+        self.max_pending = max_pending
+        self.poll_interval_seconds = poll_interval_seconds
+        self.ready = asyncio.Event()
+        self.ready.set()
+
+    async def wait(self) -> None:
+        await self.ready.wait()
+
+    async def run(self) -> None:
         try:
-            await wait_for_nidx(app_context.nats_manager, max_wait_seconds=60, max_pending=max_pending)
+            nats_manager = self.app_context.nats_manager
+        except AssertionError:
+            logger.warning("Nats manager not initialized. Cannot wait for indexing to catch up")
             return
-        except asyncio.TimeoutError:
-            logger.warning(f"Nidx is behind more than {max_pending} messages. Throttling rollover.")
-            await asyncio.sleep(30)
+        while True:
+            try:
+                pending = await get_nats_consumer_pending_messages(
+                    nats_manager, stream="nidx", consumer="nidx"
+                )
+            except Exception:
+                logger.warning("Could not get nidx pending messages", exc_info=True)
+            else:
+                if pending < self.max_pending:
+                    self.ready.set()
+                elif self.ready.is_set():
+                    logger.warning(
+                        f"Nidx is behind more than {self.max_pending} messages. Throttling rollover."
+                    )
+                    self.ready.clear()
+            await asyncio.sleep(self.poll_interval_seconds)
+
+
+class _RolloverBookkeeping:
+    """
+    Records indexed and removed resources in batches instead of using one
+    transaction per resource. Records not flushed are indexed again when the
+    rollover is resumed.
+    """
+
+    def __init__(self, kbid: str, batch_size: int):
+        self.kbid = kbid
+        self.batch_size = batch_size
+        self.indexed: list[tuple[str, str, int]] = []
+        self.removed: list[str] = []
+        self.lock = asyncio.Lock()
+
+    async def add_indexed(self, resource_id: str, shard_id: str, modification_time: int) -> None:
+        self.indexed.append((resource_id, shard_id, modification_time))
+        await self._maybe_flush()
+
+    async def remove(self, resource_id: str) -> None:
+        self.removed.append(resource_id)
+        await self._maybe_flush()
+
+    async def _maybe_flush(self) -> None:
+        if len(self.indexed) + len(self.removed) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self.lock:
+            indexed, self.indexed = self.indexed, []
+            removed, self.removed = self.removed, []
+            if not indexed and not removed:
+                return
+            async with datamanagers.with_transaction() as txn:
+                for resource_id, shard_id, modification_time in indexed:
+                    await datamanagers.rollover.add_indexed(
+                        txn,
+                        kbid=self.kbid,
+                        resource_id=resource_id,
+                        shard_id=shard_id,
+                        modification_time=modification_time,
+                    )
+                for resource_id in removed:
+                    await datamanagers.rollover.remove_to_index(
+                        txn, kbid=self.kbid, resource=resource_id
+                    )
+                await txn.commit()
 
 
 async def _index_resource_to_rollover_index(
@@ -296,55 +431,46 @@ async def _index_resource_to_rollover_index(
     rollover_shards: writer_pb2.Shards,
     kbid: str,
     resource_id: str,
+    shard_id: str | None,
+    bookkeeping: _RolloverBookkeeping,
     external: ExternalIndexManager | None = None,
 ) -> None:
-    async with resource_index_semaphore:
-        async with datamanagers.with_transaction() as txn:
-            shard_id = await datamanagers.resources.get_shard(txn, kbid=kbid, rid=resource_id)
-        if shard_id is None:
-            logger.warning(
-                "Shard id not found for resource. Skipping indexing as it may have been deleted",
-                extra={"kbid": kbid, "resource_id": resource_id},
-            )
-            async with datamanagers.with_transaction() as txn:
-                await datamanagers.rollover.remove_to_index(txn, kbid=kbid, resource=resource_id)
-                await txn.commit()
-            return
+    if shard_id is None:
+        logger.warning(
+            "Shard id not found for resource. Skipping indexing as it may have been deleted",
+            extra={"kbid": kbid, "resource_id": resource_id},
+        )
+        await bookkeeping.remove(resource_id)
+        return
 
-        shard = _get_shard(rollover_shards, shard_id)
-        if shard is None:  # pragma: no cover
-            logger.error(
-                "Shard not found for resource",
-                extra={"kbid": kbid, "resource_id": resource_id, "shard_id": shard_id},
-            )
-            raise UnexpectedRolloverError(
-                f"Shard {shard_id} not found. Was a new one created during migration?"
-            )
-        resource = await get_resource(kbid, resource_id)
-        index_message = await get_rollover_resource_index_message(kbid, resource_id)
-        if resource is None or index_message is None:
-            # resource no longer existing, remove indexing and carry on
-            async with datamanagers.with_transaction() as txn:
-                await datamanagers.rollover.remove_to_index(txn, kbid=kbid, resource=resource_id)
-                await txn.commit()
-            return
+    shard = _get_shard(rollover_shards, shard_id)
+    if shard is None:  # pragma: no cover
+        logger.error(
+            "Shard not found for resource",
+            extra={"kbid": kbid, "resource_id": resource_id, "shard_id": shard_id},
+        )
+        raise UnexpectedRolloverError(
+            f"Shard {shard_id} not found. Was a new one created during migration?"
+        )
+    resource = await get_resource(kbid, resource_id)
+    index_message = await get_rollover_resource_index_message(kbid, resource_id)
+    if resource is None or index_message is None:
+        # resource no longer existing, remove indexing and carry on
+        await bookkeeping.remove(resource_id)
+        return
 
-        if external is not None:
-            await external.index_resource(resource_id, index_message, to_rollover_indexes=True)
-        else:
-            await index_resource_to_shard(
-                app_context, kbid, resource_id, shard, resource_index_message=index_message
-            )
+    if external is not None:
+        await external.index_resource(resource_id, index_message, to_rollover_indexes=True)
+    else:
+        await index_resource_to_shard(
+            app_context, kbid, resource_id, shard, resource_index_message=index_message
+        )
 
-        async with datamanagers.with_transaction() as txn:
-            await datamanagers.rollover.add_indexed(
-                txn,
-                kbid=kbid,
-                resource_id=resource_id,
-                shard_id=shard_id,
-                modification_time=_to_ts(resource.basic.modified.ToDatetime()),  # type: ignore
-            )
-            await txn.commit()
+    await bookkeeping.add_indexed(
+        resource_id,
+        shard_id,
+        _to_ts(resource.basic.modified.ToDatetime()),  # type: ignore
+    )
 
 
 async def cutover_index(
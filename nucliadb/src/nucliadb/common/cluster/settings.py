@@ -51,6 +51,12 @@ class Settings(BaseSettings):
         description="Maximum number of entity labels (/e/) per field that are indexed (excess is not indexed)",
     )
 
+    rebalance_max_concurrent_moves: int = Field(
+        default=10,
+        title="Rebalance max concurrent moves",
+        description="Maximum number of resources moved concurrently between shards while rebalancing",
+    )
+
     nidx_api_address: str | None = Field(default=None, description="NIDX gRPC API address")
     nidx_searcher_address: str | None = Field(default=None, description="NIDX gRPC searcher API address")
     nidx_indexer_address: str | None = Field(default=None, description="NIDX gRPC indexer API address")
@@ -41,6 +41,7 @@ from . import (
     rollover,
     search_configurations,
     synonyms,
+    tus_uploads,
     vectorsets,
 )
 from .utils import with_ro_transaction, with_rw_transaction, with_transaction
@@ -58,6 +59,7 @@ __all__ = (
     "rollover",
     "search_configurations",
     "synonyms",
+    "tus_uploads",
     "vectorsets",
     "with_ro_transaction",
     "with_rw_transaction",
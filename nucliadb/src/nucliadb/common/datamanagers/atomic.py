@@ -85,7 +85,10 @@ class kb:
 class resources:
     get_rid = ro_txn_wrap(resources_dm.get_rid)
     exists = ro_txn_wrap(resources_dm.exists)
+    exists_many = ro_txn_wrap(resources_dm.exists_many)
     slug_exists = ro_txn_wrap(resources_dm.slug_exists)
+    existing_slugs = ro_txn_wrap(resources_dm.existing_slugs)
+    get_version = ro_txn_wrap(resources_dm.get_version)
     get_all_field_ids = ro_txn_wrap(fields_dm.get_all_field_ids)
     count = ro_txn_wrap(resources_dm.count)
 
@@ -29,14 +29,18 @@ Each row represents one resource in a knowledge box and stores:
   - origin         - serialised resources_pb2.Origin
   - security       - serialised resources_pb2.Security
   - extra          - serialised resources_pb2.Extra
+  - paragraphs     - indexed paragraph count per field key (JSONB, migration 0017)
 """
 
+import builtins
 import logging
 import uuid
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Final, Literal, TypeAlias, cast
 
+import orjson
 import psycopg.errors
 import psycopg.sql
 from typing_extensions import assert_never
@@ -74,6 +78,15 @@ class ResourceData:
     extra: resources_pb2.Extra | None = UNSET_EXTRA
 
 
+@dataclass(slots=True)
+class ResourceVersion:
+    # Opaque identifier that changes whenever the resource or any of its fields
+    # are written
+    version: str
+    # Last modification (or creation) date of the resource basic metadata, if any
+    modified: datetime | None
+
+
 ResourceColumnValueType = (
     str
     | None
@@ -290,6 +303,41 @@ async def delete(txn: Transaction, *, kbid: str, rid: str) -> None:
         )
 
 
+@observer.wrap({"type": "resources", "op": "update_paragraph_counts"})
+async def update_paragraph_counts(
+    txn: Transaction,
+    *,
+    kbid: str,
+    rid: str,
+    counts: dict[str, int],
+    deleted: list[str],
+    appended: dict[str, int] | None = None,
+) -> None:
+    """Update the indexed paragraph counts of a resource. `counts` maps field
+    keys (e.g. "t/text") to its number of paragraphs, `appended` maps field
+    keys to a number of paragraphs added to the stored count and `deleted`
+    lists field keys whose paragraphs have been removed from the index.
+    """
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "UPDATE kb_resources "
+            "SET paragraphs = (COALESCE(paragraphs, '{}'::jsonb) - %(deleted)s::text[]) || %(counts)s::jsonb || ("
+            "  SELECT COALESCE("
+            "    jsonb_object_agg(a.key, a.value::int + COALESCE((paragraphs ->> a.key)::int, 0)),"
+            "    '{}'::jsonb"
+            "  ) FROM jsonb_each_text(%(appended)s::jsonb) AS a"
+            ") "
+            "WHERE kbid = %(kbid)s AND rid = %(rid)s",
+            {
+                "kbid": kbid,
+                "rid": rid,
+                "deleted": deleted,
+                "counts": orjson.dumps(counts).decode(),
+                "appended": orjson.dumps(appended or {}).decode(),
+            },
+        )
+
+
 # ---------------------------------------------------------------------------
 # Read operations
 # ---------------------------------------------------------------------------
@@ -312,6 +360,36 @@ async def exists(txn: Transaction, *, kbid: str, rid: str) -> bool:
         return await cur.fetchone() is not None
 
 
+@observer.wrap({"type": "resources", "op": "exists_many"})
+async def exists_many(
+    txn: Transaction, *, resources: list[tuple[str, str]]
+) -> builtins.set[tuple[str, str]]:
+    """Check existence of many resources, possibly from different KBs, in a
+    single query. Returns the subset of (kbid, rid) pairs that exist.
+    """
+    by_uuids: dict[tuple[uuid.UUID, uuid.UUID], tuple[str, str]] = {}
+    for kbid, rid in resources:
+        try:
+            by_uuids[(uuid.UUID(kbid), uuid.UUID(rid))] = (kbid, rid)
+        except ValueError:
+            logger.warning(
+                "Invalid UUID format in exists_many() check, assuming it doesn't exist",
+                extra={"kbid": kbid, "rid": rid},
+            )
+    if not by_uuids:
+        return builtins.set()
+
+    kbids, rids = zip(*by_uuids.keys())
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "SELECT r.kbid, r.rid FROM kb_resources r "
+            "JOIN unnest(%(kbids)s::uuid[], %(rids)s::uuid[]) AS p(kbid, rid) "
+            "ON r.kbid = p.kbid AND r.rid = p.rid",
+            {"kbids": list(kbids), "rids": list(rids)},
+        )
+        return {by_uuids[(kbid, rid)] async for kbid, rid in cur}
+
+
 @observer.wrap({"type": "resources", "op": "get_rid"})
 async def get_rid(txn: Transaction, *, kbid: str, slug: str) -> str | None:
     async with _pg_cursor(txn) as cur:
@@ -333,6 +411,72 @@ async def slug_exists(txn: Transaction, *, kbid: str, slug: str) -> bool:
         return await cur.fetchone() is not None
 
 
+@observer.wrap({"type": "resources", "op": "existing_slugs"})
+async def existing_slugs(txn: Transaction, *, kbid: str, slugs: list[str]) -> builtins.set[str]:
+    """Return the subset of the given slugs already taken in the KB, in a single query."""
+    if not slugs:
+        return builtins.set()
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "SELECT slug FROM kb_resources WHERE kbid = %(kbid)s AND slug = ANY(%(slugs)s)",
+            {"kbid": kbid, "slugs": slugs},
+        )
+        return {slug async for (slug,) in cur}
+
+
+@observer.wrap({"type": "resources", "op": "get_version"})
+async def get_version(txn: Transaction, *, kbid: str, rid: str) -> ResourceVersion | None:
+    """Return the version of a resource, to validate cached copies of it without
+    loading the resource. Returns None if the resource does not exist.
+
+    The version is derived from the postgres row versions (xmin) of the resource
+    and its field rows (values, statuses, conversation pages), so it changes
+    whenever any of them is written.
+    """
+    async with _pg_cursor(txn) as cur:
+        try:
+            await cur.execute(
+                """
+                SELECT md5(
+                    r.xmin::text
+                    || '|' || coalesce((
+                        SELECT string_agg(
+                            f.field_type || '/' || f.field_id || ':' || f.xmin::text,
+                            ',' ORDER BY f.field_type, f.field_id
+                        )
+                        FROM kb_fields f WHERE f.kbid = r.kbid AND f.rid = r.rid
+                    ), '')
+                    || '|' || coalesce((
+                        SELECT string_agg(
+                            c.field_id || '/' || c.page::text || ':' || c.xmin::text,
+                            ',' ORDER BY c.field_id, c.page
+                        )
+                        FROM kb_conversations c WHERE c.kbid = r.kbid AND c.rid = r.rid
+                    ), '')
+                ), r.basic
+                FROM kb_resources r
+                WHERE r.kbid = %(kbid)s AND r.rid = %(rid)s
+                """,
+                {"kbid": kbid, "rid": rid},
+            )
+        except psycopg.errors.InvalidTextRepresentation:
+            return None
+        row = await cur.fetchone()
+        if row is None:
+            return None
+        version, basic_bytes = row
+        modified = None
+        if basic_bytes is not None:
+            basic = resources_pb2.Basic()
+            basic.ParseFromString(bytes(basic_bytes))
+            # Resources not modified since their creation only have a created date
+            if basic.modified.seconds != 0:
+                modified = basic.modified.ToDatetime()
+            elif basic.created.seconds != 0:
+                modified = basic.created.ToDatetime()
+        return ResourceVersion(version=version, modified=modified)
+
+
 @observer.wrap({"type": "resources", "op": "get_basic"})
 async def get_basic(
     txn: Transaction, *, kbid: str, rid: str, for_update: bool = False
@@ -354,13 +498,23 @@ async def get_basic(
 
 
 @observer.wrap({"type": "resources", "op": "iter"})
-async def iter(*, kbid: str) -> AsyncIterator[str]:
+async def iter(*, kbid: str, after: str | None = None) -> AsyncIterator[str]:
+    """Iterate resource ids of a KB ordered by rid. If `after` is set, only
+    resources with a greater rid are returned, allowing to resume an
+    iteration.
+    """
     async with with_ro_transaction() as txn:
         async with _pg_cursor(txn) as cur:
-            await cur.execute(
-                "SELECT rid FROM kb_resources WHERE kbid = %(kbid)s ORDER BY rid",
-                {"kbid": kbid},
-            )
+            if after is None:
+                await cur.execute(
+                    "SELECT rid FROM kb_resources WHERE kbid = %(kbid)s ORDER BY rid",
+                    {"kbid": kbid},
+                )
+            else:
+                await cur.execute(
+                    "SELECT rid FROM kb_resources WHERE kbid = %(kbid)s AND rid > %(after)s ORDER BY rid",
+                    {"kbid": kbid, "after": after},
+                )
             async for (rid,) in cur:
                 yield _to_rid(rid)
 
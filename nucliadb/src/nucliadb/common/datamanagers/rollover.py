@@ -92,9 +92,18 @@ async def add_batch_to_index(txn: Transaction, *, kbid: str, batch: list[str]) -
         await txn.set(key, b"")
 
 
-async def get_to_index(txn: Transaction, *, kbid: str, count: int) -> list[str] | None:
+async def get_to_index(
+    txn: Transaction, *, kbid: str, count: int, after: str | None = None
+) -> list[str] | None:
+    """
+    Get resource ids scheduled to be indexed. Use `after` with the last
+    resource id returned to get the next page.
+    """
     key = KB_ROLLOVER_RESOURCES_TO_INDEX.format(kbid=kbid, resource="")
-    found = [key async for key in txn.keys(key, count=count)]
+    after_key = None
+    if after is not None:
+        after_key = KB_ROLLOVER_RESOURCES_TO_INDEX.format(kbid=kbid, resource=after)
+    found = [key async for key in txn.keys(key, count=count, after=after_key)]
     if found:
         return [f.split("/")[-1] for f in found]
     return None
@@ -0,0 +1,131 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Datamanager for the `tus_uploads` PostgreSQL table (migration 0018).
+
+Each row stores the state of an ongoing TUS upload:
+  - upload_id      - id of the upload
+  - upload_offset  - bytes already appended, advanced with a compare-and-swap
+  - data           - the rest of the upload state, as JSON
+  - expires_at     - timestamp after which the upload is considered abandoned
+  - reserved_until - timestamp until which an append has reserved the current offset
+"""
+
+from typing import Any
+
+import orjson
+
+from nucliadb.common.datamanagers.utils import _pg_cursor
+from nucliadb.common.maindb.driver import Transaction
+
+
+async def get(txn: Transaction, *, upload_id: str, now: float) -> tuple[int, dict[str, Any]] | None:
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "SELECT upload_offset, data FROM tus_uploads "
+            "WHERE upload_id = %(upload_id)s AND expires_at > %(now)s",
+            {"upload_id": upload_id, "now": now},
+        )
+        row = await cur.fetchone()
+        if row is None:
+            return None
+        return row[0], row[1]
+
+
+async def set(
+    txn: Transaction, *, upload_id: str, offset: int, data: dict[str, Any], expires_at: float
+) -> None:
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "INSERT INTO tus_uploads (upload_id, upload_offset, data, expires_at) "
+            "VALUES (%(upload_id)s, %(offset)s, %(data)s::jsonb, %(expires_at)s) "
+            "ON CONFLICT (upload_id) DO UPDATE SET "
+            "upload_offset = EXCLUDED.upload_offset, data = EXCLUDED.data, "
+            "expires_at = EXCLUDED.expires_at, reserved_until = 0",
+            {
+                "upload_id": upload_id,
+                "offset": offset,
+                "data": orjson.dumps(data).decode(),
+                "expires_at": expires_at,
+            },
+        )
+
+
+async def update(
+    txn: Transaction,
+    *,
+    upload_id: str,
+    expected_offset: int,
+    offset: int,
+    data: dict[str, Any],
+    expires_at: float,
+) -> bool:
+    """
+    Update the upload only if its offset is still `expected_offset`, releasing any
+    reservation. Returns whether the upload was updated.
+    """
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "UPDATE tus_uploads SET upload_offset = %(offset)s, data = %(data)s::jsonb, "
+            "expires_at = %(expires_at)s, reserved_until = 0 "
+            "WHERE upload_id = %(upload_id)s AND upload_offset = %(expected_offset)s",
+            {
+                "upload_id": upload_id,
+                "expected_offset": expected_offset,
+                "offset": offset,
+                "data": orjson.dumps(data).decode(),
+                "expires_at": expires_at,
+            },
+        )
+        return cur.rowcount > 0
+
+
+async def reserve(txn: Transaction, *, upload_id: str, offset: int, now: float, until: float) -> bool:
+    """
+    Reserve the upload at `offset` until the given timestamp, so no other append
+    can write at the same offset. Returns whether the reservation was made.
+    """
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "UPDATE tus_uploads SET reserved_until = %(until)s "
+            "WHERE upload_id = %(upload_id)s AND upload_offset = %(offset)s "
+            "AND reserved_until < %(now)s",
+            {"upload_id": upload_id, "offset": offset, "now": now, "until": until},
+        )
+        return cur.rowcount > 0
+
+
+async def release(txn: Transaction, *, upload_id: str, offset: int) -> None:
+    async with _pg_cursor(txn) as cur:
+        await cur.execute(
+            "UPDATE tus_uploads SET reserved_until = 0 "
+            "WHERE upload_id = %(upload_id)s AND upload_offset = %(offset)s",
+            {"upload_id": upload_id, "offset": offset},
+        )
+
+
+async def delete(txn: Transaction, *, upload_id: str) -> None:
+    async with _pg_cursor(txn) as cur:
+        await cur.execute("DELETE FROM tus_uploads WHERE upload_id = %s", (upload_id,))
+
+
+async def delete_expired(txn: Transaction, *, now: float) -> None:
+    async with _pg_cursor(txn) as cur:
+        await cur.execute("DELETE FROM tus_uploads WHERE expires_at < %s", (now,))
@@ -24,6 +24,7 @@ paragraphs... Avoiding spread of id construction and parsing everywhere
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from nucliadb_models.common import FieldTypeName
 from nucliadb_protos.resources_pb2 import FieldType
@@ -50,6 +51,8 @@ FIELD_TYPE_NAME_TO_STR = {
 
 FIELD_TYPE_STR_TO_NAME = {v: k for k, v in FIELD_TYPE_NAME_TO_STR.items()}
 
+FIELD_ID_CACHE_SIZE = 10_000
+
 
 @dataclass
 class FieldId:
@@ -95,22 +98,7 @@ class FieldId:
         >>> FieldId.from_string("rid/u/foo/subfield_id").subfield_id
         'subfield_id'
         """
-        parts = value.split("/")
-        if len(parts) == 3:
-            rid, _type, key = parts
-            _type = cls._parse_field_type(_type)
-            return cls(rid=rid, type=_type, key=key)
-        elif len(parts) == 4:
-            rid, _type, key, subfield_id = parts
-            _type = cls._parse_field_type(_type)
-            return cls(
-                rid=rid,
-                type=_type,
-                key=key,
-                subfield_id=subfield_id,
-            )
-        else:
-            raise ValueError(f"Invalid FieldId: {value}")
+        return cls(*_parse_field_id(value))
 
     @classmethod
     def from_pb(
@@ -183,11 +171,10 @@ class ParagraphId:
 
     @classmethod
     def from_string(cls, value: str) -> "ParagraphId":
-        parts = value.split("/")
-        paragraph_range = parts[-1]
-        start, end = map(int, paragraph_range.split("-"))
-        field_id = FieldId.from_string("/".join(parts[:-1]))
-        return cls(field_id=field_id, paragraph_start=start, paragraph_end=end)
+        field, _, paragraph_range = value.rpartition("/")
+        start, _, end = paragraph_range.partition("-")
+        field_id = FieldId(*_parse_field_id(field))
+        return cls(field_id=field_id, paragraph_start=int(start), paragraph_end=int(end))
 
     @classmethod
     def from_vector_id(cls, vid: "VectorId") -> "ParagraphId":
@@ -255,12 +242,11 @@ class VectorId:
 
     @classmethod
     def from_string(cls, value: str) -> "VectorId":
-        parts = value.split("/")
-        vector_range = parts[-1]
-        start, end = map(int, vector_range.split("-"))
-        index = int(parts[-2])
-        field_id = FieldId.from_string("/".join(parts[:-2]))
-        return cls(field_id=field_id, index=index, vector_start=start, vector_end=end)
+        rest, _, vector_range = value.rpartition("/")
+        field, _, index = rest.rpartition("/")
+        start, _, end = vector_range.partition("-")
+        field_id = FieldId(*_parse_field_id(field))
+        return cls(field_id=field_id, index=int(index), vector_start=int(start), vector_end=int(end))
 
     @property
     def rid(self) -> str:
@@ -289,6 +275,24 @@ class VectorId:
         )
 
 
+@lru_cache(maxsize=FIELD_ID_CACHE_SIZE)
+def _parse_field_id(value: str) -> tuple[str, str, str, str | None]:
+    """
+    Parse the parts of a field id. Search results contain many paragraphs of
+    the same fields, so parsed field ids are cached. Parts are cached instead
+    of FieldId objects, as those are mutable.
+    """
+    parts = value.split("/")
+    if len(parts) == 3:
+        rid, _type, key = parts
+        return rid, FieldId._parse_field_type(_type), key, None
+    elif len(parts) == 4:
+        rid, _type, key, subfield_id = parts
+        return rid, FieldId._parse_field_type(_type), key, subfield_id
+    else:
+        raise ValueError(f"Invalid FieldId: {value}")
+
+
 def extract_data_augmentation_id(generated_field_id: str) -> str | None:
     """Data augmentation generated fields have a strict id with the following
     format:
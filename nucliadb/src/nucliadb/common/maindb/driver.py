@@ -56,8 +56,15 @@ class Transaction:
     async def delete_by_prefix(self, prefix: str) -> None:
         raise NotImplementedError()
 
+    async def batch_delete(self, keys: list[str]) -> None:
+        raise NotImplementedError()
+
     def keys(
-        self, match: str, count: int = DEFAULT_SCAN_LIMIT, include_start: bool = True
+        self,
+        match: str,
+        count: int = DEFAULT_SCAN_LIMIT,
+        include_start: bool = True,
+        after: str | None = None,
     ) -> AsyncGenerator[str]:
         raise NotImplementedError()
 
@@ -118,6 +118,11 @@ class DataLayer:
             async with self.connection.cursor() as cur:
                 await cur.execute("DELETE FROM resources WHERE key LIKE %s", (prefix + "%",))
 
+    async def batch_delete(self, keys: list[str]) -> None:
+        with pg_observer({"type": "batch_delete"}):
+            async with self.connection.cursor() as cur:
+                await cur.execute("DELETE FROM resources WHERE key = ANY(%s)", (keys,))
+
     async def batch_get(self, keys: list[str], select_for_update: bool = False) -> list[bytes | None]:
         with pg_observer({"type": "batch_get"}):
             async with self.connection.cursor() as cur:
@@ -136,10 +141,16 @@ class DataLayer:
         prefix: str,
         limit: int = DEFAULT_SCAN_LIMIT,
         include_start: bool = True,
+        after: str | None = None,
     ) -> AsyncGenerator[str]:
-        query = "SELECT key FROM resources WHERE key LIKE %s ORDER BY key"
-
         args: list[Any] = [prefix + "%"]
+        query = "SELECT key FROM resources WHERE key LIKE %s"
+        if after is not None:
+            # Resume a scan after the last key seen
+            query += " AND key > %s"
+            args.append(after)
+        query += " ORDER BY key"
+
         if limit > 0:
             query += " LIMIT %s"
             args.append(limit)
@@ -207,18 +218,22 @@ class PGTransaction(Transaction):
     async def delete_by_prefix(self, prefix: str) -> None:
         await self.data_layer.delete_by_prefix(prefix)
 
+    async def batch_delete(self, keys: list[str]) -> None:
+        await self.data_layer.batch_delete(keys)
+
     @backoff.on_exception(backoff.expo, RETRIABLE_EXCEPTIONS, jitter=backoff.random_jitter, max_tries=2)
     async def keys(
         self,
         match: str,
         count: int = DEFAULT_SCAN_LIMIT,
         include_start: bool = True,
+        after: str | None = None,
     ):
         # Check out a new connection to guarantee that the cursor iteration does not
         # run concurrently with other queries
         async with self.driver._get_connection() as conn, conn.transaction():
             dl = DataLayer(conn)
-            async for key in dl.scan_keys(match, count, include_start=include_start):
+            async for key in dl.scan_keys(match, count, include_start=include_start, after=after):
                 yield key
 
     async def count(self, match: str) -> int:
@@ -255,16 +270,20 @@ class ReadOnlyPGTransaction(Transaction):
     async def delete(self, key: str):
         raise Exception("Cannot delete in read only transaction")
 
+    async def batch_delete(self, keys: list[str]) -> None:
+        raise Exception("Cannot delete in read only transaction")
+
     @backoff.on_exception(backoff.expo, RETRIABLE_EXCEPTIONS, jitter=backoff.random_jitter, max_tries=3)
     async def keys(
         self,
         match: str,
         count: int = DEFAULT_SCAN_LIMIT,
         include_start: bool = True,
+        after: str | None = None,
     ):
         async with self.driver._get_connection() as conn, conn.transaction():
             dl = DataLayer(conn)
-            async for key in dl.scan_keys(match, count, include_start=include_start):
+            async for key in dl.scan_keys(match, count, include_start=include_start, after=after):
                 yield key
 
     @backoff.on_exception(backoff.expo, RETRIABLE_EXCEPTIONS, jitter=backoff.random_jitter, max_tries=3)
@@ -73,6 +73,9 @@ KB_TO_DELETE_STORAGE = f"{KB_TO_DELETE_STORAGE_BASE}{{kbid}}"
 KB_VECTORSET_TO_DELETE_BASE = "/vectorsettodelete"
 KB_VECTORSET_TO_DELETE = f"{KB_VECTORSET_TO_DELETE_BASE}/{{kbid}}/{{vectorset}}"
 
+TUS_PARTIAL_UPLOAD_TO_DELETE_BASE = "/tuspartstodelete"
+TUS_PARTIAL_UPLOAD_TO_DELETE = f"{TUS_PARTIAL_UPLOAD_TO_DELETE_BASE}/{{kbid}}/{{upload_id}}"
+
 
 def semantic_model_to_vectorset(
     model_name: str, model: SemanticModelMetadata, dimension: int | None = None
@@ -535,6 +535,13 @@ class Processor:
                 kb=kbid,
                 source=source,
             )
+            if not index_message.skip_paragraphs:
+                # Keep track of the paragraphs of the resource, used to
+                # rebalance shards without querying the index
+                counts, appended, deleted = get_paragraph_counts(index_message)
+                await datamanagers.resources.update_paragraph_counts(
+                    txn, kbid=kbid, rid=uuid, counts=counts, appended=appended, deleted=deleted
+                )
         return warnings
 
     @processor_observer.wrap({"type": "generate_index_message"})
@@ -775,6 +782,29 @@ def to_index_message_source(message: writer_pb2.BrokerMessage):
         return nodewriter_pb2.IndexMessageSource.PROCESSOR
 
 
+def get_paragraph_counts(
+    index_message: PBBrainResource,
+) -> tuple[dict[str, int], dict[str, int], list[str]]:
+    """
+    Return the number of paragraphs indexed per field key, split in fields
+    whose paragraphs are replaced and fields whose paragraphs are added to the
+    already indexed ones (e.g. conversation appends, that only carry the new
+    splits), and the field keys whose paragraphs are deleted by this index
+    message.
+    """
+    # paragraphs_to_delete contains full field ids: {rid}/{field_type}/{field_id}
+    deleted = [field_id.split("/", 1)[1] for field_id in index_message.paragraphs_to_delete]
+    replaced = set(deleted)
+    counts = {}
+    appended = {}
+    for field_key, field_paragraphs in index_message.paragraphs.items():
+        if field_key.startswith("c/") and field_key not in replaced:
+            appended[field_key] = len(field_paragraphs.paragraphs)
+        else:
+            counts[field_key] = len(field_paragraphs.paragraphs)
+    return counts, appended, deleted
+
+
 def has_vectors_operation(index_message: PBBrainResource) -> bool:
     """
     Returns True if the index message has any vectors to index or to delete.
@@ -67,6 +67,7 @@ from nucliadb_models.resource import (
 from nucliadb_models.search import ResourceProperties
 from nucliadb_protos import writer_pb2
 from nucliadb_protos.writer_pb2 import FieldStatus
+from nucliadb_utils.asyncio_utils import RequestLimiter
 from nucliadb_utils.utilities import get_storage
 
 
@@ -179,7 +180,7 @@ async def serialize_resource(
 
     if should_serialize_fields:
         resource.data = ResourceData()
-        concurrency_control = asyncio.Semaphore(max(max_parallel_field_serializations, 1))
+        concurrency_control = RequestLimiter(max_parallel_field_serializations)
 
         selected_fields: list[
             tuple[
@@ -423,7 +424,7 @@ async def serialize_fields_data(
     *,
     include_values: bool,
     include_errors: bool,
-    concurrency_control: asyncio.Semaphore,
+    concurrency_control: RequestLimiter,
 ) -> None:
     from nucliadb.search.augmentor.utils import limited_concurrency
 
@@ -460,7 +461,7 @@ async def serialize_fields_extracted_data(
     extracted: list[ExtractedDataTypeName],
     *,
     vectorset: str | None,
-    concurrency_control: asyncio.Semaphore,
+    concurrency_control: RequestLimiter,
 ) -> None:
     from nucliadb.search.augmentor.utils import limited_concurrency
 
@@ -17,8 +17,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
 import uuid
 from collections.abc import AsyncIterator
+from functools import partial
 
 from nucliadb.backups import tasks as backup_tasks
 from nucliadb.backups import utils as backup_utils
@@ -56,6 +58,7 @@ from nucliadb_protos.writer_pb2 import (
     ListEntitiesGroupsRequest,
     ListEntitiesGroupsResponse,
     OpStatusWriter,
+    ProcessMessageStatus,
 )
 from nucliadb_telemetry import errors
 from nucliadb_utils.settings import is_onprem_nucliadb
@@ -220,22 +223,97 @@ class WriterServicer(writer_pb2_grpc.WriterServicer):
     ) -> OpStatusWriter:
         response = OpStatusWriter()
         async for message in request_iterator:
-            try:
-                await self.proc.process(
-                    message, -1, partition=self.partitions[0], transaction_check=False
-                )
-            except Exception:
-                logger.exception(
-                    "Error processing message",
-                    stack_info=True,
-                    extra={"kbid": message.kbid, "rid": message.uuid},
-                )
-                response.status = OpStatusWriter.Status.ERROR
+            response.status = await self._process_message(message)
+            if response.status == OpStatusWriter.Status.ERROR:
                 break
-            response.status = OpStatusWriter.Status.OK
-            logger.info("Processed message", extra={"kbid": message.kbid, "rid": message.uuid})
         return response
 
+    async def ProcessMessages(
+        self, request_iterator: AsyncIterator[BrokerMessage], context=None
+    ) -> AsyncIterator[ProcessMessageStatus]:
+        """
+        Process a stream of broker messages, with up to
+        `settings.process_messages_concurrency` of them in flight. Messages for the
+        same resource are chained so they are processed in the order they were sent,
+        and once one of them fails the following ones are skipped and reported as errors.
+        """
+        window = asyncio.Semaphore(settings.process_messages_concurrency)
+        statuses: asyncio.Queue[ProcessMessageStatus | None] = asyncio.Queue()
+        latest: dict[tuple[str, str], asyncio.Task] = {}
+        in_flight: set[asyncio.Task] = set()
+
+        async def process(
+            index: int, message: BrokerMessage, previous: asyncio.Task | None
+        ) -> OpStatusWriter.Status.ValueType:
+            try:
+                if previous is not None:
+                    # Previous message for the same resource. Applying this one on top
+                    # of a failed one would leave the resource in an unexpected state
+                    await asyncio.wait([previous])
+                if previous is not None and (
+                    previous.cancelled()
+                    or previous.exception() is not None
+                    or previous.result() != OpStatusWriter.Status.OK
+                ):
+                    logger.warning(
+                        "Skipping message, a previous message for the same resource failed",
+                        extra={"kbid": message.kbid, "rid": message.uuid},
+                    )
+                    status = OpStatusWriter.Status.ERROR
+                else:
+                    status = await self._process_message(message)
+            finally:
+                window.release()
+            statuses.put_nowait(
+                ProcessMessageStatus(index=index, kbid=message.kbid, uuid=message.uuid, status=status)
+            )
+            return status
+
+        def done(key: tuple[str, str], task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            if latest.get(key) is task:
+                del latest[key]
+
+        async def read():
+            try:
+                index = 0
+                async for message in request_iterator:
+                    await window.acquire()
+                    key = (message.kbid, message.uuid)
+                    task = asyncio.create_task(process(index, message, latest.get(key)))
+                    task.add_done_callback(partial(done, key))
+                    latest[key] = task
+                    in_flight.add(task)
+                    index += 1
+                if in_flight:
+                    await asyncio.wait(in_flight)
+            finally:
+                statuses.put_nowait(None)
+
+        reader = asyncio.create_task(read())
+        try:
+            while (status := await statuses.get()) is not None:
+                yield status
+            # Propagate errors reading the request stream, if any
+            await reader
+        finally:
+            reader.cancel()
+            for task in in_flight:
+                task.cancel()
+
+    async def _process_message(self, message: BrokerMessage) -> OpStatusWriter.Status.ValueType:
+        try:
+            await self.proc.process(message, -1, partition=self.partitions[0], transaction_check=False)
+        except Exception:
+            logger.exception(
+                "Error processing message",
+                stack_info=True,
+                extra={"kbid": message.kbid, "rid": message.uuid},
+            )
+            return OpStatusWriter.Status.ERROR
+        logger.info("Processed message", extra={"kbid": message.kbid, "rid": message.uuid})
+        return OpStatusWriter.Status.OK
+
     async def GetEntities(self, request: GetEntitiesRequest, context=None) -> GetEntitiesResponse:
         response = GetEntitiesResponse()
         async with self.driver.ro_transaction() as txn:
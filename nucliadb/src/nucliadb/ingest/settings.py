@@ -115,6 +115,11 @@ class Settings(DriverSettings):
     max_receive_message_length: int = Field(
         default=500, description="Maximum receive grpc message length in MB."
     )
+    process_messages_concurrency: int = Field(
+        default=10,
+        gt=0,
+        description="Maximum number of broker messages from a single ProcessMessages stream that are processed at the same time.",
+    )
 
     # Search query timeouts
     relation_search_timeout: float = 10.0
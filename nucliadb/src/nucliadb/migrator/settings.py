@@ -32,6 +32,18 @@ class Settings(pydantic_settings.BaseSettings):
         default=5,
         description="Maximum number of concurrent index operations during rollover.",
     )
+    rollover_prefetch_resources: int = pydantic.Field(
+        default=500,
+        description="Number of resource ids read ahead of the indexing workers during rollover.",
+    )
+    rollover_bookkeeping_batch_size: int = pydantic.Field(
+        default=100,
+        description="Number of indexed resources recorded in each rollover bookkeeping transaction.",
+    )
+    rollover_max_nidx_pending: int = pydantic.Field(
+        default=1000,
+        description="Pause rollover indexing while nidx has more than this number of pending messages.",
+    )
 
 
 settings = Settings()
@@ -17,13 +17,40 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+from collections.abc import Mapping
+
 from fastapi.responses import JSONResponse
+from fastapi.responses import Response as RawResponse
+from pydantic import BaseModel
 
 
 class Response(JSONResponse):
     pass
 
 
+class ModelResponse(RawResponse):
+    """
+    JSON response for a pydantic model built by nucliadb itself. The model is
+    serialized straight to bytes by pydantic-core, skipping the validation and
+    intermediate dict FastAPI goes through for `response_model`. Routes should
+    still declare `response_model` so the OpenAPI schema is unchanged.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        exclude_unset: bool = True,
+    ):
+        body = content.__pydantic_serializer__.to_json(
+            content, by_alias=True, exclude_unset=exclude_unset
+        )
+        super().__init__(content=body, status_code=status_code, headers=headers)
+
+
 class HTTPClientError(Response):
     def __init__(self, status_code: int, detail: str):
         super().__init__(status_code=status_code, content={"detail": detail})
@@ -19,8 +19,9 @@
 #
 import asyncio
 import importlib.metadata
-from collections.abc import AsyncGenerator
-from itertools import batched  # type: ignore
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import TypeVar
 
 from nucliadb.common import datamanagers
 from nucliadb.common.cluster.exceptions import NodeError, ShardNotFound
@@ -35,15 +36,27 @@ from nucliadb.ingest.orm.knowledgebox import (
     KB_TO_DELETE_STORAGE_BASE,
     KB_VECTORSET_TO_DELETE_BASE,
     RESOURCE_TO_DELETE_STORAGE_BASE,
+    TUS_PARTIAL_UPLOAD_TO_DELETE_BASE,
     KnowledgeBox,
 )
+from nucliadb.ingest.orm.resource import Resource
 from nucliadb.tasks.retries import purge_metadata as purge_task_metadata
+from nucliadb.writer.tus import TUS_PARTIAL_UPLOAD_PATH
 from nucliadb_protos.knowledgebox_pb2 import VectorSetConfig, VectorSetPurge
 from nucliadb_telemetry import errors
 from nucliadb_telemetry.logs import setup_logging
 from nucliadb_utils.storages.storage import Storage
 from nucliadb_utils.utilities import get_storage
 
+T = TypeVar("T")
+
+# Number of resources purged between vectorset purge checkpoints
+VECTORSET_PURGE_RESOURCES_BATCH = 100
+# Max concurrent storage deletions while purging a vectorset
+VECTORSET_PURGE_CONCURRENCY = 20
+# Partial uploads not concatenated after this many seconds are considered abandoned
+TUS_PARTIAL_UPLOAD_EXPIRATION = 24 * 60 * 60
+
 
 async def _iter_keys(driver: Driver, match: str) -> AsyncGenerator[str, None]:
     async with driver.ro_transaction() as keys_txn:
@@ -145,10 +158,14 @@ async def purge_deleted_resource_storage(driver: Driver, storage: Storage) -> No
     logger.info("Starting purge of deleted resource storage")
     to_purge = await _count_resources_storage_to_purge(driver)
     logger.info(f"Found {to_purge} resources to purge")
+    # Resources that fail to be purged are skipped, so they don't block the rest
+    last_key = None
     while True:
         try:
-            purged = await _purge_resources_storage_batch(driver, storage, batch_size=100)
-            if not purged:
+            purged, last_key = await _purge_resources_storage_batch(
+                driver, storage, batch_size=100, after=last_key
+            )
+            if last_key is None:
                 logger.info("No more resources to purge found")
                 return
             logger.info(f"Purged {purged} resources")
@@ -166,39 +183,85 @@ async def _count_resources_storage_to_purge(driver: Driver) -> int:
         return await txn.count(match=RESOURCE_TO_DELETE_STORAGE_BASE)
 
 
-async def _purge_resources_storage_batch(driver: Driver, storage: Storage, batch_size: int = 100) -> int:
+async def _purge_resources_storage_batch(
+    driver: Driver, storage: Storage, batch_size: int = 100, after: str | None = None
+) -> tuple[int, str | None]:
     """
-    Remove from storage a batch of resources marked as deleted. Returns the
-    number of resources purged.
+    Remove from storage a batch of resources marked as deleted, starting after
+    the given key. Returns the number of resources purged and the last key of
+    the batch, None if there was nothing left to purge.
     """
     # Get the keys of the resources to delete in batches of 100
     to_delete_batch = []
     async with driver.ro_transaction() as txn:
-        async for key in txn.keys(match=RESOURCE_TO_DELETE_STORAGE_BASE, count=batch_size):
+        async for key in txn.keys(match=RESOURCE_TO_DELETE_STORAGE_BASE, count=batch_size, after=after):
             to_delete_batch.append(key)
 
     if not to_delete_batch:
-        return 0
+        return 0, None
 
     # Delete the resources blobs from storage
     logger.info(f"Purging {len(to_delete_batch)} deleted resources")
-    tasks = []
+    to_purge: dict[str, tuple[str, str]] = {}
     for key in to_delete_batch:
         kbid, resource_id = key.split("/")[-2:]
-        # Check if resource exists in maindb. This can happen if a file is deleted (marked for purge) and immediately
-        # reuploaded. Without this check, we will delete the data of the newly uploaded copy of the resource.
-        if not await datamanagers.atomic.resources.exists(kbid=kbid, rid=resource_id):
-            tasks.append(asyncio.create_task(storage.delete_resource(kbid, resource_id)))
-
-    await asyncio.gather(*tasks)
+        to_purge[key] = (kbid, resource_id)
+    # Check if resources exist in maindb. This can happen if a file is deleted (marked for purge) and immediately
+    # reuploaded. Without this check, we will delete the data of the newly uploaded copy of the resource.
+    existing = await datamanagers.atomic.resources.exists_many(resources=list(to_purge.values()))
+    keys_to_purge = [key for key, resource in to_purge.items() if resource not in existing]
+    results = await asyncio.gather(
+        *(storage.delete_resource(*to_purge[key]) for key in keys_to_purge),
+        return_exceptions=True,
+    )
+    failed = {
+        key: result for key, result in zip(keys_to_purge, results) if isinstance(result, BaseException)
+    }
 
-    # Delete the schedule-to-delete keys
+    # Delete the schedule-to-delete keys. The ones of resources that could not be deleted
+    # are kept, so they are retried in the next purge
     async with driver.rw_transaction() as txn:
-        for key in to_delete_batch:
-            await txn.delete(key)
+        await txn.batch_delete([key for key in to_delete_batch if key not in failed])
         await txn.commit()
 
-    return len(to_delete_batch)
+    for key, exc in failed.items():
+        errors.capture_exception(exc)
+        logger.error(f"Error purging deleted resource storage: {exc}", extra={"key": key})
+
+    return len(to_delete_batch) - len(failed), to_delete_batch[-1]
+
+
+async def purge_expired_partial_uploads(driver: Driver, storage: Storage) -> None:
+    """
+    Remove from storage the partial uploads (TUS concatenation extension) that
+    were never concatenated into a final upload.
+    """
+    logger.info("Start purging expired partial uploads")
+    now = time.time()
+    expired = []
+    async with driver.ro_transaction() as txn:
+        async for key in txn.keys(match=TUS_PARTIAL_UPLOAD_TO_DELETE_BASE):
+            created_at = await txn.get(key)
+            if created_at is None or now - float(created_at) > TUS_PARTIAL_UPLOAD_EXPIRATION:
+                expired.append(key)
+
+    for key in expired:
+        try:
+            kbid, upload_id = key.split("/")[-2:]
+        except ValueError:
+            logger.warning("Skipping purge of partial upload, wrong key format", extra={"key": key})
+            continue
+        path = TUS_PARTIAL_UPLOAD_PATH.format(kbid=kbid, upload_id=upload_id)
+        try:
+            await storage.delete_upload(path, storage.get_bucket_name(kbid))
+            async with driver.rw_transaction() as txn:
+                await txn.delete(key)
+                await txn.commit()
+        except Exception as exc:
+            errors.capture_exception(exc)
+            logger.exception("Error purging partial upload", extra={"kbid": kbid, "path": path})
+
+    logger.info("FINISH PURGING EXPIRED PARTIAL UPLOADS")
 
 
 async def purge_kb_vectorsets(driver: Driver, storage: Storage):
@@ -206,6 +269,10 @@ async def purge_kb_vectorsets(driver: Driver, storage: Storage):
     through all resources of the KB and remove any storage object containing
     vectors for the specific vectorset to purge.
 
+    Resources are purged while they are scanned and, after every batch, the
+    last purged resource is saved in the vectorset deletion mark. If the purge
+    is interrupted, next run resumes from that checkpoint.
+
     """
     logger.info("Start purging vectorsets")
 
@@ -225,37 +292,40 @@ async def purge_kb_vectorsets(driver: Driver, storage: Storage):
                 purge_payload = VectorSetPurge()
                 purge_payload.ParseFromString(value)
 
-            fields: list[Field] = []
-            async with driver.ro_transaction() as txn:
-                kb = KnowledgeBox(txn, storage, kbid)
-                async for resource in kb.iterate_resources():
-                    fields.extend((await resource.get_fields()).values())
-
-            logger.info(f"Purging {len(fields)} fields for vectorset {vectorset}", extra={"kbid": kbid})
-            for fields_batch in batched(fields, n=20):
-                tasks = []
-                for field in fields_batch:
-                    if purge_payload.storage_key_kind == VectorSetConfig.StorageKeyKind.UNSET:
-                        # Bw/c for purge before adding purge payload. We assume
-                        # there's only 2 kinds of KBs: with one or with more than
-                        # one vectorset. KBs with one vectorset are not allowed to
-                        # delete their vectorset, so we wouldn't be here. It has to
-                        # be a KB with multiple, so the storage key kind has to be
-                        # this:
-                        tasks.append(
-                            asyncio.create_task(
-                                field.delete_vectors(
-                                    vectorset, VectorSetConfig.StorageKeyKind.VECTORSET_PREFIX
-                                )
-                            )
-                        )
-                    else:
-                        tasks.append(
-                            asyncio.create_task(
-                                field.delete_vectors(vectorset, purge_payload.storage_key_kind)
-                            )
-                        )
-                await asyncio.gather(*tasks)
+            if purge_payload.last_purged_rid:
+                logger.info(
+                    "Resuming vectorset purge from checkpoint",
+                    extra={"kbid": kbid, "vectorset": vectorset, "rid": purge_payload.last_purged_rid},
+                )
+
+            purged = 0
+            cancelled = False
+            resources = datamanagers.resources.iter(
+                kbid=kbid, after=purge_payload.last_purged_rid or None
+            )
+            async for rids in _abatched(resources, n=VECTORSET_PURGE_RESOURCES_BATCH):
+                purged += await _purge_resources_vectorset(
+                    driver, storage, kbid, rids, vectorset, purge_payload
+                )
+
+                # Save progress so a restarted purge continues from here
+                purge_payload.last_purged_rid = rids[-1]
+                async with driver.rw_transaction() as txn:
+                    if await txn.get(key, for_update=True) is None:
+                        # The vectorset has been created again while purging
+                        # and the deletion mark removed, stop here
+                        cancelled = True
+                        break
+                    await txn.set(key, purge_payload.SerializeToString())
+                    await txn.commit()
+
+            if cancelled:
+                logger.info(
+                    f"Vectorset {vectorset} purge stopped, deletion mark removed", extra={"kbid": kbid}
+                )
+                continue
+
+            logger.info(f"Purged {purged} fields for vectorset {vectorset}", extra={"kbid": kbid})
 
             # Finally, delete the key
             async with driver.rw_transaction() as txn:
@@ -276,6 +346,54 @@ async def purge_kb_vectorsets(driver: Driver, storage: Storage):
     logger.info("Finish purging KB vectorsets")
 
 
+async def _purge_resources_vectorset(
+    driver: Driver,
+    storage: Storage,
+    kbid: str,
+    rids: list[str],
+    vectorset: str,
+    purge_payload: VectorSetPurge,
+) -> int:
+    """Delete the vectorset vectors of all fields of a batch of resources.
+    Returns the number of fields purged.
+    """
+    if purge_payload.storage_key_kind == VectorSetConfig.StorageKeyKind.UNSET:
+        # Bw/c for purge before adding purge payload. We assume there's only 2
+        # kinds of KBs: with one or with more than one vectorset. KBs with one
+        # vectorset are not allowed to delete their vectorset, so we wouldn't be
+        # here. It has to be a KB with multiple, so the storage key kind has to
+        # be this:
+        storage_key_kind = VectorSetConfig.StorageKeyKind.VECTORSET_PREFIX
+    else:
+        storage_key_kind = purge_payload.storage_key_kind
+
+    fields: list[Field] = []
+    async with driver.ro_transaction() as txn:
+        for rid in rids:
+            resource = Resource(txn, storage, kbid, rid, disable_vectors=False)
+            fields.extend((await resource.get_fields()).values())
+
+    semaphore = asyncio.Semaphore(VECTORSET_PURGE_CONCURRENCY)
+
+    async def _delete(field: Field):
+        async with semaphore:
+            await field.delete_vectors(vectorset, storage_key_kind)
+
+    await asyncio.gather(*(_delete(field) for field in fields))
+    return len(fields)
+
+
+async def _abatched(iterator: AsyncIterator[T], n: int) -> AsyncGenerator[list[T], None]:
+    batch: list[T] = []
+    async for item in iterator:
+        batch.append(item)
+        if len(batch) == n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 async def main():
     """
     This script will purge all knowledge boxes marked to be deleted in maindb.
@@ -295,6 +413,7 @@ async def main():
         await purge_kbs(driver)
         await purge_kbs_storage(driver, storage)
         await purge_kb_vectorsets(driver, storage)
+        await purge_expired_partial_uploads(driver, storage)
         await purge_resources_storage_task
         await purge_task_metadata_task
     except Exception as ex:  # pragma: no cover
@@ -17,27 +17,44 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
+import os
 import urllib.parse
+import uuid
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import HTTPException
 from fastapi.requests import Request
 from fastapi.responses import Response
 from fastapi_versioning import version
-from starlette.responses import StreamingResponse
+from starlette.responses import FileResponse, RedirectResponse, StreamingResponse
 
 from nucliadb.common import datamanagers
 from nucliadb.common.ids import FIELD_TYPE_PB_TO_STR
 from nucliadb.common.models_utils import to_proto
 from nucliadb.reader import RANGE_HEADER, SERVICE_NAME, logger
+from nucliadb.reader.api.conditional import (
+    is_not_modified,
+    not_modified_response,
+    strong_etag,
+    validator_headers,
+)
 from nucliadb_models.common import FieldTypeName
 from nucliadb_models.resource import NucliaDBRoles
 from nucliadb_utils.authentication import requires_one
+from nucliadb_utils.settings import storage_settings
 from nucliadb_utils.storages.storage import ObjectMetadata, Range, StorageField
 from nucliadb_utils.utilities import get_storage
 
 from .router import KB_PREFIX, RESOURCE_PREFIX, RSLUG_PREFIX, api
 
+# Limit the work a single multi-range request can cause
+MAX_MULTIPART_RANGES = 50
+# Ranges fetched concurrently from the storage while building a multipart response
+MULTIPART_FETCH_CONCURRENCY = 4
+MULTIPART_PREFETCH_CHUNKS = 4
+
 
 @api.get(
     f"/{KB_PREFIX}/{{kbid}}/{RSLUG_PREFIX}/{{rslug}}/{{field_type}}/{{field_id}}/download/extracted/{{download_field:path}}",
@@ -57,6 +74,7 @@ async def download_extract_file_rslug_prefix(
     range: Annotated[str | None, RANGE_HEADER] = None,
 ) -> Response:
     return await _download_extract_file(
+        request,
         kbid,
         field_type,
         field_id,
@@ -84,11 +102,12 @@ async def download_extract_file_rid_prefix(
     range: Annotated[str | None, RANGE_HEADER] = None,
 ) -> Response:
     return await _download_extract_file(
-        kbid, field_type, field_id, download_field, rid=rid, range_request=range
+        request, kbid, field_type, field_id, download_field, rid=rid, range_request=range
     )
 
 
 async def _download_extract_file(
+    request: Request,
     kbid: str,
     field_type: FieldTypeName,
     field_id: str,
@@ -107,7 +126,7 @@ async def _download_extract_file(
 
     sf = storage.file_extracted(kbid, rid, field_type_letter, field_id, download_field)
 
-    return await download_api(sf, range_request)
+    return await download_api(request, sf, range_request)
 
 
 @api.get(
@@ -126,7 +145,9 @@ async def download_field_file_rslug_prefix(
     inline: bool = False,
     range: Annotated[str | None, RANGE_HEADER] = None,
 ) -> Response:
-    return await _download_field_file(kbid, field_id, rslug=rslug, range_request=range, inline=inline)
+    return await _download_field_file(
+        request, kbid, field_id, rslug=rslug, range_request=range, inline=inline
+    )
 
 
 @api.get(
@@ -145,10 +166,13 @@ async def download_field_file_rid_prefix(
     inline: bool = False,
     range: Annotated[str | None, RANGE_HEADER] = None,
 ) -> Response:
-    return await _download_field_file(kbid, field_id, rid=rid, range_request=range, inline=inline)
+    return await _download_field_file(
+        request, kbid, field_id, rid=rid, range_request=range, inline=inline
+    )
 
 
 async def _download_field_file(
+    request: Request,
     kbid: str,
     field_id: str,
     rid: str | None = None,
@@ -162,7 +186,7 @@ async def _download_field_file(
 
     sf = storage.file_field(kbid, rid, field_id)
 
-    return await download_api(sf, range_request=range_request, inline=inline)
+    return await download_api(request, sf, range_request=range_request, inline=inline)
 
 
 @api.get(
@@ -183,6 +207,7 @@ async def download_field_conversation_rslug_prefix(
     range: Annotated[str | None, RANGE_HEADER] = None,
 ) -> Response:
     return await _download_field_conversation_attachment(
+        request,
         kbid,
         field_id,
         message_id,
@@ -210,6 +235,7 @@ async def download_field_conversation_attachment_rid_prefix(
     range: Annotated[str | None, RANGE_HEADER] = None,
 ) -> Response:
     return await _download_field_conversation_attachment(
+        request,
         kbid,
         field_id,
         message_id,
@@ -220,6 +246,7 @@ async def download_field_conversation_attachment_rid_prefix(
 
 
 async def _download_field_conversation_attachment(
+    request: Request,
     kbid: str,
     field_id: str,
     message_id: str,
@@ -236,14 +263,24 @@ async def _download_field_conversation_attachment(
         kbid, rid, field_id, message_id, attachment_index=file_num
     )
 
-    return await download_api(sf, range_request)
+    return await download_api(request, sf, range_request)
 
 
-async def download_api(sf: StorageField, range_request: str | None = None, inline: bool = False):
+async def download_api(
+    request: Request, sf: StorageField, range_request: str | None = None, inline: bool = False
+):
     metadata: ObjectMetadata | None = await sf.exists()
     if metadata is None:
         raise HTTPException(status_code=404, detail="Specified file doesn't exist")
 
+    # Let clients revalidate their copy without streaming the file again
+    validators = validator_headers(
+        etag=strong_etag(metadata.etag) if metadata.etag else None,
+        last_modified=metadata.last_modified,
+    )
+    if is_not_modified(request, etag=validators.get("ETag"), last_modified=metadata.last_modified):
+        return not_modified_response(validators)
+
     file_size = metadata.size or -1
     content_type = metadata.content_type or "application/octet-stream"
     filename = metadata.filename or "file"
@@ -256,55 +293,91 @@ async def download_api(sf: StorageField, range_request: str | None = None, inlin
         "Accept-Ranges": "bytes",
         "Content-Type": content_type,
         "Content-Disposition": content_disposition,
+        **validators,
     }
 
-    range = Range()
+    ranges: list[tuple[int, int, int]] = []
     if range_request and file_size > -1:
         status_code = 206
         try:
-            start, end, range_size = parse_media_range(range_request, file_size)
-        except NotImplementedError:
-            raise HTTPException(
-                detail={
-                    "reason": "rangeNotSupported",
-                    "range": range_request,
-                    "message": "Multipart ranges are not supported yet",
-                },
-                headers={"Content-Range": f"bytes */{file_size}"},
-                status_code=416,
-            )
+            ranges = parse_media_ranges(range_request, file_size)
         except (IndexError, ValueError):
             raise HTTPException(
                 detail={"reason": "rangeNotParsable", "range": range_request},
                 headers={"Content-Range": f"bytes */{file_size}"},
                 status_code=416,
             )
-        if start > end or start < 0:
-            raise HTTPException(
-                detail={
-                    "reason": "invalidRange",
-                    "range": range_request,
-                    "message": "Invalid range",
-                },
-                headers={"Content-Range": f"bytes */{file_size}"},
-                status_code=416,
-            )
-        if end > file_size:
+        if len(ranges) > MAX_MULTIPART_RANGES:
             raise HTTPException(
                 detail={
-                    "reason": "invalidRange",
+                    "reason": "rangeNotSupported",
                     "range": range_request,
-                    "message": "Invalid range, too large end value",
+                    "message": f"At most {MAX_MULTIPART_RANGES} ranges are supported",
                 },
                 headers={"Content-Range": f"bytes */{file_size}"},
                 status_code=416,
             )
+        for start, end, _ in ranges:
+            if start > end or start < 0:
+                raise HTTPException(
+                    detail={
+                        "reason": "invalidRange",
+                        "range": range_request,
+                        "message": "Invalid range",
+                    },
+                    headers={"Content-Range": f"bytes */{file_size}"},
+                    status_code=416,
+                )
+            if end > file_size:
+                raise HTTPException(
+                    detail={
+                        "reason": "invalidRange",
+                        "range": range_request,
+                        "message": "Invalid range, too large end value",
+                    },
+                    headers={"Content-Range": f"bytes */{file_size}"},
+                    status_code=416,
+                )
         logger.debug(f"Range request: {range_request}")
+
+    if len(ranges) > 1:
+        # Multipart responses are always built here, object storages don't support them
+        boundary = uuid.uuid4().hex
+        parts = [
+            (multipart_part_header(boundary, content_type, start, end, file_size), Range(start, end))
+            for start, end, _ in ranges
+        ]
+        closing = f"--{boundary}--\r\n".encode()
+        content_length = sum(len(header) + size + 2 for (header, _), (_, _, size) in zip(parts, ranges))
+        content_length += len(closing)
+        extra_headers["Content-Type"] = f"multipart/byteranges; boundary={boundary}"
+        extra_headers["Content-Length"] = str(content_length)
+        return StreamingResponse(
+            multipart_byteranges(sf, parts, closing),
+            status_code=status_code,
+            headers=extra_headers,
+        )
+
+    range = Range()
+    if ranges:
+        start, end, range_size = ranges[0]
         extra_headers["Content-Length"] = f"{range_size}"
         extra_headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
         range.start = start
         range.end = end
 
+    if storage_settings.direct_downloads:
+        response = await direct_download(
+            sf,
+            content_type=content_type,
+            content_disposition=content_disposition,
+            headers={
+                k: v for k, v in extra_headers.items() if k not in ("Content-Length", "Content-Range")
+            },
+        )
+        if response is not None:
+            return response
+
     return StreamingResponse(
         sf.storage.download(sf.bucket, sf.key, range=range),
         status_code=status_code,
@@ -313,6 +386,87 @@ async def download_api(sf: StorageField, range_request: str | None = None, inlin
     )
 
 
+def multipart_part_header(
+    boundary: str, content_type: str, start: int, end: int, file_size: int
+) -> bytes:
+    return (
+        f"--{boundary}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Range: bytes {start}-{end}/{file_size}\r\n"
+        "\r\n"
+    ).encode()
+
+
+async def multipart_byteranges(
+    sf: StorageField, parts: list[tuple[bytes, Range]], closing: bytes
+) -> AsyncGenerator[bytes]:
+    """
+    Body of a multipart/byteranges response. The next ranges are fetched from
+    the storage concurrently while the current one is being sent, keeping a
+    bounded number of chunks of each of them in memory.
+    """
+    queues: list[asyncio.Queue[bytes | Exception | None]] = [
+        asyncio.Queue(maxsize=MULTIPART_PREFETCH_CHUNKS) for _ in parts
+    ]
+
+    async def fetch(index: int) -> None:
+        queue = queues[index]
+        try:
+            async for chunk in sf.storage.download(sf.bucket, sf.key, range=parts[index][1]):
+                await queue.put(chunk)
+        except Exception as exc:
+            await queue.put(exc)
+        else:
+            await queue.put(None)
+
+    tasks: dict[int, asyncio.Task] = {}
+    try:
+        for index, (header, _) in enumerate(parts):
+            for ahead in range(index, min(index + MULTIPART_FETCH_CONCURRENCY, len(parts))):
+                if ahead not in tasks:
+                    tasks[ahead] = asyncio.create_task(fetch(ahead))
+            yield header
+            while (chunk := await queues[index].get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+            yield b"\r\n"
+        yield closing
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+async def direct_download(
+    sf: StorageField, *, content_type: str, content_disposition: str, headers: dict[str, str]
+) -> Response | None:
+    """
+    Serve the file without proxying its contents through this process: a
+    redirect to a signed URL for cloud backends, or the file itself for the
+    local backend. Range requests are honoured by the target. Returns None
+    if the storage supports neither.
+    """
+    storage = sf.storage
+    url = await storage.presigned_url(
+        sf.bucket,
+        sf.key,
+        expires_in=storage_settings.direct_downloads_url_expiration,
+        content_type=content_type,
+        content_disposition=content_disposition,
+    )
+    if url is not None:
+        # Signed URLs expire, do not let anyone cache the redirect
+        return RedirectResponse(url, status_code=307, headers={"Cache-Control": "no-store"})
+
+    path = storage.local_file_path(sf.bucket, sf.key)
+    if path is not None and os.path.exists(path):
+        # Uses the server's zero-copy path send when available, and handles
+        # range requests on its own
+        return FileResponse(path, media_type=content_type, headers=headers)
+
+    return None
+
+
 async def _get_resource_uuid_from_params(kbid, rid: str | None, rslug: str | None) -> str:
     if not any([rid, rslug]):
         raise ValueError("Either rid or slug must be set")
@@ -330,12 +484,12 @@ async def _get_resource_uuid_from_params(kbid, rid: str | None, rslug: str | Non
     return rid
 
 
-def parse_media_range(range_request: str, file_size: int) -> tuple[int, int, int]:
-    # Implemented following this docpage: https://developer.mozilla.org/en-US/docs/Web/HTTP/Range_requests
-    ranges = range_request.split("bytes=")[-1].split(", ")
-    if len(ranges) > 1:
-        raise NotImplementedError()
-    start_str, _, end_str = ranges[0].partition("-")
+def parse_media_ranges(range_request: str, file_size: int) -> list[tuple[int, int, int]]:
+    return [parse_single_range(spec, file_size) for spec in range_request.split("bytes=")[-1].split(",")]
+
+
+def parse_single_range(spec: str, file_size: int) -> tuple[int, int, int]:
+    start_str, _, end_str = spec.strip().partition("-")
     start = int(start_str)
     max_range_size = file_size - 1
     if len(end_str) == 0:
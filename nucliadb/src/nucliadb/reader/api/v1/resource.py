@@ -17,7 +17,8 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
-from typing import cast
+import hashlib
+from typing import Any, cast
 
 from fastapi import Header, HTTPException, Query, Request, Response
 from fastapi_versioning import version
@@ -35,6 +36,12 @@ from nucliadb.ingest.serialize import (
 )
 from nucliadb.reader import SERVICE_NAME
 from nucliadb.reader.api import DEFAULT_RESOURCE_LIST_PAGE_SIZE
+from nucliadb.reader.api.conditional import (
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+    weak_etag,
+)
 from nucliadb.reader.api.models import (
     FIELD_NAME_TO_EXTRACTED_DATA_FIELD_MAP,
     ResourceField,
@@ -224,6 +231,7 @@ async def get_resource_by_uuid(
     x_forwarded_for: str = Header(""),
 ):
     return await _get_resource(
+        request,
         rid=rid,
         kbid=kbid,
         show=show,
@@ -262,8 +270,9 @@ async def get_resource_by_slug(
     vectorset: str | None = VectorSetQueryParam,
     x_nucliadb_user: str = Header(""),
     x_forwarded_for: str = Header(""),
-) -> Resource:
+) -> Resource | Response:
     return await _get_resource(
+        request,
         rslug=rslug,
         kbid=kbid,
         show=show,
@@ -276,6 +285,7 @@ async def get_resource_by_slug(
 
 
 async def _get_resource(
+    request: Request,
     *,
     rslug: str | None = None,
     rid: str | None = None,
@@ -286,7 +296,7 @@ async def _get_resource(
     vectorset: str | None = None,
     x_nucliadb_user: str,
     x_forwarded_for: str,
-) -> Resource:
+) -> Response:
     if all([rslug, rid]) or not any([rslug, rid]):
         raise ValueError("Either rid or rslug must be provided, but not both")
 
@@ -295,6 +305,20 @@ async def _get_resource(
         audit_id = rid if rid else rslug
         audit.visited(kbid, audit_id, x_nucliadb_user, x_forwarded_for)  # type: ignore
 
+    if rid is None:
+        rid = await datamanagers.atomic.resources.get_rid(kbid=kbid, slug=cast(str, rslug))
+        if rid is None:
+            raise HTTPException(status_code=404, detail="Resource does not exist")
+
+    # Let clients revalidate their copy without loading and serializing the resource again
+    version = await datamanagers.atomic.resources.get_version(kbid=kbid, rid=rid)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Resource does not exist")
+    etag = resource_etag(version.version, show, field_type_filter, extracted, vectorset)
+    headers = validator_headers(etag=etag, last_modified=version.modified)
+    if is_not_modified(request, etag=etag, last_modified=version.modified):
+        return not_modified_response(headers)
+
     result = await serialize(
         kbid,
         rid,
@@ -303,11 +327,27 @@ async def _get_resource(
         extracted,
         vectorset=vectorset,
         service_name=SERVICE_NAME,
-        slug=rslug,
     )
     if result is None:
         raise HTTPException(status_code=404, detail="Resource does not exist")
-    return result
+    return Response(
+        content=result.model_dump_json(exclude_unset=True, by_alias=True),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def resource_etag(version: str, *params: list[Any] | str | int | None) -> str:
+    """
+    ETag of a resource representation. It changes when the resource is
+    written and it depends on the query params that shape the response.
+    """
+    hasher = hashlib.md5(version.encode(), usedforsecurity=False)
+    for param in params:
+        if isinstance(param, list):
+            param = ",".join(sorted(str(item) for item in param))
+        hasher.update(f"|{param}".encode())
+    return weak_etag(hasher.hexdigest())
 
 
 @api.get(
@@ -341,6 +381,7 @@ async def get_resource_field_rslug_prefix(
     page: str | int = Query("last"),
 ) -> Response:
     return await _get_resource_field(
+        request,
         kbid,
         rslug=rslug,
         field_type=field_type,
@@ -383,6 +424,7 @@ async def get_resource_field_rid_prefix(
     page: str | int = Query("last"),
 ) -> Response:
     return await _get_resource_field(
+        request,
         kbid,
         rid=rid,
         field_type=field_type,
@@ -395,6 +437,7 @@ async def get_resource_field_rid_prefix(
 
 
 async def _get_resource_field(
+    request: Request,
     kbid: str,
     field_type: FieldTypeName,
     field_id: str,
@@ -421,6 +464,14 @@ async def _get_resource_field(
         if not await resource.field_exists(pb_field_id, field_id):
             raise HTTPException(status_code=404, detail="Resource field does not exist")
 
+        version = await datamanagers.resources.get_version(txn, kbid=kbid, rid=rid)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Resource does not exist")
+        etag = resource_etag(version.version, field_type, field_id, show, extracted, vectorset, page)
+        headers = validator_headers(etag=etag, last_modified=version.modified)
+        if is_not_modified(request, etag=etag, last_modified=version.modified):
+            return not_modified_response(headers)
+
         field = await resource.get_field(field_id, pb_field_id, load=False)
 
         resource_field = ResourceField(field_id=field_id, field_type=field_type)
@@ -501,4 +552,5 @@ async def _get_resource_field(
     return Response(
         content=resource_field.model_dump_json(exclude_unset=True, by_alias=True),
         media_type="application/json",
+        headers=headers,
     )
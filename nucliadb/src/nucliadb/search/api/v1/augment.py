@@ -17,7 +17,6 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
-import asyncio
 from time import time
 from typing import cast
 
@@ -66,6 +65,7 @@ from nucliadb.models.internal.augment import (
 )
 from nucliadb.search.api.v1.router import KB_PREFIX, api
 from nucliadb.search.augmentor import augmentor
+from nucliadb.search.augmentor.utils import hydration_request_limiter
 from nucliadb.search.search.cache import request_caches
 from nucliadb.search.search.metrics import query_parser_observer
 from nucliadb_models.augment import (
@@ -130,7 +130,7 @@ async def augment_endpoint(
         return AugmentResponse(resources={}, fields={}, paragraphs={})
 
     with request_caches():
-        max_ops = asyncio.Semaphore(50)
+        max_ops = hydration_request_limiter()
 
         first_augmented = await augmentor.augment(kbid, augmentations, concurrency_control=max_ops)
         response = build_augment_response(item, first_augmented)
@@ -27,7 +27,7 @@ from pydantic import ValidationError
 from nucliadb.common.catalog import catalog_facets, catalog_search
 from nucliadb.common.datamanagers.exceptions import KnowledgeBoxNotFound
 from nucliadb.common.exceptions import InvalidQueryError
-from nucliadb.models.responses import HTTPClientError
+from nucliadb.models.responses import HTTPClientError, ModelResponse
 from nucliadb.search import logger
 from nucliadb.search.api.v1.router import KB_PREFIX, api
 from nucliadb.search.api.v1.utils import fastapi_query
@@ -99,7 +99,7 @@ async def catalog_get(
     field_type_filter: list[FieldTypeName] = fastapi_query(
         SearchParamDefaults.field_type_filter, alias="field_type"
     ),
-) -> CatalogResponse | HTTPClientError:
+) -> ModelResponse | HTTPClientError:
     try:
         expr = (
             CatalogFilterExpression.model_validate_json(filter_expression) if filter_expression else None
@@ -145,14 +145,14 @@ async def catalog_post(
     request: Request,
     kbid: str,
     item: CatalogRequest,
-) -> CatalogResponse | HTTPClientError:
+) -> ModelResponse | HTTPClientError:
     return await catalog(kbid, item)
 
 
 async def catalog(
     kbid: str,
     item: CatalogRequest,
-) -> HTTPClientError | CatalogResponse:
+) -> HTTPClientError | ModelResponse:
     """
     Catalog endpoint is a simplified version of the search endpoint, it only
     returns bm25 results on titles and it does not support vector search.
@@ -175,7 +175,7 @@ async def catalog(
                     field_type_filter=item.field_type_filter,
                 ),
             )
-            return catalog_results
+            return ModelResponse(catalog_results)
     except InvalidQueryError as exc:
         return HTTPClientError(status_code=412, detail=str(exc))
     except KnowledgeBoxNotFound:
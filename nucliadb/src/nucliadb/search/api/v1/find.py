@@ -19,7 +19,7 @@
 #
 import json
 
-from fastapi import Body, Header, Query, Request, Response
+from fastapi import Body, Header, Query, Request
 from fastapi.openapi.models import Example
 from fastapi_versioning import version
 from pydantic import ValidationError
@@ -27,7 +27,7 @@ from pydantic import ValidationError
 from nucliadb.common import datamanagers
 from nucliadb.common.datamanagers.exceptions import KnowledgeBoxNotFound
 from nucliadb.common.exceptions import InvalidQueryError
-from nucliadb.models.responses import HTTPClientError
+from nucliadb.models.responses import HTTPClientError, ModelResponse
 from nucliadb.search import predict
 from nucliadb.search.api.v1.router import KB_PREFIX, api
 from nucliadb.search.api.v1.utils import fastapi_query
@@ -79,7 +79,6 @@ FIND_EXAMPLES = {
 @version(1)
 async def find_knowledgebox(
     request: Request,
-    response: Response,
     kbid: str,
     query: str = fastapi_query(SearchParamDefaults.query),
     filter_expression: str | None = fastapi_query(SearchParamDefaults.filter_expression),
@@ -134,7 +133,7 @@ async def find_knowledgebox(
     x_ndb_client: NucliaDBClientType = Header(NucliaDBClientType.API),
     x_nucliadb_user: str = Header(""),
     x_forwarded_for: str = Header(""),
-) -> KnowledgeboxFindResults | HTTPClientError:
+) -> ModelResponse | HTTPClientError:
     try:
         expr = FilterExpression.model_validate_json(filter_expression) if filter_expression else None
 
@@ -171,7 +170,7 @@ async def find_knowledgebox(
         detail = json.loads(exc.json())
         return HTTPClientError(status_code=422, detail=detail)
 
-    return await _find_endpoint(response, kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
+    return await _find_endpoint(kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
 
 
 @api.post(
@@ -187,24 +186,22 @@ async def find_knowledgebox(
 @version(1)
 async def find_post_knowledgebox(
     request: Request,
-    response: Response,
     kbid: str,
     item: FindRequest = Body(openapi_examples=FIND_EXAMPLES),
     x_ndb_client: NucliaDBClientType = Header(NucliaDBClientType.API),
     x_nucliadb_user: str = Header(""),
     x_forwarded_for: str = Header(""),
-) -> KnowledgeboxFindResults | HTTPClientError:
-    return await _find_endpoint(response, kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
+) -> ModelResponse | HTTPClientError:
+    return await _find_endpoint(kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
 
 
 async def _find_endpoint(
-    response: Response,
     kbid: str,
     item: FindRequest,
     x_ndb_client: NucliaDBClientType,
     x_nucliadb_user: str,
     x_forwarded_for: str,
-) -> KnowledgeboxFindResults | HTTPClientError:
+) -> ModelResponse | HTTPClientError:
     if item.search_configuration is not None:
         search_config = await datamanagers.atomic.search_configurations.get(
             kbid=kbid, name=item.search_configuration
@@ -232,10 +229,9 @@ async def _find_endpoint(
             results, incomplete, _ = await find(
                 kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for, metrics
             )
-            response.status_code = 206 if incomplete else 200
             if item.debug:
                 results.metrics = metrics.to_dict()
-            return results
+            return ModelResponse(results, status_code=206 if incomplete else 200)
     except KnowledgeBoxNotFound:
         return HTTPClientError(status_code=404, detail="Knowledge Box not found")
     except LimitsExceededError as exc:
@@ -27,6 +27,7 @@ from fastapi_versioning import version
 from nucliadb.common.ids import FieldId, ParagraphId
 from nucliadb.ingest.fields.base import Field
 from nucliadb.search.api.v1.router import KB_PREFIX, api
+from nucliadb.search.augmentor.utils import hydration_request_limiter
 from nucliadb.search.search import cache
 from nucliadb.search.search.cache import request_caches
 from nucliadb.search.search.hydrator.fields import hydrate_field, page_preview_id
@@ -189,7 +190,7 @@ class Hydrator:
         # cached paragraphs per field
         self.field_paragraphs: dict[FieldId, ParagraphIndex] = {}
 
-        self.max_ops = asyncio.Semaphore(50)
+        self.max_ops = hydration_request_limiter()
 
     async def hydrate(self, paragraph_ids: list[str]) -> Hydrated:
         paragraph_tasks = {}
@@ -312,7 +313,7 @@ class Hydrator:
 
     # TODO: proper typing
     async def _limited_concurrency(self, aw: Awaitable):
-        async with self.max_ops:
+        async with self.max_ops.slot():
             return await aw
 
     @alru_cache(maxsize=50)
@@ -17,7 +17,6 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
-import asyncio
 from time import time
 
 from fastapi import Header, HTTPException, Request
@@ -29,6 +28,7 @@ from nucliadb.common.models_utils import to_proto
 from nucliadb.models.internal.augment import Paragraph, ParagraphText
 from nucliadb.search.api.v1.router import KB_PREFIX, api
 from nucliadb.search.augmentor import augment_paragraphs
+from nucliadb.search.augmentor.utils import hydration_request_limiter
 from nucliadb.search.search import cache, rerankers
 from nucliadb.search.search.query_parser.parsers.retrieve import parse_retrieve
 from nucliadb.search.search.query_parser.parsers.unit_retrieval import get_rephrased_query
@@ -148,7 +148,7 @@ async def rerank(
         to_augment.append(Paragraph.from_text_block_match(text_block))
 
     augmented_paragraphs = await augment_paragraphs(
-        kbid, given=to_augment, select=[ParagraphText()], concurrency_control=asyncio.Semaphore(50)
+        kbid, given=to_augment, select=[ParagraphText()], concurrency_control=hydration_request_limiter()
     )
 
     to_rerank = []
@@ -17,9 +17,12 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+from fastapi import Depends
 from fastapi.routing import APIRouter
 
-api = APIRouter()
+from nucliadb.search.api.v1.utils import request_deadline
+
+api = APIRouter(dependencies=[Depends(request_deadline)])
 
 KB_PREFIX = "kb"
 KBS_PREFIX = "kbs"
@@ -20,7 +20,7 @@
 import json
 from time import time
 
-from fastapi import Body, Header, Query, Request, Response
+from fastapi import Body, Header, Query, Request
 from fastapi.openapi.models import Example
 from fastapi_versioning import version
 from pydantic import ValidationError
@@ -28,7 +28,7 @@ from pydantic import ValidationError
 from nucliadb.common.datamanagers.exceptions import KnowledgeBoxNotFound
 from nucliadb.common.exceptions import InvalidQueryError
 from nucliadb.common.models_utils import to_proto
-from nucliadb.models.responses import HTTPClientError
+from nucliadb.models.responses import HTTPClientError, ModelResponse
 from nucliadb.search import predict
 from nucliadb.search.api.v1.router import KB_PREFIX, api
 from nucliadb.search.api.v1.utils import fastapi_query
@@ -99,7 +99,6 @@ SEARCH_EXAMPLES = {
 @version(1)
 async def search_knowledgebox(
     request: Request,
-    response: Response,
     kbid: str,
     query: str = fastapi_query(SearchParamDefaults.query),
     filter_expression: str | None = fastapi_query(SearchParamDefaults.filter_expression),
@@ -153,7 +152,7 @@ async def search_knowledgebox(
     x_ndb_client: NucliaDBClientType = Header(NucliaDBClientType.API),
     x_nucliadb_user: str = Header(""),
     x_forwarded_for: str = Header(""),
-) -> KnowledgeboxSearchResults | HTTPClientError:
+) -> ModelResponse | HTTPClientError:
     try:
         expr = FilterExpression.model_validate_json(filter_expression) if filter_expression else None
 
@@ -189,7 +188,7 @@ async def search_knowledgebox(
     except ValidationError as exc:
         detail = json.loads(exc.json())
         return HTTPClientError(status_code=422, detail=detail)
-    return await _search_endpoint(response, kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
+    return await _search_endpoint(kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
 
 
 @api.post(
@@ -205,31 +204,28 @@ async def search_knowledgebox(
 @version(1)
 async def search_post_knowledgebox(
     request: Request,
-    response: Response,
     kbid: str,
     item: SearchRequest = Body(openapi_examples=SEARCH_EXAMPLES),
     x_ndb_client: NucliaDBClientType = Header(NucliaDBClientType.API),
     x_nucliadb_user: str = Header(""),
     x_forwarded_for: str = Header(""),
-) -> KnowledgeboxSearchResults | HTTPClientError:
-    return await _search_endpoint(response, kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
+) -> ModelResponse | HTTPClientError:
+    return await _search_endpoint(kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for)
 
 
 async def _search_endpoint(
-    response: Response,
     kbid: str,
     item: SearchRequest,
     x_ndb_client: NucliaDBClientType,
     x_nucliadb_user: str,
     x_forwarded_for: str,
-) -> KnowledgeboxSearchResults | HTTPClientError:
+) -> ModelResponse | HTTPClientError:
     try:
         with cache.request_caches():
             results, incomplete = await search(
                 kbid, item, x_ndb_client, x_nucliadb_user, x_forwarded_for
             )
-            response.status_code = 206 if incomplete else 200
-            return results
+            return ModelResponse(results, status_code=206 if incomplete else 200)
     except KnowledgeBoxNotFound:
         return HTTPClientError(status_code=404, detail="Knowledge Box not found")
     except LimitsExceededError as exc:
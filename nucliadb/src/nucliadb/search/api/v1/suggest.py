@@ -32,10 +32,16 @@ from nucliadb.search.requesters.utils import Method, nidx_query
 from nucliadb.search.search import cache
 from nucliadb.search.search.merge import merge_suggest_results
 from nucliadb.search.search.query_parser.parsers import parse_suggest
+from nucliadb.search.search.suggest_cache import (
+    filters_key,
+    get_suggest_cache,
+    normalize_query,
+    results_key,
+)
 from nucliadb_models import SuggestRequest
 from nucliadb_models.filters import FilterExpression
 from nucliadb_models.resource import NucliaDBRoles
-from nucliadb_models.search import KnowledgeboxSuggestResults
+from nucliadb_models.search import KnowledgeboxSuggestResults, Paragraphs
 from nucliadb_models.suggest import SuggestOptions, SuggestParamDefaults
 from nucliadb_models.utils import DateTime
 from nucliadb_utils.authentication import requires
@@ -162,6 +168,38 @@ async def suggest(
     show_hidden: bool,
     security_groups: list[str] | None,
 ) -> KnowledgeboxSuggestResults:
+    query = normalize_query(query)
+    suggest_cache = get_suggest_cache()
+    filters = filters_key(
+        filter_expression=filter_expression,
+        fields=fields,
+        label_filters=label_filters,
+        range_creation_start=range_creation_start,
+        range_creation_end=range_creation_end,
+        range_modification_start=range_modification_start,
+        range_modification_end=range_modification_end,
+        show_hidden=show_hidden,
+        security_groups=security_groups,
+    )
+    key = results_key(filters, query, features, highlight, debug)
+    cached = suggest_cache.get_results(kbid, key)
+    if cached is not None:
+        return cached
+
+    entities = None
+    if SuggestOptions.ENTITIES in features and not debug:
+        entities = suggest_cache.get_entities(kbid, filters, query)
+    if entities is not None:
+        # Only ask nidx for what the cache can't answer
+        features = [feature for feature in features if feature != SuggestOptions.ENTITIES]
+        if not features:
+            search_results = KnowledgeboxSuggestResults(
+                paragraphs=Paragraphs(results=[], query="", min_score=0),
+                entities=entities,
+            )
+            suggest_cache.set_results(kbid, key, search_results)
+            return search_results
+
     with cache.request_caches():
         pb_query = await parse_suggest(
             kbid,
@@ -187,7 +225,14 @@ async def suggest(
             highlight=highlight,
             top_k=pb_query.top_k,
         )
+        if entities is not None:
+            search_results.entities = entities
+        elif SuggestOptions.ENTITIES in features and search_results.entities is not None:
+            suggest_cache.set_entities(
+                kbid, filters, query, search_results.entities, found=len(results.entity_results.nodes)
+            )
         if debug and queried_shards:
             search_results.shards = queried_shards
 
+        suggest_cache.set_results(kbid, key, search_results)
         return search_results
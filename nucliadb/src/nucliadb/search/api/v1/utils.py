@@ -17,11 +17,18 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import math
 from typing import Any
 
-from fastapi import Query
+from fastapi import HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 
+from nucliadb.search.settings import settings
 from nucliadb_models.search import ParamDefault
+from nucliadb_utils import deadline
+from nucliadb_utils.exceptions import DeadlineExceededError
+
+TIMEOUT_HEADER = "X-NucliaDB-Timeout"
 
 _NOT_SET = object()
 
@@ -41,3 +48,31 @@ def fastapi_query(param: ParamDefault, default: Any | None = _NOT_SET, **kw) ->
         max_length=param.max_items,
         **kw,
     )
+
+
+async def request_deadline(request: Request) -> None:
+    """Set the deadline of the request from the configured request timeout and the
+    timeout header. The header can only shorten the configured timeout.
+    """
+    timeout = settings.request_timeout
+    header = request.headers.get(TIMEOUT_HEADER)
+    if header is not None:
+        try:
+            header_timeout = float(header)
+        except ValueError:
+            header_timeout = math.nan
+        if not 0 < header_timeout < math.inf:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{TIMEOUT_HEADER} header must be a positive number of seconds",
+            )
+        timeout = header_timeout if timeout is None else min(timeout, header_timeout)
+    if timeout is not None:
+        deadline.set_deadline(timeout)
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "Request deadline exceeded"},
+    )
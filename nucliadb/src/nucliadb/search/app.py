@@ -34,6 +34,7 @@ from nucliadb.middleware import (
 )
 from nucliadb.search import API_PREFIX
 from nucliadb.search.api.v1.router import api as api_v1
+from nucliadb.search.api.v1.utils import deadline_exceeded_handler
 from nucliadb.search.lifecycle import lifespan
 from nucliadb_telemetry import errors
 from nucliadb_telemetry.fastapi.utils import (
@@ -42,6 +43,7 @@ from nucliadb_telemetry.fastapi.utils import (
 )
 from nucliadb_utils.audit.stream import AuditMiddleware
 from nucliadb_utils.authentication import NucliaCloudAuthenticationBackend
+from nucliadb_utils.exceptions import DeadlineExceededError
 from nucliadb_utils.fastapi.openapi import extend_openapi
 from nucliadb_utils.fastapi.versioning import VersionedFastAPI
 from nucliadb_utils.settings import running_settings
@@ -69,6 +71,7 @@ fastapi_settings: dict[str, Any] = dict(
     exception_handlers={
         Exception: global_exception_handler,
         ClientDisconnect: client_disconnect_handler,
+        DeadlineExceededError: deadline_exceeded_handler,
     },
     strict_content_type=False,
 )
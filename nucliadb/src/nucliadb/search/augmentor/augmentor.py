@@ -53,6 +53,8 @@ from nucliadb.search.augmentor.utils import limited_concurrency
 from nucliadb.search.search.hydrator import ResourceHydrationOptions
 from nucliadb_models.common import FieldTypeName
 from nucliadb_models.resource import Resource
+from nucliadb_telemetry import timings
+from nucliadb_utils.asyncio_utils import RequestLimiter
 
 from .extracted_text import extracted_texts, nidx_et_cache
 from .fields import augment_field
@@ -65,7 +67,7 @@ async def augment(
     kbid: str,
     augmentations: list[Augment],
     *,
-    concurrency_control: asyncio.Semaphore | None = None,
+    concurrency_control: RequestLimiter | None = None,
 ) -> Augmented:
     """Process multiple augmentations concurrently and return the augmented content.
 
@@ -84,7 +86,7 @@ async def augment_paragraphs(
     given: list[Paragraph],
     select: list[ParagraphProp],
     *,
-    concurrency_control: asyncio.Semaphore | None = None,
+    concurrency_control: RequestLimiter | None = None,
 ) -> dict[ParagraphId, AugmentedParagraph]:
     """Augment a list of paragraphs following an augmentation. Paragraphs that
     can't be augmented are not returned.
@@ -242,7 +244,7 @@ class AugmentorOps:
     async def run(
         self,
         *,
-        concurrency_control: asyncio.Semaphore | None = None,
+        concurrency_control: RequestLimiter | None = None,
     ) -> Augmented:
         nidx_extracted_texts = await extracted_texts(self.kbid, self.field_texts, self.paragraph_texts)
 
@@ -259,8 +261,14 @@ class AugmentorOps:
     async def _run_augmentations(
         self,
         *,
-        concurrency_control: asyncio.Semaphore | None = None,
+        concurrency_control: RequestLimiter | None = None,
     ) -> Augmented:
+        timings.increment(
+            "augmentor.resources", len(self.resource_augments) + len(self.deep_resource_augments)
+        )
+        timings.increment("augmentor.fields", len(self.field_augments))
+        timings.increment("augmentor.paragraphs", len(self.paragraph_augments))
+
         resource_ops = []
         deep_resource_ops = []
         field_ops = []
@@ -44,7 +44,9 @@ from nucliadb.search.search import cache
 from nucliadb.search.search.hydrator import ResourceHydrationOptions
 from nucliadb_models.search import ResourceProperties
 from nucliadb_protos import resources_pb2
+from nucliadb_telemetry import timings
 from nucliadb_utils import const
+from nucliadb_utils.asyncio_utils import RequestLimiter
 from nucliadb_utils.utilities import has_feature
 
 
@@ -163,7 +165,7 @@ async def augment_resources_deep(
     given: list[str],
     opts: ResourceHydrationOptions,
     *,
-    concurrency_control: asyncio.Semaphore | None = None,
+    concurrency_control: RequestLimiter | None = None,
 ) -> dict[str, nucliadb_models.resource.Resource]:
     """Augment resources using the Resource model. Depending on the options,
     this can serialize resource fields, extracted data like text, vectors...
@@ -180,6 +182,8 @@ async def augment_resources_deep(
         opts.show.remove(ResourceProperties.EXTRACTED)
         opts.extracted.clear()
 
+    timings.increment("augmentor.resources", len(given))
+
     ops = []
     for rid in given:
         task = asyncio.create_task(
@@ -17,17 +17,37 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
-import asyncio
 from collections.abc import Awaitable
 from contextlib import AsyncExitStack
 from typing import TypeVar
 
+from nucliadb.search.settings import settings
+from nucliadb_utils.asyncio_utils import AdaptiveLimiter, RequestLimiter
+
 T = TypeVar("T")
 
+# Shared by all requests, so hydration backs off as a whole when maindb or
+# storage slow down instead of each request queueing up its own fetches
+hydration_limiter = AdaptiveLimiter(
+    "hydration",
+    initial_limit=settings.hydration_concurrency_initial,
+    min_limit=settings.hydration_concurrency_min,
+    max_limit=settings.hydration_concurrency_max,
+    latency_threshold=settings.hydration_latency_threshold,
+)
+
+
+def hydration_request_limiter() -> RequestLimiter:
+    """
+    Concurrency limit for the hydration operations of a request, bounded both
+    per request and by the process-wide `hydration_limiter`
+    """
+    return RequestLimiter(settings.hydration_concurrency_per_request, shared=hydration_limiter)
+
 
-async def limited_concurrency(aw: Awaitable[T], *, max_ops: asyncio.Semaphore | None) -> T:
+async def limited_concurrency(aw: Awaitable[T], *, max_ops: RequestLimiter | None) -> T:
     async with AsyncExitStack() as stack:
         if max_ops is not None:
-            await stack.enter_async_context(max_ops)
+            await stack.enter_async_context(max_ops.slot())
         r = await aw
     return r
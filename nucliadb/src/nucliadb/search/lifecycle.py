@@ -28,6 +28,10 @@ from nucliadb.common.nidx import start_nidx_utility, stop_nidx_utility
 from nucliadb.ingest.utils import start_ingest, stop_ingest
 from nucliadb.search import SERVICE_NAME
 from nucliadb.search.predict import start_predict_engine, stop_predict_engine
+from nucliadb.search.search.suggest_cache import (
+    start_suggest_cache_invalidation,
+    stop_suggest_cache_invalidation,
+)
 from nucliadb_telemetry.utils import clean_telemetry, setup_telemetry
 from nucliadb_utils.utilities import (
     Utility,
@@ -51,10 +55,12 @@ async def lifespan(app: FastAPI):
     await start_nidx_utility(SERVICE_NAME)
 
     await start_audit_utility(SERVICE_NAME)
+    await start_suggest_cache_invalidation()
 
     async with inject_app_context(app):
         yield
 
+    await stop_suggest_cache_invalidation()
     await stop_ingest()
     if get_utility(Utility.PARTITION):
         clean_utility(Utility.PARTITION)
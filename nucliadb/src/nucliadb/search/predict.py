@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
 import base64
 import json
 import logging
@@ -62,7 +63,8 @@ from nucliadb_protos.resources_pb2 import FieldMetadata
 from nucliadb_protos.utils_pb2 import RelationNode
 from nucliadb_telemetry import errors, metrics
 from nucliadb_telemetry.aiohttp import InstrumentedClientSession
-from nucliadb_utils.exceptions import LimitsExceededError
+from nucliadb_utils import deadline
+from nucliadb_utils.exceptions import DeadlineExceededError, LimitsExceededError
 from nucliadb_utils.settings import nuclia_settings
 from nucliadb_utils.utilities import Utility, clean_utility, get_utility, set_utility
 
@@ -288,7 +290,17 @@ class PredictEngine:
     )
     async def make_request(self, method: str, **request_args) -> aiohttp.ClientResponse:
         func = getattr(self.session, method.lower())
-        return await func(**request_args)
+        # bound the request, including reading streamed responses, by the time
+        # left until the request deadline
+        timeout = deadline.get_timeout()
+        if timeout is not None:
+            request_args["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        try:
+            return await func(**request_args)
+        except asyncio.TimeoutError:
+            if deadline.exceeded():
+                raise DeadlineExceededError() from None
+            raise
 
     @predict_observer.wrap({"type": "rephrase"})
     async def rephrase_query(self, kbid: str, item: RephraseModel) -> RephraseResponse:
@@ -19,6 +19,7 @@
 
 import asyncio
 import json
+import time
 from enum import Enum, auto
 from typing import Awaitable, Callable, overload
 
@@ -42,7 +43,9 @@ from nucliadb.search import logger
 from nucliadb.search.search.shards import graph_search_shards, query_shards, suggest_shards
 from nucliadb.search.settings import settings
 from nucliadb_protos.writer_pb2 import ShardObject as PBShardObject
-from nucliadb_telemetry import errors
+from nucliadb_telemetry import errors, timings
+from nucliadb_utils import deadline
+from nucliadb_utils.exceptions import DeadlineExceededError
 
 
 class Method(Enum):
@@ -119,8 +122,14 @@ async def nidx_query(
     else:  # pragma: no cover
         assert_never(method)
 
-    timeout = timeout or settings.search_timeout
+    # bounded by the request deadline, raising if there's no time left
+    timeout = deadline.get_timeout(timeout or settings.search_timeout)
     result: SearchResponse | SuggestResponse | GraphSearchResponse
+    # nidx fans out the query to all shards in a single call, so we can only
+    # time the whole call from here
+    timing_name = f"nidx.{method.name.lower()}"
+    timings.set_value(f"{timing_name}.shards", len(shards))
+    start = time.monotonic()
     try:
         result = await asyncio.wait_for(
             func(
@@ -130,6 +139,8 @@ async def nidx_query(
             timeout=timeout,
         )
     except Exception as exc:
+        if isinstance(exc, asyncio.TimeoutError) and deadline.exceeded():
+            raise DeadlineExceededError() from exc
         query_dict = MessageToDict(pb_query)
         query_dict.pop("vector", None)
         extra = {
@@ -137,6 +148,8 @@ async def nidx_query(
             "query": json.dumps(query_dict),
         }
         raise handle_nidx_exception(exc, extra=extra)
+    finally:
+        timings.record_duration(timing_name, time.monotonic() - start)
 
     return result
 
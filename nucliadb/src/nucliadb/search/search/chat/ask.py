@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
 import dataclasses
 import functools
 import json
@@ -58,6 +59,7 @@ from nucliadb.search.search.chat.query import (
     add_resource_filter,
     get_answer_stream,
     get_find_results,
+    get_main_query_reranker,
     get_relations_results,
     maybe_audit_chat,
     rephrase_query,
@@ -68,10 +70,12 @@ from nucliadb.search.search.exceptions import (
     IncompleteFindResultsError,
 )
 from nucliadb.search.search.graph_strategy import get_graph_results
-from nucliadb.search.search.metrics import AskMetrics, Metrics
+from nucliadb.search.search.metrics import AskMetrics, Metrics, speculative_retrieval_counter
 from nucliadb.search.search.query_parser.fetcher import Fetcher
 from nucliadb.search.search.query_parser.parsers.ask import fetcher_for_ask, parse_ask
 from nucliadb.search.search.rank_fusion import WeightedCombSum
+from nucliadb.search.search.retrieval_session import retrieval_session
+from nucliadb.search.settings import settings
 from nucliadb_models.retrieval import (
     GraphScore,
     KeywordScore,
@@ -249,125 +253,132 @@ class AskResult:
                 else:  # pragma: no cover
                     assert_never(answer_chunk)
 
-        if self._object is not None:
-            yield JSONAskResponseItem(object=self._object.object)
-            if not first_chunk_yielded:
-                # When there is a JSON generative response, we consider the first chunk yielded
-                # to be the moment when the JSON object is yielded, not the text
-                self.metrics.record_first_chunk_yielded()
-                first_chunk_yielded = True
-
-        yield RetrievalAskResponseItem(
-            results=self.main_results,
-            best_matches=[
-                AskRetrievalMatch(
-                    id=match.paragraph.id,
-                )
-                for match in self.best_matches
-            ],
-        )
+        # Relations are found from the answer, so we can start querying them
+        # in the background while the rest of the response is streamed
+        relations_task = None
+        if self.ask_request_with_relations and self.status_code == AnswerStatusCode.SUCCESS:
+            relations_task = asyncio.create_task(self.get_relations_results())
 
-        if len(self.prequeries_results) > 0:
-            item = PrequeriesAskResponseItem()
-            for index, (prequery, result) in enumerate(self.prequeries_results):
-                prequery_id = prequery.id or f"prequery_{index}"
-                item.results[prequery_id] = result
-            yield item
+        try:
+            if self._object is not None:
+                yield JSONAskResponseItem(object=self._object.object)
+                if not first_chunk_yielded:
+                    # When there is a JSON generative response, we consider the first chunk yielded
+                    # to be the moment when the JSON object is yielded, not the text
+                    self.metrics.record_first_chunk_yielded()
+                    first_chunk_yielded = True
+
+            yield RetrievalAskResponseItem(
+                results=self.main_results,
+                best_matches=[
+                    AskRetrievalMatch(
+                        id=match.paragraph.id,
+                    )
+                    for match in self.best_matches
+                ],
+            )
+
+            if len(self.prequeries_results) > 0:
+                item = PrequeriesAskResponseItem()
+                for index, (prequery, result) in enumerate(self.prequeries_results):
+                    prequery_id = prequery.id or f"prequery_{index}"
+                    item.results[prequery_id] = result
+                yield item
+
+            # Then the status
+            if self.status_code == AnswerStatusCode.ERROR:
+                # If predict yielded an error status, we yield it too and halt the stream immediately
+                yield StatusAskResponseItem(
+                    code=self.status_code.value,
+                    status=self.status_code.prettify(),
+                    details=self.status_error_details or "Unknown error",
+                )
+                return
 
-        # Then the status
-        if self.status_code == AnswerStatusCode.ERROR:
-            # If predict yielded an error status, we yield it too and halt the stream immediately
             yield StatusAskResponseItem(
                 code=self.status_code.value,
                 status=self.status_code.prettify(),
-                details=self.status_error_details or "Unknown error",
             )
-            return
-
-        yield StatusAskResponseItem(
-            code=self.status_code.value,
-            status=self.status_code.prettify(),
-        )
 
-        # Audit the answer
-        if self._object is None:
-            audit_answer = self._answer_text.encode("utf-8")
-        else:
-            audit_answer = json.dumps(self._object.object).encode("utf-8")
-        self.auditor.audit(
-            text_answer=audit_answer,
-            text_reasoning=self._reasoning_text,
-            generative_answer_time=self.metrics["stream_predict_answer"],
-            generative_answer_first_chunk_time=self.metrics.get_first_chunk_time() or 0,
-            generative_reasoning_first_chunk_time=self.metrics.get_first_reasoning_chunk_time(),
-            rephrase_time=self.metrics.get("rephrase"),
-            status_code=self.status_code,
-        )
-
-        yield AugmentedContextResponseItem(augmented=self.augmented_context)
-
-        # Stream out the citations
-        if self._citations is not None:
-            yield CitationsAskResponseItem(
-                citations=self._citations.citations,
-            )
-        # Stream out the footnote citations mapping
-        if self._footnote_citations is not None:
-            yield FootnoteCitationsAskResponseItem(
-                footnote_to_context=self._footnote_citations.footnote_to_context,
+            # Audit the answer
+            if self._object is None:
+                audit_answer = self._answer_text.encode("utf-8")
+            else:
+                audit_answer = json.dumps(self._object.object).encode("utf-8")
+            self.auditor.audit(
+                text_answer=audit_answer,
+                text_reasoning=self._reasoning_text,
+                generative_answer_time=self.metrics["stream_predict_answer"],
+                generative_answer_first_chunk_time=self.metrics.get_first_chunk_time() or 0,
+                generative_reasoning_first_chunk_time=self.metrics.get_first_reasoning_chunk_time(),
+                rephrase_time=self.metrics.get("rephrase"),
+                status_code=self.status_code,
             )
 
-        # Stream out generic metadata about the answer
-        if self._metadata is not None:
-            yield MetadataAskResponseItem(
-                tokens=AskTokens(
-                    input=self._metadata.input_tokens,
-                    output=self._metadata.output_tokens,
-                    input_nuclia=self._metadata.input_nuclia_tokens,
-                    output_nuclia=self._metadata.output_nuclia_tokens,
-                ),
-                timings=AskTimings(
-                    generative_first_chunk=self._metadata.timings.get("generative_first_chunk"),
-                    generative_total=self._metadata.timings.get("generative"),
-                ),
-            )
+            yield AugmentedContextResponseItem(augmented=self.augmented_context)
 
-        if self._consumption is not None:
-            yield ConsumptionResponseItem(
-                normalized_tokens=TokensDetail(
-                    input=self._consumption.normalized_tokens.input,
-                    output=self._consumption.normalized_tokens.output,
-                    image=self._consumption.normalized_tokens.image,
-                ),
-                customer_key_tokens=TokensDetail(
-                    input=self._consumption.customer_key_tokens.input,
-                    output=self._consumption.customer_key_tokens.output,
-                    image=self._consumption.customer_key_tokens.image,
-                ),
-            )
+            # Stream out the citations
+            if self._citations is not None:
+                yield CitationsAskResponseItem(
+                    citations=self._citations.citations,
+                )
+            # Stream out the footnote citations mapping
+            if self._footnote_citations is not None:
+                yield FootnoteCitationsAskResponseItem(
+                    footnote_to_context=self._footnote_citations.footnote_to_context,
+                )
 
-        # Stream out the relations results
-        should_query_relations = (
-            self.ask_request_with_relations and self.status_code == AnswerStatusCode.SUCCESS
-        )
-        if should_query_relations:
-            relations = await self.get_relations_results()
-            yield RelationsAskResponseItem(relations=relations)
+            # Stream out generic metadata about the answer
+            if self._metadata is not None:
+                yield MetadataAskResponseItem(
+                    tokens=AskTokens(
+                        input=self._metadata.input_tokens,
+                        output=self._metadata.output_tokens,
+                        input_nuclia=self._metadata.input_nuclia_tokens,
+                        output_nuclia=self._metadata.output_nuclia_tokens,
+                    ),
+                    timings=AskTimings(
+                        generative_first_chunk=self._metadata.timings.get("generative_first_chunk"),
+                        generative_total=self._metadata.timings.get("generative"),
+                    ),
+                )
 
-        # Stream out debug information
-        if self.ask_request_with_debug_flag:
-            predict_request = None
-            if self.debug_chat_model:
-                predict_request = self.debug_chat_model.model_dump(mode="json")
-            yield DebugAskResponseItem(
-                metadata={
-                    "prompt_context": sorted_prompt_context_list(
-                        self.prompt_context, self.prompt_context_order
+            if self._consumption is not None:
+                yield ConsumptionResponseItem(
+                    normalized_tokens=TokensDetail(
+                        input=self._consumption.normalized_tokens.input,
+                        output=self._consumption.normalized_tokens.output,
+                        image=self._consumption.normalized_tokens.image,
                     ),
-                    "predict_request": predict_request,
-                },
-                metrics=self.metrics.dump(),
-            )
+                    customer_key_tokens=TokensDetail(
+                        input=self._consumption.customer_key_tokens.input,
+                        output=self._consumption.customer_key_tokens.output,
+                        image=self._consumption.customer_key_tokens.image,
+                    ),
+                )
+
+            # Stream out the relations results
+            if relations_task is not None:
+                relations = await relations_task
+                yield RelationsAskResponseItem(relations=relations)
+
+            # Stream out debug information
+            if self.ask_request_with_debug_flag:
+                predict_request = None
+                if self.debug_chat_model:
+                    predict_request = self.debug_chat_model.model_dump(mode="json")
+                yield DebugAskResponseItem(
+                    metadata={
+                        "prompt_context": sorted_prompt_context_list(
+                            self.prompt_context, self.prompt_context_order
+                        ),
+                        "predict_request": predict_request,
+                    },
+                    metrics=self.metrics.dump(),
+                )
+        finally:
+            if relations_task is not None and not relations_task.done():
+                relations_task.cancel()
 
     async def json(self) -> str:
         # First, run the stream in memory to get all the data in memory
@@ -562,7 +573,24 @@ async def ask(
 
     # Maybe rephrase the query
     rephrased_query = None
+    speculative_retrieval: asyncio.Task[RetrievalResults] | None = None
     if len(chat_history) > 0 or len(user_context) > 0:
+        if settings.ask_speculative_retrieval:
+            # Retrieve with the user query while rephrasing, in case the
+            # rephrase doesn't change it. Use a copy of the request, as
+            # retrieval may add filters to it
+            speculative_retrieval = asyncio.create_task(
+                retrieval_step(
+                    kbid=kbid,
+                    main_query=user_query,
+                    ask_request=ask_request.model_copy(deep=True),
+                    client_type=client_type,
+                    user_id=user_id,
+                    origin=origin,
+                    metrics=metrics.child_span("speculative_retrieval"),
+                    resource=resource,
+                )
+            )
         try:
             with metrics.time("rephrase"):
                 rephrase_response = await rephrase_query(
@@ -582,20 +610,35 @@ async def ask(
 
         except RephraseMissingContextError:
             logger.info("Failed to rephrase ask query, using original")
+        except BaseException:
+            if speculative_retrieval is not None:
+                _discard_task(speculative_retrieval)
+            raise
 
     try:
         with metrics.time("retrieval"):
-            retrieval_results = await retrieval_step(
-                kbid=kbid,
-                # Prefer the rephrased query for retrieval if available
-                main_query=rephrased_query or user_query,
-                ask_request=ask_request,
-                client_type=client_type,
-                user_id=user_id,
-                origin=origin,
-                metrics=metrics,
-                resource=resource,
-            )
+            retrieval_results = None
+            if speculative_retrieval is not None:
+                # Same query the speculative retrieval used
+                if rephrased_query is None or rephrased_query == user_query:
+                    speculative_retrieval_counter.inc({"result": "hit"})
+                    retrieval_results = await speculative_retrieval
+                else:
+                    speculative_retrieval_counter.inc({"result": "miss"})
+                    _discard_task(speculative_retrieval)
+
+            if retrieval_results is None:
+                retrieval_results = await retrieval_step(
+                    kbid=kbid,
+                    # Prefer the rephrased query for retrieval if available
+                    main_query=rephrased_query or user_query,
+                    ask_request=ask_request,
+                    client_type=client_type,
+                    user_id=user_id,
+                    origin=origin,
+                    metrics=metrics,
+                    resource=resource,
+                )
     except NoRetrievalResultsError as err:
         maybe_audit_chat(
             kbid=kbid,
@@ -718,6 +761,15 @@ async def ask(
     )
 
 
+def _discard_task(task: asyncio.Task) -> None:
+    """Cancel a task whose result is not needed anymore, without logging its
+    exception if it already failed."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
 def handled_ask_exceptions(func):
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
@@ -798,28 +850,32 @@ async def retrieval_step(
 ) -> RetrievalResults:
     """
     This function encapsulates all the logic related to retrieval in the ask endpoint.
+
+    All retrievals (main query, prequeries and graph) share a retrieval session,
+    so repeated predict queries and overlapping results hydration are done once.
     """
-    if resource is None:
-        return await retrieval_in_kb(
-            kbid,
-            main_query,
-            ask_request,
-            client_type,
-            user_id,
-            origin,
-            metrics,
-        )
-    else:
-        return await retrieval_in_resource(
-            kbid,
-            resource,
-            main_query,
-            ask_request,
-            client_type,
-            user_id,
-            origin,
-            metrics,
-        )
+    with retrieval_session():
+        if resource is None:
+            return await retrieval_in_kb(
+                kbid,
+                main_query,
+                ask_request,
+                client_type,
+                user_id,
+                origin,
+                metrics,
+            )
+        else:
+            return await retrieval_in_resource(
+                kbid,
+                resource,
+                main_query,
+                ask_request,
+                client_type,
+                user_id,
+                origin,
+                metrics,
+            )
 
 
 async def retrieval_in_kb(
@@ -833,29 +889,49 @@ async def retrieval_in_kb(
 ) -> RetrievalResults:
     prequeries = parse_prequeries(ask_request)
     graph_strategy = parse_graph_strategy(ask_request)
-    main_results, prequeries_results, fetcher, reranker = await get_find_results(
-        kbid=kbid,
-        query=main_query,
-        item=ask_request,
-        ndb_client=client_type,
-        user=user_id,
-        origin=origin,
-        metrics=metrics.child_span("hybrid_retrieval"),
-        prequeries_strategy=prequeries,
-    )
-
-    if graph_strategy is not None:
-        graph_results, graph_request = await get_graph_results(
+    # The graph strategy only depends on the query, so we run it concurrently
+    # with the hybrid retrieval. It must use the same reranker as the main
+    # query, which we can build upfront
+    find_task = asyncio.create_task(
+        get_find_results(
             kbid=kbid,
             query=main_query,
             item=ask_request,
             ndb_client=client_type,
             user=user_id,
             origin=origin,
-            graph_strategy=graph_strategy,
-            metrics=metrics.child_span("graph_retrieval"),
-            text_block_reranker=reranker,
+            metrics=metrics.child_span("hybrid_retrieval"),
+            prequeries_strategy=prequeries,
         )
+    )
+    tasks: list[asyncio.Task] = [find_task]
+    graph_task = None
+    if graph_strategy is not None:
+        graph_task = asyncio.create_task(
+            get_graph_results(
+                kbid=kbid,
+                query=main_query,
+                item=ask_request,
+                ndb_client=client_type,
+                user=user_id,
+                origin=origin,
+                graph_strategy=graph_strategy,
+                metrics=metrics.child_span("graph_retrieval"),
+                text_block_reranker=get_main_query_reranker(ask_request, main_query),
+            )
+        )
+        tasks.append(graph_task)
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # if any retrieval fails, don't leave the other one running
+        for task in tasks:
+            task.cancel()
+
+    main_results, prequeries_results, fetcher, _ = find_task.result()
+    if graph_strategy is not None and graph_task is not None:
+        graph_results, graph_request = graph_task.result()
 
         if prequeries_results is None:
             prequeries_results = []
@@ -1149,51 +1149,86 @@ class PromptContextBuilder:
                     "Unknown image strategy",
                     extra={"strategy": strategy.name, "kbid": self.kbid},
                 )
-        page_images_added = 0
+        # Find all candidate images in paragraph order first, so we can fetch
+        # them concurrently and add them to the context in the same order
+        page_candidates: dict[str, tuple[ParagraphId, int]] = {}
+        paragraph_candidates: dict[str, tuple[ParagraphId, str]] = {}
+        order: list[str] = []
         for paragraph in self.ordered_paragraphs:
             pid = ParagraphId.from_string(paragraph.id)
             paragraph_page_number = get_paragraph_page_number(paragraph)
-            if (
-                page_image_strategy is not None
-                and page_images_added < max_page_images
-                and paragraph_page_number is not None
-            ):
+            if page_image_strategy is not None and paragraph_page_number is not None:
                 # page_image_id: rid/f/myfield/0
                 page_image_id = "/".join([pid.field_id.full(), str(paragraph_page_number)])
-                if page_image_id not in context.images:
-                    image = await get_page_image(self.kbid, pid, paragraph_page_number)
-                    if image is not None:
-                        ops += 1
-                        context.images[page_image_id] = image
-                        page_images_added += 1
-                    else:
-                        logger.warning(
-                            f"Could not retrieve image for paragraph from storage",
-                            extra={
-                                "kbid": self.kbid,
-                                "paragraph": pid.full(),
-                                "page_number": paragraph_page_number,
-                            },
-                        )
+                if page_image_id not in context.images and page_image_id not in page_candidates:
+                    page_candidates[page_image_id] = (pid, paragraph_page_number)
+                    order.append(page_image_id)
 
             add_table = table_image_strategy is not None and paragraph.is_a_table
             add_paragraph = paragraph_image_strategy is not None and not paragraph.is_a_table
-            if (add_table or add_paragraph) and (
-                paragraph.reference is not None and paragraph.reference != ""
+            if (
+                (add_table or add_paragraph)
+                and (paragraph.reference is not None and paragraph.reference != "")
+                and paragraph.id not in paragraph_candidates
             ):
-                pimage = await get_paragraph_image(self.kbid, pid, paragraph.reference)
-                if pimage is not None:
-                    ops += 1
-                    context.images[paragraph.id] = pimage
-                else:
-                    logger.warning(
-                        f"Could not retrieve image for paragraph from storage",
-                        extra={
-                            "kbid": self.kbid,
-                            "paragraph": pid.full(),
-                            "reference": paragraph.reference,
-                        },
-                    )
+                paragraph_candidates[paragraph.id] = (pid, paragraph.reference)
+                order.append(paragraph.id)
+
+        async def _get_page_image(page_image_id: str) -> Image | None:
+            pid, page_number = page_candidates[page_image_id]
+            image = await get_page_image(self.kbid, pid, page_number)
+            if image is None:
+                logger.warning(
+                    f"Could not retrieve image for paragraph from storage",
+                    extra={
+                        "kbid": self.kbid,
+                        "paragraph": pid.full(),
+                        "page_number": page_number,
+                    },
+                )
+            return image
+
+        async def _get_paragraph_image(paragraph_id: str) -> Image | None:
+            pid, reference = paragraph_candidates[paragraph_id]
+            image = await get_paragraph_image(self.kbid, pid, reference)
+            if image is None:
+                logger.warning(
+                    f"Could not retrieve image for paragraph from storage",
+                    extra={
+                        "kbid": self.kbid,
+                        "paragraph": pid.full(),
+                        "reference": reference,
+                    },
+                )
+            return image
+
+        paragraph_images_task = asyncio.gather(
+            *(_get_paragraph_image(paragraph_id) for paragraph_id in paragraph_candidates)
+        )
+
+        # Only `max_page_images` pages are added. Fetch as many as missing in
+        # each round, so we get the same pages as fetching them one by one
+        images: dict[str, Image] = {}
+        pending_pages = list(page_candidates.keys())
+        page_images_added = 0
+        while pending_pages and page_images_added < max_page_images:
+            batch = pending_pages[: max_page_images - page_images_added]
+            pending_pages = pending_pages[len(batch) :]
+            for page_image_id, image in zip(
+                batch, await asyncio.gather(*(_get_page_image(id) for id in batch))
+            ):
+                if image is not None:
+                    images[page_image_id] = image
+                    page_images_added += 1
+
+        for paragraph_id, image in zip(paragraph_candidates, await paragraph_images_task):
+            if image is not None:
+                images[paragraph_id] = image
+
+        for image_id in order:
+            if image_id in images:
+                ops += 1
+                context.images[image_id] = images[image_id]
         self.metrics.set("image_ops", ops)
 
     async def _build_context(self, context: CappedPromptContext) -> None:
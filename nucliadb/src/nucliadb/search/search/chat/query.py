@@ -34,6 +34,7 @@ from nucliadb.search.search.merge import merge_relations_results
 from nucliadb.search.search.metrics import Metrics
 from nucliadb.search.search.query_parser.fetcher import Fetcher
 from nucliadb.search.search.query_parser.models import Query, RelationQuery, UnitRetrieval
+from nucliadb.search.search.query_parser.parsers.common import parse_reranker
 from nucliadb.search.search.query_parser.parsers.unit_retrieval import convert_retrieval_to_proto
 from nucliadb.search.search.rerankers import Reranker, get_reranker
 from nucliadb.search.settings import settings
@@ -102,6 +103,7 @@ async def get_find_results(
     prequeries_results = None
     prefilter_queries_results = None
     queries_results = None
+    prequeries: list[PreQuery] = []
     if prequeries_strategy is not None:
         prefilters = [prequery for prequery in prequeries_strategy.queries if prequery.prefilter]
         prequeries = [prequery for prequery in prequeries_strategy.queries if not prequery.prefilter]
@@ -130,29 +132,41 @@ async def get_find_results(
                     add_resource_filter(prequery.request, matching_resources)
                     prequery.request.show_hidden = item.show_hidden
 
-        if prequeries:
-            with metrics.time("prequeries"):
-                queries_results = await run_prequeries(
-                    kbid,
-                    prequeries,
-                    x_ndb_client=ndb_client,
-                    x_nucliadb_user=user,
-                    x_forwarded_for=origin,
-                    metrics=metrics.child_span("prequeries"),
-                )
+    async def _run_prequeries() -> list[PreQueryResult]:
+        with metrics.time("prequeries"):
+            return await run_prequeries(
+                kbid,
+                prequeries,
+                x_ndb_client=ndb_client,
+                x_nucliadb_user=user,
+                x_forwarded_for=origin,
+                metrics=metrics.child_span("prequeries"),
+            )
 
-        prequeries_results = (prefilter_queries_results or []) + (queries_results or [])
+    async def _run_main_query() -> tuple[KnowledgeboxFindResults, Fetcher, Reranker]:
+        with metrics.time("main_query"):
+            return await run_main_query(
+                kbid,
+                query,
+                item,
+                ndb_client,
+                user,
+                origin,
+                metrics=metrics.child_span("main_query"),
+            )
 
-    with metrics.time("main_query"):
-        main_results, fetcher, reranker = await run_main_query(
-            kbid,
-            query,
-            item,
-            ndb_client,
-            user,
-            origin,
-            metrics=metrics.child_span("main_query"),
+    # Once prefilters are applied, prequeries and the main query are
+    # independent, so we run them concurrently
+    if prequeries:
+        queries_results, (main_results, fetcher, reranker) = await asyncio.gather(
+            _run_prequeries(), _run_main_query()
         )
+    else:
+        main_results, fetcher, reranker = await _run_main_query()
+
+    if prequeries_strategy is not None:
+        prequeries_results = (prefilter_queries_results or []) + (queries_results or [])
+
     return main_results, prequeries_results, fetcher, reranker
 
 
@@ -244,6 +258,14 @@ async def run_main_query(
     return find_results, fetcher, reranker
 
 
+def get_main_query_reranker(item: AskRequest, query: str) -> Reranker:
+    """Build the reranker the main query will use, so it can be used before
+    the main query has finished.
+    """
+    find_request = find_request_from_ask_request(item, query)
+    return get_reranker(parse_reranker(find_request.reranker, find_request.top_k))
+
+
 async def get_relations_results(
     *,
     kbid: str,
@@ -27,6 +27,7 @@ from nucliadb.common.ids import ParagraphId
 from nucliadb.models.internal.augment import AugmentedParagraph, Paragraph, ParagraphText
 from nucliadb.search.augmentor import augment_paragraphs
 from nucliadb.search.augmentor.resources import augment_resources_deep
+from nucliadb.search.augmentor.utils import hydration_request_limiter
 from nucliadb.search.search.cut import cut_page
 from nucliadb.search.search.hydrator import (
     ResourceHydrationOptions,
@@ -37,6 +38,7 @@ from nucliadb.search.search.metrics import merge_observer
 from nucliadb.search.search.paragraphs import highlight_paragraph
 from nucliadb.search.search.query_parser.models import UnitRetrieval
 from nucliadb.search.search.rerankers import RerankableItem, Reranker, RerankingOptions
+from nucliadb.search.search.retrieval_session import get_retrieval_session
 from nucliadb_models.resource import Resource
 from nucliadb_models.retrieval import RerankerScore
 from nucliadb_models.search import (
@@ -47,6 +49,7 @@ from nucliadb_models.search import (
     MinScore,
 )
 from nucliadb_telemetry import metrics
+from nucliadb_utils.asyncio_utils import RequestLimiter
 
 FIND_FETCH_OPS_DISTRIBUTION = metrics.Histogram(
     "nucliadb_find_fetch_operations",
@@ -169,7 +172,7 @@ async def hydrate_and_rerank(
     metadata. It also returns an ordered list of best matches.
 
     """
-    max_operations = asyncio.Semaphore(50)
+    max_operations = hydration_request_limiter()
 
     # Iterate text blocks to create an "index" for faster access by id and get a
     # list of text block ids and resource ids to hydrate
@@ -200,19 +203,18 @@ async def hydrate_and_rerank(
 
     # hydrate only the strictly needed before rerank
     ops = [
-        augment_paragraphs(
+        _augment_paragraph_texts(
             kbid,
-            given=[
+            [
                 Paragraph.from_text_block_match(text_blocks_by_id[paragraph_id])
                 for paragraph_id in text_block_id_to_hydrate
             ],
-            select=[ParagraphText()],
             concurrency_control=max_operations,
         ),
-        augment_resources_deep(
+        _augment_resources_deep(
             kbid,
-            given=list(resources_to_hydrate),
-            opts=resource_hydration_options,
+            list(resources_to_hydrate),
+            resource_hydration_options,
             concurrency_control=max_operations,
         ),
     ]
@@ -281,10 +283,10 @@ async def hydrate_and_rerank(
     # Finally, fetch resource metadata if we haven't already done it
     if reranker.needs_extra_results:
         FIND_FETCH_OPS_DISTRIBUTION.observe(len(resources_to_hydrate))
-        augmented_resources = await augment_resources_deep(
+        augmented_resources = await _augment_resources_deep(
             kbid,
-            given=list(resources_to_hydrate),
-            opts=resource_hydration_options,
+            list(resources_to_hydrate),
+            resource_hydration_options,
             concurrency_control=max_operations,
         )
 
@@ -293,6 +295,39 @@ async def hydrate_and_rerank(
     return best_text_blocks, resources, best_matches
 
 
+async def _augment_paragraph_texts(
+    kbid: str,
+    paragraphs: list[Paragraph],
+    *,
+    concurrency_control: RequestLimiter,
+) -> dict[ParagraphId, AugmentedParagraph]:
+    session = get_retrieval_session()
+    if session is not None:
+        return await session.augment_paragraph_texts(
+            kbid, paragraphs, concurrency_control=concurrency_control
+        )
+    return await augment_paragraphs(
+        kbid, given=paragraphs, select=[ParagraphText()], concurrency_control=concurrency_control
+    )
+
+
+async def _augment_resources_deep(
+    kbid: str,
+    rids: list[str],
+    opts: ResourceHydrationOptions,
+    *,
+    concurrency_control: RequestLimiter,
+) -> dict[str, Resource]:
+    session = get_retrieval_session()
+    if session is not None:
+        return await session.augment_resources_deep(
+            kbid, rids, opts, concurrency_control=concurrency_control
+        )
+    return await augment_resources_deep(
+        kbid, given=rids, opts=opts, concurrency_control=concurrency_control
+    )
+
+
 def compose_find_resources(
     text_blocks: list[TextBlockMatch],
     resources: list[Resource],
@@ -313,7 +348,9 @@ def compose_find_resources(
 
         find_resource = find_resources[rid]
         field_id = text_block.paragraph_id.field_id.short_without_subfield()
-        find_field = find_resource.fields.setdefault(field_id, FindField(paragraphs={}))
+        find_field = find_resource.fields.get(field_id)
+        if find_field is None:
+            find_field = find_resource.fields[field_id] = FindField.model_construct(paragraphs={})
 
         paragraph_id = text_block.paragraph_id.full()
         find_paragraph = text_block_to_find_paragraph(text_block)
@@ -324,7 +361,8 @@ def compose_find_resources(
 
 
 def text_block_to_find_paragraph(text_block: TextBlockMatch) -> FindParagraph:
-    return FindParagraph(
+    # Text blocks are already validated models, skip pydantic validation
+    return FindParagraph.model_construct(
         id=text_block.paragraph_id.full(),
         text=text_block.text or "",
         score=text_block.score,
@@ -23,6 +23,7 @@ from collections.abc import Collection, Iterable
 from dataclasses import dataclass
 from typing import Any
 
+from async_lru import alru_cache
 from nidx_protos import nodereader_pb2
 from nuclia_models.predict.generative_responses import (
     JSONGenerativeResponse,
@@ -53,6 +54,7 @@ from nucliadb.search.search.rerankers import (
     Reranker,
     RerankingOptions,
 )
+from nucliadb.search.settings import settings
 from nucliadb.search.utilities import get_predict
 from nucliadb_models.common import FieldTypeName
 from nucliadb_models.internal.predict import (
@@ -329,8 +331,9 @@ async def get_graph_results(
     relations = Relations(entities={})
     explored_entities: set[FrozenRelationNode] = set()
     scores: dict[str, list[float]] = {}
-    predict = get_predict()
     entities_to_explore: list[RelationNode] = []
+    # scores of the triplets already ranked on previous hops
+    scored_triplets: dict[tuple[str, str, str], float] = {}
 
     for hop in range(graph_strategy.hops):
         if hop == 0:
@@ -361,7 +364,7 @@ async def get_graph_results(
                         # subtype just in this case.
                         entities_to_explore = [
                             RelationNode(ntype=r.ntype, value=r.value, subtype="")
-                            for r in await predict.detect_entities(kbid, query)
+                            for r in await detect_query_entities(kbid, query)
                         ]
                     except Exception as e:
                         capture_exception(e)
@@ -430,6 +433,7 @@ async def get_graph_results(
                         kbid,
                         user,
                         top_k=graph_strategy.top_k,
+                        scored_triplets=scored_triplets,
                     )
                 elif graph_strategy.relation_ranking == RelationRanking.GENERATIVE:
                     relations, scores = await rank_relations_generative(
@@ -439,6 +443,7 @@ async def get_graph_results(
                         user,
                         top_k=graph_strategy.top_k,
                         generative_model=generative_model,
+                        scored_triplets=scored_triplets,
                     )
             except Exception as e:
                 capture_exception(e)
@@ -465,12 +470,29 @@ async def get_graph_results(
     return find_results, find_request
 
 
+@alru_cache(maxsize=settings.query_entities_cache_size, ttl=settings.query_entities_cache_ttl)
+async def detect_query_entities(kbid: str, query: str) -> list[RelationNode]:
+    """Detect entities in a query with predict. Results are cached for a
+    while, as the same query is usually asked more than once in a row."""
+    predict = get_predict()
+    return await predict.detect_entities(kbid, query)
+
+
 async def fuzzy_search_entities(
     kbid: str,
     query: str,
 ) -> RelatedEntities | None:
     """Fuzzy find entities in KB given a query using the same methodology as /suggest, but split by words."""
+    try:
+        return await _fuzzy_search_entities(kbid, query)
+    except Exception as exc:
+        capture_exception(exc)
+        logger.exception("Error in finding entities in query for graph strategy")
+        return None
 
+
+@alru_cache(maxsize=settings.query_entities_cache_size, ttl=settings.query_entities_cache_ttl)
+async def _fuzzy_search_entities(kbid: str, query: str) -> RelatedEntities:
     # Build an OR for each word in the query matching with fuzzy any word in any
     # node in any position. I.e., for the query "Rose Hamiltn", it'll match
     # "Rosa Parks" and "Margaret Hamilton"
@@ -486,12 +508,7 @@ async def fuzzy_search_entities(
         subquery.path.undirected = True
         request.query.path.bool_or.operands.append(subquery)
 
-    try:
-        response = await nidx_query(kbid, Method.GRAPH, request)
-    except Exception as exc:
-        capture_exception(exc)
-        logger.exception("Error in finding entities in query for graph strategy")
-        return None
+    response = await nidx_query(kbid, Method.GRAPH, request)
 
     # merge shard results while deduplicating repeated entities across shards
     unique_entities: set[RelatedEntity] = set()
@@ -507,7 +524,13 @@ async def rank_relations_reranker(
     user: str,
     top_k: int,
     score_threshold: float = 0.02,
+    scored_triplets: dict[tuple[str, str, str], float] | None = None,
 ) -> tuple[Relations, dict[str, list[float]]]:
+    """
+    Score relations with the reranker and keep the `top_k`. `scored_triplets`
+    can be used to keep scores across calls, so triplets already scored are
+    not sent again.
+    """
     # Store the index for keeping track after scoring
     flat_rels: list[tuple[str, DirectionalRelation]] = [
         (ent, rel) for (ent, rels) in relations.entities.items() for rel in rels.related_to
@@ -539,22 +562,34 @@ async def rank_relations_reranker(
             unique_triplets.append(t)
         triplet_to_orig_indices[key].append(i)
 
-    # Build the reranker model input
-    predict = get_predict()
-    rerank_model = RerankModel(
-        question=query,
-        user_id=user,
-        context={
-            str(idx): f"{t['head_entity']} {t['relationship']} {t['tail_entity']}"
-            for idx, t in enumerate(unique_triplets)
-        },
-    )
-    # Get the rerank scores
-    res = await predict.rerank(kbid, rerank_model)
-
-    # Convert returned scores to a list of (int_idx, score)
-    # where int_idx corresponds to indices in unique_triplets
-    reranked_indices_scores = [(int(idx), score) for idx, score in res.context_scores.items()]
+    # Only triplets not scored in previous hops are sent to the reranker
+    if scored_triplets is None:
+        scored_triplets = {}
+    to_score = [t for t in unique_triplets if _triplet_key(t) not in scored_triplets]
+
+    if to_score:
+        # Build the reranker model input
+        predict = get_predict()
+        rerank_model = RerankModel(
+            question=query,
+            user_id=user,
+            context={
+                str(idx): f"{t['head_entity']} {t['relationship']} {t['tail_entity']}"
+                for idx, t in enumerate(to_score)
+            },
+        )
+        # Get the rerank scores
+        res = await predict.rerank(kbid, rerank_model)
+        for idx, score in res.context_scores.items():
+            scored_triplets[_triplet_key(to_score[int(idx)])] = score
+
+    # Convert scores to a list of (int_idx, score) where int_idx corresponds
+    # to indices in unique_triplets
+    reranked_indices_scores = [
+        (idx, scored_triplets[key])
+        for idx, t in enumerate(unique_triplets)
+        if (key := _triplet_key(t)) in scored_triplets
+    ]
 
     return _scores_to_ranked_rels(
         unique_triplets,
@@ -575,7 +610,13 @@ async def rank_relations_generative(
     generative_model: str | None = None,
     score_threshold: float = 2,
     max_rels_to_eval: int = 100,
+    scored_triplets: dict[tuple[str, str, str], float] | None = None,
 ) -> tuple[Relations, dict[str, list[float]]]:
+    """
+    Score relations with a generative model and keep the `top_k`.
+    `scored_triplets` can be used to keep scores across calls, so triplets
+    already scored are not sent again.
+    """
     # Store the index for keeping track after scoring
     flat_rels: list[tuple[str, DirectionalRelation]] = [
         (ent, rel) for (ent, rels) in relations.entities.items() for rel in rels.related_to
@@ -608,11 +649,42 @@ async def rank_relations_generative(
 
     if len(flat_rels) > max_rels_to_eval:
         logger.warning(f"Too many relations to evaluate ({len(flat_rels)}), using reranker to reduce")
+        # reranker scores are in a different scale, so they are not memoized
+        # along with the generative ones
         return await rank_relations_reranker(relations, query, kbid, user, top_k=max_rels_to_eval)
 
+    if scored_triplets is None:
+        scored_triplets = {}
+    to_score = [t for t in unique_triplets if _triplet_key(t) not in scored_triplets]
+    if to_score:
+        scores = await _score_triplets_generative(to_score, query, kbid, user, generative_model)
+        for t, score in zip(to_score, scores):
+            scored_triplets[_triplet_key(t)] = score
+
+    unique_indices_scores = (
+        (idx, scored_triplets[_triplet_key(t)]) for (idx, t) in enumerate(unique_triplets)
+    )
+
+    return _scores_to_ranked_rels(
+        unique_triplets,
+        unique_indices_scores,
+        triplet_to_orig_indices,
+        flat_rels,
+        top_k,
+        score_threshold,
+    )
+
+
+async def _score_triplets_generative(
+    triplets: list[dict[str, str]],
+    query: str,
+    kbid: str,
+    user: str,
+    generative_model: str | None = None,
+) -> list[float]:
     data = {
         "question": query,
-        "triplets": unique_triplets,
+        "triplets": triplets,
     }
     prompt = PROMPT + json.dumps(data, indent=4)
 
@@ -648,21 +720,16 @@ async def rank_relations_generative(
     if response_json is None or status is None or status.code != "0":
         raise ValueError("No JSON response found")
 
-    scored_unique_triplets: list[dict[str, str | Any]] = response_json.object["triplets"]
+    scored_triplets: list[dict[str, str | Any]] = response_json.object["triplets"]
 
-    if len(scored_unique_triplets) != len(unique_triplets):
+    if len(scored_triplets) != len(triplets):
         raise ValueError("Mismatch between input and output triplets")
 
-    unique_indices_scores = ((idx, float(t["score"])) for (idx, t) in enumerate(scored_unique_triplets))
+    return [float(t["score"]) for t in scored_triplets]
 
-    return _scores_to_ranked_rels(
-        unique_triplets,
-        unique_indices_scores,
-        triplet_to_orig_indices,
-        flat_rels,
-        top_k,
-        score_threshold,
-    )
+
+def _triplet_key(triplet: dict[str, str]) -> tuple[str, str, str]:
+    return (triplet["head_entity"], triplet["relationship"], triplet["tail_entity"])
 
 
 def _scores_to_ranked_rels(
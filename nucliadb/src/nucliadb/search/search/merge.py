@@ -20,6 +20,7 @@
 import asyncio
 import datetime
 from collections.abc import Iterable
+from functools import lru_cache
 from typing import Any
 
 from nidx_protos.nodereader_pb2 import (
@@ -45,6 +46,7 @@ from nucliadb.models.internal.augment import Paragraph as AugmentorParagraph
 from nucliadb.search import logger
 from nucliadb.search.augmentor.augmentor import augment_paragraphs
 from nucliadb.search.augmentor.resources import augment_resources_deep
+from nucliadb.search.augmentor.utils import hydration_request_limiter
 from nucliadb.search.search.cut import cut_page
 from nucliadb.search.search.fetch import get_labels_resource
 from nucliadb.search.search.hydrator import ResourceHydrationOptions
@@ -74,6 +76,7 @@ from nucliadb_models.search import (
     TextPosition,
 )
 from nucliadb_protos.utils_pb2 import RelationNode
+from nucliadb_utils.asyncio_utils import RequestLimiter
 
 from .metrics import merge_observer
 
@@ -83,6 +86,15 @@ TitleScore = str
 SortValue = Bm25Score | TimestampScore | TitleScore
 
 
+@lru_cache(maxsize=10_000)
+def alias_label(label: str) -> str:
+    """
+    Cached `translate_system_to_alias_label`. Facets of every search contain
+    the same labels, so this ends up being a table of the translated labels.
+    """
+    return translate_system_to_alias_label(label)
+
+
 def entity_type_to_relation_node_type(node_type: EntityType) -> RelationNode.NodeType.ValueType:
     return RelationNodeTypeMap[node_type]
 
@@ -106,9 +118,9 @@ async def merge_documents_results(
     facets: dict[str, Any] = {}
     if response.facets:
         for key, value in response.facets.items():
-            key = translate_system_to_alias_label(key)
+            key = alias_label(key)
             for facetresult in value.facetresults:
-                facet_label = translate_system_to_alias_label(facetresult.tag)
+                facet_label = alias_label(facetresult.tag)
                 facets.setdefault(key, {}).setdefault(facet_label, 0)
                 facets[key][facet_label] += facetresult.total
 
@@ -181,7 +193,7 @@ async def merge_suggest_paragraph_results(
     augmented_paragraphs: dict[ParagraphId, AugmentedParagraph] = await augment_paragraphs(
         kbid,
         given=[
-            AugmentorParagraph(
+            AugmentorParagraph.model_construct(
                 id=ParagraphId.from_string(match.paragraph),
                 metadata=Metadata.from_paragraph_result(match),
             )
@@ -206,14 +218,15 @@ async def merge_suggest_paragraph_results(
         # /l), we trim the prefix
         labels = list(set((label.removeprefix("/l/") for label in match.labels)))
 
-        suggested_paragraph = Paragraph(
+        # Results come from our index, skip pydantic validation
+        suggested_paragraph = Paragraph.model_construct(
             score=match.score.bm25,
             rid=match.uuid,
             field_type=paragraph_id.field_id.type,
             field=paragraph_id.field_id.key,
             text=text,
             labels=labels,
-            position=TextPosition(
+            position=TextPosition.model_construct(
                 index=match.metadata.position.index,
                 start=match.metadata.position.start,
                 end=match.metadata.position.end,
@@ -231,7 +244,7 @@ async def merge_vectors_results(
     vector_response: VectorSearchResponse,
     kbid: str,
     top_k: int,
-    concurrency_control: asyncio.Semaphore | None = None,
+    concurrency_control: RequestLimiter | None = None,
     min_score: float | None = None,
 ) -> tuple[Sentences, set[str]]:
     augments = []
@@ -257,18 +270,21 @@ async def merge_vectors_results(
             paragraph_end=result.metadata.position.end,
         )
         augments.append(
-            AugmentorParagraph(id=paragraph_id, metadata=Metadata.from_vector_result(result))
+            AugmentorParagraph.model_construct(
+                id=paragraph_id, metadata=Metadata.from_vector_result(result)
+            )
         )
 
+        # Results come from our index, skip pydantic validation
         result_sentence_list.append(
-            Sentence(
+            Sentence.model_construct(
                 score=result.score,
                 rid=paragraph_id.rid,
                 field_type=paragraph_id.field_id.type,
                 field=paragraph_id.field_id.key,
                 text="",  # we batch augments and populate it afterwards
                 index=str(vector_id.index),
-                position=TextPosition(
+                position=TextPosition.model_construct(
                     start=paragraph_id.paragraph_start,
                     end=paragraph_id.paragraph_end,
                     index=vector_id.index,
@@ -307,7 +323,7 @@ async def merge_paragraph_results(
     sort: SortOptions,
     min_score: float,
     offset: int,
-    concurrency_control: asyncio.Semaphore | None = None,
+    concurrency_control: RequestLimiter | None = None,
 ) -> tuple[Paragraphs, set[str]]:
     query = paragraph_response.query
     ematches: list[str] = paragraph_response.ematches  # type: ignore
@@ -317,9 +333,9 @@ async def merge_paragraph_results(
     facets: dict[str, Any] = {}
     if paragraph_response.facets:
         for key, value in paragraph_response.facets.items():
-            key = translate_system_to_alias_label(key)
+            key = alias_label(key)
             for facetresult in value.facetresults:
-                facet_label = translate_system_to_alias_label(facetresult.tag)
+                facet_label = alias_label(facetresult.tag)
                 facets.setdefault(key, {}).setdefault(facet_label, 0)
                 facets[key][facet_label] += facetresult.total
 
@@ -351,7 +367,9 @@ async def merge_paragraph_results(
     augmented_paragraphs: dict[ParagraphId, AugmentedParagraph] = await augment_paragraphs(
         kbid,
         given=[
-            AugmentorParagraph(id=paragraph_id, metadata=Metadata.from_paragraph_result(result))
+            AugmentorParagraph.model_construct(
+                id=paragraph_id, metadata=Metadata.from_paragraph_result(result)
+            )
             for paragraph_id, result, _ in raw_paragraph_list
         ],
         select=[ParagraphText()],
@@ -376,15 +394,16 @@ async def merge_paragraph_results(
         labels = list(set((label.removeprefix("/l/") for label in result.labels)))
 
         result_resource_ids.add(paragraph_id.rid)
+        # Results come from our index, skip pydantic validation
         result_paragraph_list.append(
-            Paragraph(
+            Paragraph.model_construct(
                 score=result.score.bm25,
                 rid=paragraph_id.rid,
                 field_type=paragraph_id.field_id.type,
                 field=paragraph_id.field_id.key,
                 text=text,
                 labels=labels,
-                position=TextPosition(
+                position=TextPosition.model_construct(
                     index=result.metadata.position.index,
                     start=result.metadata.position.start,
                     end=result.metadata.position.end,
@@ -484,7 +503,7 @@ async def merge_results(
     *,
     resource_hydration_options: ResourceHydrationOptions,
 ) -> KnowledgeboxSearchResults:
-    concurrency_control = asyncio.Semaphore(50)
+    concurrency_control = hydration_request_limiter()
 
     api_results = KnowledgeboxSearchResults()
     resources = set()
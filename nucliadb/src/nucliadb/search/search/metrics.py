@@ -21,13 +21,16 @@ import contextlib
 import time
 from typing import Any
 
-from nucliadb_telemetry import metrics
+from nucliadb_telemetry import metrics, timings
 
 merge_observer = metrics.Observer("merge_results", labels={"type": ""})
 node_features = metrics.Counter("nucliadb_node_features", labels={"type": ""})
 query_parse_dependency_observer = metrics.Observer("query_parse_dependency", labels={"type": ""})
 query_parser_observer = metrics.Observer("nucliadb_query_parser", labels={"type": ""})
 search_observer = metrics.Observer("nucliadb_search", labels={"type": ""})
+speculative_retrieval_counter = metrics.Counter(
+    "nucliadb_ask_speculative_retrieval", labels={"result": ""}
+)
 searched_shards_histogram = metrics.Histogram(
     "nucliadb_searched_shards", labels={"type": ""}, buckets=[1, 2, 3, 4, 5, 8, 10, 12, 15, 18, 20, 25]
 )
@@ -85,6 +88,7 @@ class Metrics:
             elapsed = time.monotonic() - start_time
             self._metrics[step] = elapsed
             rag_histogram.observe(elapsed, labels={"step": step})
+            timings.record_duration(f"{self.id}.{step}", elapsed)
 
     def child_span(self, id: str) -> "Metrics":
         child_span = Metrics(id)
@@ -93,6 +97,7 @@ class Metrics:
 
     def set(self, key: str, value: int | float):
         self._metrics[key] = value
+        timings.set_value(f"{self.id}.{key}", value)
 
     def get(self, key: str) -> int | float | None:
         return self._metrics.get(key)
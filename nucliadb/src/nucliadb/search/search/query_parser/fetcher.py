@@ -30,6 +30,7 @@ from nucliadb.search import logger
 from nucliadb.search.predict import SendToPredictError, convert_relations
 from nucliadb.search.predict_models import QueryModel
 from nucliadb.search.search.metrics import query_parse_dependency_observer
+from nucliadb.search.search.retrieval_session import get_retrieval_session
 from nucliadb.search.utilities import get_predict
 from nucliadb_models.internal.predict import QueryInfo
 from nucliadb_models.search import Image, MaxTokens
@@ -386,6 +387,10 @@ async def query_information(
         graph_nodes=None,
         graph_edges=None,
     )
+    session = get_retrieval_session()
+    if session is not None:
+        # queries repeated in the same request only go to predict once
+        return await session.query_information(kbid, item)
     return await predict.query(kbid, item)
 
 
@@ -0,0 +1,175 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from contextvars import ContextVar
+from typing import TypeVar
+
+from nucliadb.common.ids import ParagraphId
+from nucliadb.models.internal.augment import AugmentedParagraph, Paragraph, ParagraphText
+from nucliadb.search.augmentor import augment_paragraphs
+from nucliadb.search.augmentor.resources import augment_resources_deep
+from nucliadb.search.predict_models import QueryModel
+from nucliadb.search.search.hydrator import ResourceHydrationOptions
+from nucliadb.search.utilities import get_predict
+from nucliadb_models.internal.predict import QueryInfo
+from nucliadb_models.resource import Resource
+from nucliadb_utils.asyncio_utils import RequestLimiter
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class RetrievalSession:
+    """Work shared between all the retrievals done while serving a single
+    request, e.g., the main query and prequeries of an /ask.
+
+    Predict query calls are done once per distinct query, and paragraphs and
+    resources matched by more than one retrieval are hydrated only once. When
+    retrievals run concurrently, they wait for the ones in-flight instead of
+    doing the same work again.
+
+    """
+
+    def __init__(self) -> None:
+        self.query_infos: dict[tuple[str, str], asyncio.Future[QueryInfo | None]] = {}
+        self.paragraphs: dict[tuple[str, ParagraphId], asyncio.Future[AugmentedParagraph | None]] = {}
+        self.resources: dict[tuple[str, str, str], asyncio.Future[Resource | None]] = {}
+
+    async def query_information(self, kbid: str, item: QueryModel) -> QueryInfo:
+        async def fetch(keys: list[tuple[str, str]]) -> dict[tuple[str, str], QueryInfo]:
+            predict = get_predict()
+            return {keys[0]: await predict.query(kbid, item)}
+
+        key = (kbid, item.model_dump_json())
+        found = await _get_many(self.query_infos, [key], fetch)
+        return found[key]
+
+    async def augment_paragraph_texts(
+        self,
+        kbid: str,
+        paragraphs: list[Paragraph],
+        *,
+        concurrency_control: RequestLimiter | None = None,
+    ) -> dict[ParagraphId, AugmentedParagraph]:
+        by_key = {(kbid, paragraph.id): paragraph for paragraph in paragraphs}
+
+        async def fetch(
+            keys: list[tuple[str, ParagraphId]],
+        ) -> dict[tuple[str, ParagraphId], AugmentedParagraph]:
+            augmented = await augment_paragraphs(
+                kbid,
+                given=[by_key[key] for key in keys],
+                select=[ParagraphText()],
+                concurrency_control=concurrency_control,
+            )
+            return {(kbid, paragraph_id): paragraph for paragraph_id, paragraph in augmented.items()}
+
+        found = await _get_many(self.paragraphs, by_key.keys(), fetch)
+        return {paragraph_id: paragraph for (_, paragraph_id), paragraph in found.items()}
+
+    async def augment_resources_deep(
+        self,
+        kbid: str,
+        given: list[str],
+        opts: ResourceHydrationOptions,
+        *,
+        concurrency_control: RequestLimiter | None = None,
+    ) -> dict[str, Resource]:
+        # options are part of the key, as resources are serialized differently
+        # depending on them
+        opts_key = opts.model_dump_json()
+
+        async def fetch(keys: list[tuple[str, str, str]]) -> dict[tuple[str, str, str], Resource]:
+            augmented = await augment_resources_deep(
+                kbid,
+                given=[rid for (_, _, rid) in keys],
+                opts=opts,
+                concurrency_control=concurrency_control,
+            )
+            return {(kbid, opts_key, rid): resource for rid, resource in augmented.items()}
+
+        found = await _get_many(self.resources, [(kbid, opts_key, rid) for rid in given], fetch)
+        return {rid: resource for (_, _, rid), resource in found.items()}
+
+
+async def _get_many(
+    store: dict[K, asyncio.Future[V | None]],
+    keys: Iterable[K],
+    fetch: Callable[[list[K]], Awaitable[dict[K, V]]],
+) -> dict[K, V]:
+    """Get `keys` from `store`, fetching the missing ones in a single call.
+    Keys not returned by `fetch` are stored as None and not returned.
+
+    """
+    loop = asyncio.get_running_loop()
+    keys = list(dict.fromkeys(keys))
+    missing = []
+    for key in keys:
+        if key not in store:
+            store[key] = loop.create_future()
+            missing.append(key)
+
+    if missing:
+        try:
+            fetched = await fetch(missing)
+        except BaseException as exc:
+            # let anyone waiting know and allow to fetch them again
+            for key in missing:
+                future = store.pop(key)
+                if isinstance(exc, Exception):
+                    future.set_exception(exc)
+                    # mark as retrieved, so it's not logged if nobody else was waiting
+                    future.exception()
+                else:
+                    future.cancel()
+            raise
+        for key in missing:
+            store[key].set_result(fetched.get(key))
+
+    found = {}
+    for key in keys:
+        value = await store[key]
+        if value is not None:
+            found[key] = value
+    return found
+
+
+_session: ContextVar[RetrievalSession | None] = ContextVar("retrieval_session", default=None)
+
+
+def get_retrieval_session() -> RetrievalSession | None:
+    return _session.get()
+
+
+@contextlib.contextmanager
+def retrieval_session():
+    """Share work between all retrievals done inside this context manager.
+
+    As with request caches, the session is bound to the current asyncio task
+    and the subtasks created inside the context manager.
+
+    """
+    token = _session.set(RetrievalSession())
+    try:
+        yield
+    finally:
+        _session.reset(token)
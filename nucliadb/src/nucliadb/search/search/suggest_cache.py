@@ -0,0 +1,270 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from cachetools import LRUCache, TTLCache
+
+from nucliadb.search.search.query_parser.parsers.suggest import MAX_SUGGEST_RESULTS
+from nucliadb.search.settings import settings
+from nucliadb_models.filters import FilterExpression
+from nucliadb_models.search import KnowledgeboxSuggestResults, RelatedEntities, RelatedEntity
+from nucliadb_models.suggest import SuggestOptions
+from nucliadb_protos import writer_pb2
+from nucliadb_telemetry import metrics
+from nucliadb_utils import const
+from nucliadb_utils.utilities import get_pubsub
+
+logger = logging.getLogger(__name__)
+
+suggest_cache_ops = metrics.Counter("nucliadb_search_suggest_cache_ops", labels={"type": "", "op": ""})
+
+# nidx ignores entity prefixes shorter than this
+MIN_ENTITY_PREFIX_LENGTH = 2
+# Fuzzy distance nidx uses to match entity prefixes
+ENTITY_FUZZY_DISTANCE = 1
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
+
+def filters_key(
+    *,
+    filter_expression: FilterExpression | None,
+    fields: list[str],
+    label_filters: list[str],
+    range_creation_start: datetime | None,
+    range_creation_end: datetime | None,
+    range_modification_start: datetime | None,
+    range_modification_end: datetime | None,
+    show_hidden: bool,
+    security_groups: list[str] | None,
+) -> str:
+    """
+    Key identifying everything but the query that restricts the results of a
+    suggest request
+    """
+    return json.dumps(
+        [
+            filter_expression.model_dump_json() if filter_expression else None,
+            sorted(fields),
+            sorted(label_filters),
+            range_creation_start.isoformat() if range_creation_start else None,
+            range_creation_end.isoformat() if range_creation_end else None,
+            range_modification_start.isoformat() if range_modification_start else None,
+            range_modification_end.isoformat() if range_modification_end else None,
+            show_hidden,
+            sorted(security_groups) if security_groups is not None else None,
+        ]
+    )
+
+
+@dataclass
+class EntitiesSuperset:
+    # normalized entity prefix that was queried
+    prefix: str
+    entities: list[RelatedEntity]
+
+
+class KBSuggestCache:
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self.results: TTLCache[tuple, KnowledgeboxSuggestResults] = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Entity results of single word queries, by filters key and normalized prefix
+        self.entities: TTLCache[tuple[str, str], EntitiesSuperset] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+
+class SuggestCache:
+    """
+    Short lived cache of suggest results. Autocompletion sends a request per
+    keystroke, and most of them are repeated by other users or while typing.
+
+    Besides the exact results of a request, entity suggestions of single word
+    queries are kept, as the entities of a longer word are a subset of them.
+    When nidx returned all the entities of a prefix (less than the limit), the
+    entities of any word starting with it are computed from them, matching the
+    way nidx does it.
+
+    Entries expire after `suggest_cache_ttl` seconds and every commit in a KB
+    drops its entries. As indexing is asynchronous, new data may take up to the
+    TTL to be suggested.
+    """
+
+    def __init__(self, ttl: float, maxsize: int, max_kbs: int) -> None:
+        self.enabled = ttl > 0
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._kbs: LRUCache[str, KBSuggestCache] = LRUCache(maxsize=max_kbs)
+
+    def _kb(self, kbid: str) -> KBSuggestCache:
+        kb = self._kbs.get(kbid)
+        if kb is None:
+            kb = self._kbs[kbid] = KBSuggestCache(self.ttl, self.maxsize)
+        return kb
+
+    def get_results(self, kbid: str, key: tuple) -> KnowledgeboxSuggestResults | None:
+        kb = self._kbs.get(kbid)
+        results = kb.results.get(key) if kb is not None else None
+        suggest_cache_ops.inc({"type": "results", "op": "hit" if results is not None else "miss"})
+        return results
+
+    def set_results(self, kbid: str, key: tuple, results: KnowledgeboxSuggestResults) -> None:
+        if self.enabled:
+            self._kb(kbid).results[key] = results
+
+    def get_entities(self, kbid: str, filters: str, query: str) -> RelatedEntities | None:
+        """
+        Entities nidx would suggest for `query`, computed from the cached entities
+        of one of its prefixes
+        """
+        word = normalize_entity(query)
+        kb = self._kbs.get(kbid)
+        if kb is None or word is None or " " in word or len(word) < MIN_ENTITY_PREFIX_LENGTH:
+            return None
+
+        # Look for the longest cached prefix, the user is usually typing the word
+        for end in range(len(word), MIN_ENTITY_PREFIX_LENGTH - 1, -1):
+            superset = kb.entities.get((filters, word[:end]))
+            if superset is not None:
+                break
+        else:
+            suggest_cache_ops.inc({"type": "entities", "op": "miss"})
+            return None
+
+        suggest_cache_ops.inc({"type": "entities", "op": "hit"})
+        entities = [
+            entity
+            for entity in superset.entities
+            if superset.prefix == word
+            or fuzzy_prefix_match(normalize_entity(entity.value) or "", word, ENTITY_FUZZY_DISTANCE)
+        ]
+        return RelatedEntities(entities=entities, total=len(entities))
+
+    def set_entities(
+        self, kbid: str, filters: str, query: str, entities: RelatedEntities, found: int
+    ) -> None:
+        """
+        Store the entities nidx suggested for `query`. `found` is the number of
+        entity results before deduplicating them.
+        """
+        if not self.enabled or found >= MAX_SUGGEST_RESULTS:
+            # nidx may have left entities out, this is not a superset
+            return
+        word = normalize_entity(query)
+        if word is None or " " in word or len(word) < MIN_ENTITY_PREFIX_LENGTH:
+            return
+        if any(normalize_entity(entity.value) is None for entity in entities.entities):
+            # We can't filter entities the same way nidx does
+            return
+        superset = EntitiesSuperset(prefix=word, entities=list(entities.entities))
+        self._kb(kbid).entities[(filters, word)] = superset
+
+    def invalidate(self, kbid: str) -> None:
+        self._kbs.pop(kbid, None)
+
+    def clear(self) -> None:
+        self._kbs.clear()
+
+
+def normalize_entity(value: str) -> str | None:
+    """
+    Normalize an entity value or query like nidx does. nidx transliterates non
+    ASCII characters, we don't know how to do that, so None is returned for them.
+    """
+    if not value.isascii():
+        return None
+    return " ".join(value.split()).lower()
+
+
+def fuzzy_prefix_match(value: str, prefix: str, distance: int) -> bool:
+    """
+    Whether some prefix of `value` is at most at `distance` edits of `prefix`,
+    counting transpositions as a single edit
+    """
+    # Optimal string alignment distances between prefix[:i] and value[:j]
+    previous: list[int] = []
+    current = list(range(len(value) + 1))
+    for i in range(1, len(prefix) + 1):
+        before_previous, previous = previous, current
+        current = [i] + [0] * len(value)
+        for j in range(1, len(value) + 1):
+            cost = 0 if prefix[i - 1] == value[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and prefix[i - 1] == value[j - 2] and prefix[i - 2] == value[j - 1]:
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+        if min(current) > distance:
+            return False
+    return min(current) <= distance
+
+
+def results_key(
+    filters: str, query: str, features: list[SuggestOptions], highlight: bool, debug: bool
+) -> tuple:
+    return (filters, query, tuple(sorted(features)), highlight, debug)
+
+
+_cache = SuggestCache(
+    ttl=settings.suggest_cache_ttl,
+    maxsize=settings.suggest_cache_size,
+    max_kbs=settings.suggest_cache_max_kbs,
+)
+_subscription_id: str | None = None
+
+
+def get_suggest_cache() -> SuggestCache:
+    return _cache
+
+
+async def start_suggest_cache_invalidation() -> None:
+    global _subscription_id
+
+    pubsub = await get_pubsub()
+    if pubsub is None or not _cache.enabled:
+        return
+
+    async def handle_message(msg: Any) -> None:
+        notification = writer_pb2.Notification()
+        notification.ParseFromString(pubsub.parse(msg))
+        if notification.action == writer_pb2.Notification.Action.COMMIT:
+            _cache.invalidate(notification.kbid)
+
+    _subscription_id = str(uuid.uuid4())
+    # No group: every search node keeps its own cache
+    await pubsub.subscribe(
+        handler=handle_message,
+        key=const.PubSubChannels.RESOURCE_NOTIFY.format(kbid="*"),
+        subscription_id=_subscription_id,
+    )
+
+
+async def stop_suggest_cache_invalidation() -> None:
+    global _subscription_id
+
+    _cache.clear()
+    if _subscription_id is None:
+        return
+    pubsub = await get_pubsub()
+    if pubsub is not None:
+        await pubsub.unsubscribe(key=_subscription_id)
+    _subscription_id = None
@@ -18,14 +18,20 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 import asyncio
+import hashlib
+import json
 from uuid import UUID
 
+from cachetools import TTLCache
+
 from nucliadb.common import datamanagers
 from nucliadb.common.maindb.utils import get_driver
 from nucliadb.ingest.fields.base import Field
 from nucliadb.ingest.orm.knowledgebox import KnowledgeBox
 from nucliadb.ingest.orm.resource import Resource
 from nucliadb.search import logger
+from nucliadb.search.search import cache
+from nucliadb.search.settings import settings
 from nucliadb.search.utilities import get_predict
 from nucliadb_models.search import (
     SummarizedResponse,
@@ -34,11 +40,20 @@ from nucliadb_models.search import (
     SummarizeResourceModel,
 )
 from nucliadb_protos.utils_pb2 import ExtractedText
+from nucliadb_telemetry import metrics
 from nucliadb_utils.utilities import get_storage
 
 ExtractedTexts = list[tuple[str, str, ExtractedText | None]]
 
 MAX_GET_EXTRACTED_TEXT_OPS = 20
+MAX_GET_RESOURCE_OPS = 10
+
+summaries_cache_ops = metrics.Counter("nucliadb_summaries_cache_ops", labels={"op": ""})
+
+# Summaries by hash of the KB, options and extracted text of every summarized field
+_summaries: TTLCache[str, SummarizedResponse] = TTLCache(
+    maxsize=settings.summarize_cache_size, ttl=settings.summarize_cache_ttl
+)
 
 
 class NoResourcesToSummarize(Exception):
@@ -63,61 +78,94 @@ async def summarize(
     if len(predict_request.resources) == 0:
         raise NoResourcesToSummarize()
 
+    key = summary_key(kbid, predict_request)
+    cached = _summaries.get(key)
+    if cached is not None:
+        summaries_cache_ops.inc({"op": "hit"})
+        # Nothing was consumed to get this summary
+        return cached.model_copy(update={"consumption": None})
+    summaries_cache_ops.inc({"op": "miss"})
+
     predict = get_predict()
-    return await predict.summarize(kbid=kbid, item=predict_request, extra_headers=extra_predict_headers)
+    response = await predict.summarize(
+        kbid=kbid, item=predict_request, extra_headers=extra_predict_headers
+    )
+    if settings.summarize_cache_ttl > 0:
+        _summaries[key] = response
+    return response
+
+
+def summary_key(kbid: str, request: SummarizeModel) -> str:
+    """
+    Identify a summarize request by its options and the hash of the extracted
+    text of each field, so unchanged resources get the same summary.
+    """
+    fields = sorted(
+        (uuid_or_slug, field_id, hashlib.sha256(text.encode()).hexdigest())
+        for uuid_or_slug, resource in request.resources.items()
+        for field_id, text in resource.fields.items()
+    )
+    options = [kbid, request.generative_model, request.user_prompt, request.summary_kind.value]
+    return hashlib.sha256(json.dumps([options, fields]).encode()).hexdigest()
 
 
 async def get_extracted_texts(kbid: str, resource_uuids_or_slugs: list[str]) -> ExtractedTexts:
     results: ExtractedTexts = []
 
-    driver = get_driver()
-    storage = await get_storage()
+    if not await datamanagers.atomic.kb.exists(kbid=kbid):
+        raise datamanagers.exceptions.KnowledgeBoxNotFound(kbid)
 
+    max_resources = asyncio.Semaphore(MAX_GET_RESOURCE_OPS)
     max_tasks = asyncio.Semaphore(MAX_GET_EXTRACTED_TEXT_OPS)
-    tasks = []
+    tasks: list[asyncio.Task] = []
+
+    # Resolve the resources concurrently and, as soon as its fields are known,
+    # schedule getting the extracted text of each of them
+    async def schedule_resource(uuid_or_slug: str) -> None:
+        for field in await get_resource_fields(kbid, uuid_or_slug, max_resources):
+            tasks.append(asyncio.create_task(get_extracted_text(uuid_or_slug, field, max_tasks)))
+
+    # The extracted texts of fields are shared with the request caches, as
+    # searches do
+    with cache.request_caches():
+        schedulers = [
+            asyncio.create_task(schedule_resource(rid)) for rid in set(resource_uuids_or_slugs)
+        ]
+        try:
+            await asyncio.gather(*schedulers)
+            # All resources are resolved, no more tasks will be scheduled
+            results.extend(await asyncio.gather(*tasks))
+        except BaseException:
+            # As a TaskGroup would, cancel everything and wait for it, so no
+            # task outlives the request. Cancelled schedulers can't append tasks
+            for task in schedulers + tasks:
+                task.cancel()
+            await asyncio.gather(*schedulers, *tasks, return_exceptions=True)
+            raise
 
-    # Schedule getting extracted text for each field of each resource
-    async with driver.ro_transaction() as txn:
-        if not await datamanagers.kb.exists(txn, kbid=kbid):
-            raise datamanagers.exceptions.KnowledgeBoxNotFound(kbid)
+    return results
 
+
+async def get_resource_fields(
+    kbid: str, uuid_or_slug: str, max_operations: asyncio.Semaphore
+) -> list[Field]:
+    storage = await get_storage()
+    async with max_operations, get_driver().ro_transaction() as txn:
         kb_orm = KnowledgeBox(txn, storage, kbid)
-        for uuid_or_slug in set(resource_uuids_or_slugs):
-            uuid = await get_resource_uuid(kb_orm, uuid_or_slug)
-            if uuid is None:
-                logger.warning(f"Resource {uuid_or_slug} not found in KB", extra={"kbid": kbid})
-                continue
-            resource_orm = Resource(txn=txn, storage=storage, kbid=kbid, uuid=uuid)
-            fields = await resource_orm.get_fields()
-            for _, field in fields.items():
-                task = asyncio.create_task(get_extracted_text(uuid_or_slug, field, max_tasks))
-                tasks.append(task)
-
-        if len(tasks) == 0:
-            # No extracted text to get
-            return results
-
-        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
-
-    # Parse the task results
-    for done_task in done:
-        exception = done_task.exception()
-        if exception is not None:  # pragma: no cover
-            logger.error("Error fetching extracted text", exc_info=exception)
-            for pending_task in pending:
-                pending_task.cancel()
-            raise exception
-        results.append(done_task.result())
-
-    tasks.clear()
-    return results
+        uuid = await get_resource_uuid(kb_orm, uuid_or_slug)
+        if uuid is None:
+            logger.warning(f"Resource {uuid_or_slug} not found in KB", extra={"kbid": kbid})
+            return []
+        resource_orm = Resource(txn=txn, storage=storage, kbid=kbid, uuid=uuid)
+        fields = await resource_orm.get_fields()
+        return list(fields.values())
 
 
 async def get_extracted_text(
     uuid_or_slug, field: Field, max_operations: asyncio.Semaphore
 ) -> tuple[str, str, ExtractedText | None]:
     async with max_operations:
-        extracted_text = await field.get_extracted_text(force=True)
+        extracted_text = await cache.get_field_extracted_text_pb(field)
         field_key = f"{field.type}/{field.id}"
         return uuid_or_slug, field_key, extracted_text
 
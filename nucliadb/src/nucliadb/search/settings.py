@@ -26,6 +26,12 @@ from nucliadb.ingest.settings import DriverSettings
 
 class Settings(DriverSettings):
     search_timeout: float = 10.0
+    request_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        title="Request timeout",
+        description="Default time budget in seconds of search API requests. Calls to nidx, predict and storage made for a request are cancelled once it is exhausted. Requests can set a shorter one with the X-NucliaDB-Timeout header. Disabled if not set",
+    )
     slow_find_log_threshold: float = Field(
         default=3.0,
         title="Slow query log threshold",
@@ -42,6 +48,84 @@ class Settings(DriverSettings):
         title="Prequeries max parallel",
         description="The maximum number of prequeries to run in parallel per /ask request",
     )
+    ask_speculative_retrieval: bool = Field(
+        default=False,
+        title="Ask speculative retrieval",
+        description=(
+            "When /ask needs to rephrase the query, run the retrieval with the user query while "
+            "rephrasing and reuse it if the rephrase doesn't change the query"
+        ),
+    )
+    query_entities_cache_size: int = Field(
+        default=1024,
+        title="Query entities cache size",
+        description="Maximum number of queries whose detected entities are cached for the graph strategy",
+    )
+    query_entities_cache_ttl: float = Field(
+        default=60.0,
+        title="Query entities cache TTL",
+        description="Time in seconds the detected entities of a query are cached for the graph strategy",
+    )
+    suggest_cache_ttl: float = Field(
+        default=5.0,
+        ge=0,
+        title="Suggest cache TTL",
+        description="Time in seconds suggest results are cached. KB writes invalidate them earlier. Set to 0 to disable the cache",
+    )
+    suggest_cache_size: int = Field(
+        default=256,
+        gt=0,
+        title="Suggest cache size",
+        description="Maximum number of suggest results cached per KB",
+    )
+    suggest_cache_max_kbs: int = Field(
+        default=1024,
+        gt=0,
+        title="Suggest cache max KBs",
+        description="Maximum number of KBs with cached suggest results",
+    )
+    summarize_cache_ttl: float = Field(
+        default=3600.0,
+        ge=0,
+        title="Summarize cache TTL",
+        description="Time in seconds summaries are cached. They are only reused if the extracted text of the resources did not change. Set to 0 to disable the cache",
+    )
+    summarize_cache_size: int = Field(
+        default=256,
+        gt=0,
+        title="Summarize cache size",
+        description="Maximum number of summaries cached",
+    )
+    hydration_concurrency_initial: int = Field(
+        default=100,
+        gt=0,
+        title="Hydration initial concurrency",
+        description="Initial process-wide limit of concurrent hydration operations (maindb and storage fetches). It adapts to the observed latency between the min and max limits",
+    )
+    hydration_concurrency_min: int = Field(
+        default=10,
+        gt=0,
+        title="Hydration min concurrency",
+        description="Lower bound of the adaptive hydration concurrency limit",
+    )
+    hydration_concurrency_max: int = Field(
+        default=500,
+        gt=0,
+        title="Hydration max concurrency",
+        description="Upper bound of the adaptive hydration concurrency limit",
+    )
+    hydration_concurrency_per_request: int = Field(
+        default=50,
+        gt=0,
+        title="Hydration concurrency per request",
+        description="Maximum concurrent hydration operations of a single request, so one request can't take all the process-wide slots",
+    )
+    hydration_latency_threshold: float = Field(
+        default=1.0,
+        gt=0,
+        title="Hydration latency threshold",
+        description="Hydration operations slower than this many seconds make the concurrency limit back off",
+    )
     nidx_address: str | None = Field(default=None)
 
 
@@ -40,6 +40,7 @@ from nucliadb.middleware import (
 from nucliadb.reader import API_PREFIX
 from nucliadb.reader.api.v1.router import api as api_reader_v1
 from nucliadb.search.api.v1.router import api as api_search_v1
+from nucliadb.search.api.v1.utils import deadline_exceeded_handler
 from nucliadb.standalone.lifecycle import lifespan
 from nucliadb.train.api.v1.router import api as api_train_v1
 from nucliadb.writer.api.v1.router import api as api_writer_v1
@@ -49,6 +50,7 @@ from nucliadb_telemetry.fastapi.utils import (
     global_exception_handler,
 )
 from nucliadb_utils.audit.stream import AuditMiddleware
+from nucliadb_utils.exceptions import DeadlineExceededError
 from nucliadb_utils.fastapi.openapi import extend_openapi
 from nucliadb_utils.fastapi.versioning import VersionedFastAPI
 from nucliadb_utils.settings import http_settings, running_settings
@@ -114,6 +116,7 @@ def application_factory(settings: Settings) -> FastAPI:
         exception_handlers={
             Exception: global_exception_handler,
             ClientDisconnect: client_disconnect_handler,
+            DeadlineExceededError: deadline_exceeded_handler,
         },
         strict_content_type=False,
     )
@@ -34,6 +34,7 @@ from nucliadb.ingest.orm.knowledgebox import KnowledgeBox
 from nucliadb.writer import logger
 from nucliadb.writer.api.utils import only_for_onprem
 from nucliadb.writer.api.v1.router import KB_PREFIX, KBS_PREFIX, api
+from nucliadb.writer.cache import invalidate_kb_cache
 from nucliadb.writer.utilities import get_processing
 from nucliadb_models.resource import (
     KnowledgeBoxConfig,
@@ -179,6 +180,7 @@ async def update_kb(request: Request, kbid: str, item: KnowledgeBoxConfig) -> Kn
         except Exception as exc:
             logger.exception("Could not update KB", exc_info=exc, extra={"kbid": kbid})
             raise HTTPException(status_code=500, detail="Error updating knowledge box")
+        await invalidate_kb_cache(kbid)
 
     return KnowledgeBoxObjID(uuid=kbid)
 
@@ -203,6 +205,8 @@ async def delete_kb(request: Request, kbid: str, background: BackgroundTasks) ->
         logger.exception("Could not delete KB", exc_info=exc, extra={"kbid": kbid})
         raise HTTPException(status_code=500, detail="Error deleting knowledge box")
 
+    await invalidate_kb_cache(kbid)
+
     # onprem nucliadb must delete its learning configuration
     try:
         await learning_proxy.delete_configuration(kbid)
@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
 import contextlib
 from time import time
 from typing import Annotated
@@ -44,7 +45,8 @@ from nucliadb.writer.api.v1.router import (
     RSLUG_PREFIX,
     api,
 )
-from nucliadb.writer.api.v1.slug import ensure_slug_uniqueness, noop_context_manager
+from nucliadb.writer.api.v1.slug import ensure_slug_uniqueness, lock_slug, noop_context_manager
+from nucliadb.writer.cache import get_kb_config
 from nucliadb.writer.resource.audit import parse_audit
 from nucliadb.writer.resource.basic import (
     parse_basic_creation,
@@ -62,14 +64,19 @@ from nucliadb.writer.resource.field import (
     parse_fields,
 )
 from nucliadb.writer.resource.origin import parse_extra, parse_origin
+from nucliadb.writer.settings import settings
 from nucliadb.writer.utilities import get_processing
 from nucliadb_models.resource import NucliaDBRoles
 from nucliadb_models.writer import (
     CreateResourcePayload,
+    CreateResourcesPayload,
     ResourceCreated,
+    ResourceCreationResult,
+    ResourcesCreated,
     ResourceUpdated,
     UpdateResourcePayload,
 )
+from nucliadb_protos.knowledgebox_pb2 import KnowledgeBoxConfig
 from nucliadb_protos.resources_pb2 import FieldID, Metadata
 from nucliadb_protos.writer_pb2 import BrokerMessage, FieldIDStatus, FieldStatus, IndexResource
 from nucliadb_telemetry.errors import capture_exception
@@ -100,7 +107,7 @@ async def create_resource(
     x_skip_store: Annotated[bool, X_SKIP_STORE] = False,
     x_nucliadb_user: Annotated[str, X_NUCLIADB_USER] = "",
 ):
-    kb_config = await datamanagers.atomic.kb.get_config(kbid=kbid)
+    kb_config = await get_kb_config(kbid)
     if item.hidden and not (kb_config and kb_config.hidden_resources_enabled):
         raise HTTPException(
             status_code=422,
@@ -108,6 +115,119 @@ async def create_resource(
         )
     await maybe_back_pressure(kbid)
 
+    unique_slug_context_manager = noop_context_manager()
+    if item.slug:
+        unique_slug_context_manager = ensure_slug_uniqueness(kbid, item.slug)
+
+    async with unique_slug_context_manager:
+        return await _create_resource(
+            request,
+            kbid,
+            item,
+            kb_config,
+            x_skip_store=x_skip_store,
+            x_nucliadb_user=x_nucliadb_user,
+        )
+
+
+@api.post(
+    f"/{KB_PREFIX}/{{kbid}}/{RESOURCES_PREFIX}/batch",
+    status_code=200,
+    name="Create Resources",
+    description="Create many new Resources in a Knowledge Box at once. Each resource is created independently and the response contains one result per resource, in the same order as in the request.",
+    response_model=ResourcesCreated,
+    response_model_exclude_unset=True,
+    tags=["Resources"],
+)
+@requires(NucliaDBRoles.WRITER)
+@version(1)
+async def create_resources(
+    request: Request,
+    item: CreateResourcesPayload,
+    kbid: str,
+    x_skip_store: Annotated[bool, X_SKIP_STORE] = False,
+    x_nucliadb_user: Annotated[str, X_NUCLIADB_USER] = "",
+) -> ResourcesCreated:
+    kb_config = await get_kb_config(kbid)
+    await maybe_back_pressure(kbid)
+
+    results: list[ResourceCreationResult | None] = [None] * len(item.resources)
+    to_create: list[int] = []
+    slugs: dict[str, int] = {}
+    for idx, payload in enumerate(item.resources):
+        if payload.hidden and not (kb_config and kb_config.hidden_resources_enabled):
+            results[idx] = ResourceCreationResult(
+                status_code=422,
+                error="Cannot hide a resource: the KB does not have hidden resources enabled",
+            )
+        elif payload.slug and payload.slug in slugs:
+            results[idx] = ResourceCreationResult(
+                status_code=409, error=f"Resource slug {payload.slug} is repeated in the request"
+            )
+        else:
+            if payload.slug:
+                slugs[payload.slug] = idx
+            to_create.append(idx)
+
+    async with contextlib.AsyncExitStack() as slug_locks:
+        # Lock all slugs before checking them in bulk, so no concurrent request can
+        # take them between the check and the commit
+        for slug, idx in slugs.items():
+            try:
+                await slug_locks.enter_async_context(lock_slug(kbid, slug))
+            except HTTPException as exc:
+                results[idx] = ResourceCreationResult(status_code=exc.status_code, error=exc.detail)
+        locked = [slug for slug, idx in slugs.items() if results[idx] is None]
+        for slug in await datamanagers.atomic.resources.existing_slugs(kbid=kbid, slugs=locked):
+            results[slugs[slug]] = ResourceCreationResult(
+                status_code=409, error=f"Resource slug {slug} already exists"
+            )
+
+        semaphore = asyncio.Semaphore(settings.create_resources_concurrency)
+
+        async def create_one(idx: int) -> None:
+            try:
+                async with semaphore:
+                    created = await _create_resource(
+                        request,
+                        kbid,
+                        item.resources[idx],
+                        kb_config,
+                        x_skip_store=x_skip_store,
+                        x_nucliadb_user=x_nucliadb_user,
+                    )
+            except HTTPException as exc:
+                results[idx] = ResourceCreationResult(status_code=exc.status_code, error=exc.detail)
+            except Exception as exc:
+                # Report it as the result of this resource, as others may already be
+                # committed, and let the rest finish before the slug locks are released
+                capture_exception(exc)
+                logger.exception("Error creating resource in batch", extra={"kbid": kbid})
+                results[idx] = ResourceCreationResult(status_code=500, error="Error creating resource")
+            else:
+                results[idx] = ResourceCreationResult(
+                    uuid=created.uuid, seqid=created.seqid, elapsed=created.elapsed, status_code=201
+                )
+
+        # Broker messages are published concurrently, so their acks are pipelined
+        # on the same connection instead of paying a round trip per resource
+        await asyncio.gather(*(create_one(idx) for idx in to_create if results[idx] is None))
+
+    return ResourcesCreated(results=[result for result in results if result is not None])
+
+
+async def _create_resource(
+    request: Request,
+    kbid: str,
+    item: CreateResourcePayload,
+    kb_config: KnowledgeBoxConfig | None,
+    *,
+    x_skip_store: bool,
+    x_nucliadb_user: str,
+) -> ResourceCreated:
+    """Build, commit and send to process a new resource. Callers are responsible for
+    validating the payload against the KB and of ensuring slug uniqueness.
+    """
     partitioning = get_partitioning()
 
     # Create resource message
@@ -131,51 +251,48 @@ async def create_resource(
     toprocess.source = Source.HTTP
     toprocess.title = item.title
 
-    unique_slug_context_manager = noop_context_manager()
     if item.slug:
-        unique_slug_context_manager = ensure_slug_uniqueness(kbid, item.slug)
         writer.slug = item.slug
         toprocess.slug = item.slug
 
-    async with unique_slug_context_manager:
-        parse_audit(writer.audit, request)
-        parse_basic_creation(writer, item, toprocess, kb_config)
+    parse_audit(writer.audit, request)
+    parse_basic_creation(writer, item, toprocess, kb_config)
 
-        if item.origin is not None:
-            parse_origin(writer.origin, item.origin)
-        if item.extra is not None:
-            parse_extra(writer.extra, item.extra)
+    if item.origin is not None:
+        parse_origin(writer.origin, item.origin)
+    if item.extra is not None:
+        parse_extra(writer.extra, item.extra)
 
-        # Since this is a resource creation, we need to care only about the user-provided
-        # classifications in the request.
-        resource_classifications = ResourceClassifications(
-            resource_level=set(parse_user_classifications(item))
-        )
-        await parse_fields(
-            writer=writer,
-            item=item,
-            toprocess=toprocess,
-            kbid=kbid,
-            uuid=uuid,
-            x_skip_store=x_skip_store,
-            resource_classifications=resource_classifications,
-        )
-        set_status(writer.basic, item)
+    # Since this is a resource creation, we need to care only about the user-provided
+    # classifications in the request.
+    resource_classifications = ResourceClassifications(
+        resource_level=set(parse_user_classifications(item))
+    )
+    await parse_fields(
+        writer=writer,
+        item=item,
+        toprocess=toprocess,
+        kbid=kbid,
+        uuid=uuid,
+        x_skip_store=x_skip_store,
+        resource_classifications=resource_classifications,
+    )
+    set_status(writer.basic, item)
 
-        writer.source = BrokerMessage.MessageSource.WRITER
+    writer.source = BrokerMessage.MessageSource.WRITER
 
-        if item.wait_for_commit:
-            t0 = time()
-        await transaction.commit(writer, partition, wait=item.wait_for_commit)
+    if item.wait_for_commit:
+        t0 = time()
+    await transaction.commit(writer, partition, wait=item.wait_for_commit)
 
-        if item.wait_for_commit:
-            txn_time = time() - t0
-        else:
-            txn_time = None
+    if item.wait_for_commit:
+        txn_time = time() - t0
+    else:
+        txn_time = None
 
-        seqid = await maybe_send_to_process(toprocess, partition)
+    seqid = await maybe_send_to_process(toprocess, partition)
 
-        return ResourceCreated(seqid=seqid, uuid=uuid, elapsed=txn_time)
+    return ResourceCreated(seqid=seqid, uuid=uuid, elapsed=txn_time)
 
 
 @api.patch(
@@ -275,7 +392,7 @@ async def modify_resource(
     *,
     rid: str,
 ):
-    kb_config = await datamanagers.atomic.kb.get_config(kbid=kbid)
+    kb_config = await get_kb_config(kbid)
     if item.hidden and not (kb_config and kb_config.hidden_resources_enabled):
         raise HTTPException(
             status_code=422,
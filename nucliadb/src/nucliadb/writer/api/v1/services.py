@@ -25,6 +25,7 @@ from nucliadb.common import datamanagers
 from nucliadb.common.datamanagers.exceptions import KnowledgeBoxNotFound
 from nucliadb.common.models_utils import to_proto
 from nucliadb.writer.api.v1.router import KB_PREFIX, api
+from nucliadb.writer.cache import invalidate_kb_cache
 from nucliadb_models.configuration import SearchConfiguration
 from nucliadb_models.kv_schemas import MAX_KV_SCHEMAS, KVSchema, UpdateKVSchema
 from nucliadb_models.labels import LabelSet
@@ -261,6 +262,7 @@ async def create_kv_schema(request: Request, kbid: str, item: KVSchema) -> KVSch
         await datamanagers.kv_schemas.set(txn, kbid=kbid, schema=item)
         await txn.commit()
 
+    await invalidate_kb_cache(kbid)
     return item
 
 
@@ -298,6 +300,7 @@ async def update_kv_schema(
         await datamanagers.kv_schemas.set(txn, kbid=kbid, schema=schema)
         await txn.commit()
 
+    await invalidate_kb_cache(kbid)
     return schema
 
 
@@ -320,4 +323,5 @@ async def delete_kv_schema(request: Request, kbid: str, schema_id: str) -> Respo
 
         await txn.commit()
 
+    await invalidate_kb_cache(kbid)
     return Response(status_code=204)
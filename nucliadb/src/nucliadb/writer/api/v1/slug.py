@@ -34,12 +34,10 @@ async def noop_context_manager():
 
 
 @contextlib.asynccontextmanager
-async def ensure_slug_uniqueness(kbid: str, slug: str):
+async def lock_slug(kbid: str, slug: str):
     """
-    Make sure slug is unique by:
-    - First check if the slug is already taken by another existing resource
-    - Otherwise, use the transaction lock to prevent from multiple concurrent
-      create resource requests having the same slug.
+    Use the transaction lock to prevent from multiple concurrent create resource
+    requests having the same slug.
     """
     try:
         async with locking.distributed_lock(
@@ -52,10 +50,22 @@ async def ensure_slug_uniqueness(kbid: str, slug: str):
             # We don't want to refresh it here
             refresh_timeout=120.0,
         ):
-            if await datamanagers.atomic.resources.slug_exists(kbid=kbid, slug=slug):
-                raise HTTPException(status_code=409, detail=f"Resource slug {slug} already exists")
             yield
     except locking.ResourceLocked:
         raise HTTPException(
             status_code=409, detail=f"Another resource with the same {slug} is already being ingested"
         )
+
+
+@contextlib.asynccontextmanager
+async def ensure_slug_uniqueness(kbid: str, slug: str):
+    """
+    Make sure slug is unique by:
+    - First check if the slug is already taken by another existing resource
+    - Otherwise, use the transaction lock to prevent from multiple concurrent
+      create resource requests having the same slug.
+    """
+    async with lock_slug(kbid, slug):
+        if await datamanagers.atomic.resources.slug_exists(kbid=kbid, slug=slug):
+            raise HTTPException(status_code=409, detail=f"Resource slug {slug} already exists")
+        yield
@@ -17,8 +17,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
 import base64
 import logging
+import time
 import uuid
 from datetime import datetime
 from hashlib import md5
@@ -33,6 +35,7 @@ from starlette.requests import Request as StarletteRequest
 
 from nucliadb.common import datamanagers, file_md5
 from nucliadb.common.back_pressure import maybe_back_pressure
+from nucliadb.ingest.orm.knowledgebox import TUS_PARTIAL_UPLOAD_TO_DELETE
 from nucliadb.ingest.orm.resource import Resource
 from nucliadb.ingest.orm.utils import set_title
 from nucliadb.models.internal.processing import PushPayload, Source
@@ -52,6 +55,7 @@ from nucliadb.writer.api.v1.resource import (
     validate_rid_exists_or_raise_error,
 )
 from nucliadb.writer.api.v1.slug import ensure_slug_uniqueness, noop_context_manager
+from nucliadb.writer.cache import get_kb_config
 from nucliadb.writer.resource.audit import parse_audit
 from nucliadb.writer.resource.basic import parse_basic_creation, parse_user_classifications
 from nucliadb.writer.resource.field import (
@@ -59,7 +63,14 @@ from nucliadb.writer.resource.field import (
     parse_fields,
 )
 from nucliadb.writer.resource.origin import parse_extra, parse_origin
-from nucliadb.writer.tus import TUSUPLOAD, UPLOAD, get_dm, get_storage_manager
+from nucliadb.writer.tus import (
+    TUS_PARTIAL_UPLOAD_PATH,
+    TUSUPLOAD,
+    UPLOAD,
+    get_dm,
+    get_storage_manager,
+)
+from nucliadb.writer.tus.dm import FileDataManager
 from nucliadb.writer.tus.exceptions import (
     HTTPBadRequest,
     HTTPConflict,
@@ -69,7 +80,7 @@ from nucliadb.writer.tus.exceptions import (
     ResumableURINotAvailable,
 )
 from nucliadb.writer.tus.storage import FileStorageManager
-from nucliadb.writer.tus.utils import parse_tus_metadata
+from nucliadb.writer.tus.utils import parse_tus_metadata, parse_upload_concat_final
 from nucliadb.writer.utilities import get_processing
 from nucliadb_models import content_types
 from nucliadb_models.resource import NucliaDBRoles
@@ -93,7 +104,7 @@ logger = logging.getLogger(__name__)
 TUS_HEADERS = {
     "Tus-Resumable": "1.0.0",
     "Tus-Version": "1.0.0",
-    "Tus-Extension": "creation-defer-length",
+    "Tus-Extension": "creation-defer-length,concatenation",
 }
 
 
@@ -236,7 +247,7 @@ async def _tus_post(
     if path_rid is not None:
         await validate_rid_exists_or_raise_error(kbid, path_rid)
 
-    kb_config = await datamanagers.atomic.kb.get_config(kbid=kbid)
+    kb_config = await get_kb_config(kbid)
     if item and item.hidden and not (kb_config and kb_config.hidden_resources_enabled):
         raise HTTPException(
             status_code=422,
@@ -254,11 +265,25 @@ async def _tus_post(
     if request.headers.get("upload-defer-length") == "1":
         deferred_length = True
 
+    # Concatenation extension: parts of an upload can be sent in parallel as partial
+    # uploads and then concatenated into a final upload
+    upload_concat = request.headers.get("upload-concat")
+    partial = upload_concat == "partial"
+    final_parts = None
+    if upload_concat is not None and not partial:
+        try:
+            final_parts = parse_upload_concat_final(upload_concat)
+        except InvalidTUSMetadata as exc:
+            raise HTTPBadRequest(detail=f"Upload-Concat header contains errors: {exc!s}")
+
     size = None
     if "upload-length" in request.headers:
         size = int(request.headers["upload-length"])
+    elif partial:
+        raise HTTPPreconditionFailed(detail="upload-length header is required for partial uploads")
     else:
-        if not deferred_length:
+        # The size of a final upload is the sum of the sizes of its parts
+        if not deferred_length and final_parts is None:
             raise HTTPPreconditionFailed(detail="upload-length header is required")
 
     if "tus-resumable" not in request.headers:
@@ -272,6 +297,10 @@ async def _tus_post(
     else:
         metadata = {}
 
+    if partial:
+        assert size is not None
+        return await _tus_post_partial(request, kbid, size, metadata)
+
     path, rid, field = await validate_field_upload(kbid, path_rid, field_id, metadata.get("md5"))
 
     if implies_resource_creation:
@@ -301,11 +330,7 @@ async def _tus_post(
     if request_content_type is None:
         request_content_type = content_types.guess(metadata["filename"]) or "application/octet-stream"
 
-    if request_content_type is not None and not content_types.valid(request_content_type):
-        raise HTTPException(
-            status_code=415,
-            detail=f"Unsupported content type: {request_content_type}",
-        )
+    validate_content_type(request_content_type)
 
     metadata.setdefault("content_type", request_content_type)
 
@@ -315,6 +340,21 @@ async def _tus_post(
     if implies_resource_creation and item is not None:
         creation_payload = item.model_dump()
 
+    if final_parts is not None:
+        return await _tus_post_final(
+            request,
+            kbid,
+            upload_id,
+            final_parts,
+            path=path,
+            rid=rid,
+            field=field,
+            metadata=metadata,
+            creation_payload=creation_payload,
+            extract_strategy=extract_strategy,
+            split_strategy=split_strategy,
+        )
+
     await dm.load(upload_id)
     await dm.start(request)
     await dm.update(
@@ -349,6 +389,142 @@ async def _tus_post(
     )
 
 
+async def _tus_post_partial(
+    request: Request, kbid: str, size: int, metadata: dict[str, str]
+) -> Response:
+    """
+    Create a partial upload. Its data is uploaded as any other upload but, once
+    finished, it is kept until a final upload concatenates it.
+    """
+    dm = get_dm()
+    storage_manager = get_storage_manager()
+
+    upload_id = uuid.uuid4().hex
+    metadata.setdefault("filename", upload_id)
+    metadata.setdefault("content_type", "application/octet-stream")
+
+    await dm.load(upload_id)
+    await dm.start(request)
+    await dm.update(
+        upload_file_id=upload_id,
+        metadata=metadata,
+        partial=True,
+        kbid=kbid,
+        offset=0,
+        size=size,
+    )
+    path = TUS_PARTIAL_UPLOAD_PATH.format(kbid=kbid, upload_id=upload_id)
+    # Partial uploads that are never concatenated are removed from storage by purge
+    async with datamanagers.with_rw_transaction() as txn:
+        await txn.set(
+            TUS_PARTIAL_UPLOAD_TO_DELETE.format(kbid=kbid, upload_id=upload_id),
+            str(time.time()).encode(),
+        )
+        await txn.commit()
+    await storage_manager.start(dm, path=path, kbid=kbid)
+    await dm.save()
+
+    location = api.url_path_for("Upload information", upload_id=upload_id, **request.path_params)
+    return Response(
+        status_code=201,
+        headers={
+            "Location": location,
+            "Tus-Resumable": "1.0.0",
+            "Access-Control-Expose-Headers": "Location,Tus-Resumable",
+        },
+    )
+
+
+async def _tus_post_final(
+    request: Request,
+    kbid: str,
+    upload_id: str,
+    part_ids: list[str],
+    *,
+    path: str,
+    rid: str,
+    field: str,
+    metadata: dict[str, str],
+    creation_payload: dict | None,
+    extract_strategy: str | None,
+    split_strategy: str | None,
+) -> Response:
+    """
+    Create a final upload by concatenating some finished partial uploads. The upload
+    is complete as soon as it's created, so the file is stored on NucliaDB right away.
+    """
+    # Validate before concatenating, as parts are deleted once concatenated
+    validate_content_type(metadata.get("content_type"))
+
+    storage_manager = get_storage_manager()
+
+    parts = await asyncio.gather(*(_load_partial_upload(kbid, part_id) for part_id in part_ids))
+    for part in parts[:-1]:
+        validate_intermediate_tus_chunk(part.size, storage_manager)
+    size = sum(part.size for part in parts)
+
+    dm = get_dm()
+    await dm.load(upload_id)
+    await dm.start(request)
+    await dm.update(
+        upload_file_id=upload_id,
+        rid=rid,
+        field=field,
+        metadata=metadata,
+        offset=size,
+        size=size,
+        item=creation_payload,
+        extract_strategy=extract_strategy,
+        split_strategy=split_strategy,
+    )
+    await storage_manager.concat(dm, path=path, kbid=kbid, parts=[part.get("path") for part in parts])
+    await asyncio.gather(*(part.finish() for part in parts))
+    await dm.finish()
+    async with datamanagers.with_rw_transaction() as txn:
+        for part_id in part_ids:
+            await txn.delete(TUS_PARTIAL_UPLOAD_TO_DELETE.format(kbid=kbid, upload_id=part_id))
+        await txn.commit()
+
+    seqid = await _store_finished_upload(
+        request, kbid, dm, storage_manager, rid=rid, field=field, path=path
+    )
+
+    location = api.url_path_for("Upload information", upload_id=upload_id, **request.path_params)
+    return Response(
+        status_code=201,
+        headers={
+            "Location": location,
+            "Tus-Resumable": "1.0.0",
+            "Upload-Offset": str(size),
+            "Tus-Upload-Finished": "1",
+            "NDB-Resource": f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}/{rid}",
+            "NDB-Field": f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}/{rid}/field/{field}",
+            "NDB-Seq": f"{seqid}",
+            "Access-Control-Expose-Headers": ",".join(
+                ["Location", "Upload-Offset", "Tus-Resumable", "Tus-Upload-Finished"]
+            ),
+        },
+    )
+
+
+def validate_content_type(content_type: str | None) -> None:
+    if content_type is not None and not content_types.valid(content_type):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type: {content_type}",
+        )
+
+
+async def _load_partial_upload(kbid: str, upload_id: str) -> FileDataManager:
+    part = get_dm()
+    await part.load(upload_id)
+    if not part.get("partial") or part.get("kbid") != kbid:
+        raise HTTPPreconditionFailed(detail=f"{upload_id} is not a partial upload of this Knowledge Box")
+    if not part.get("finished"):
+        raise HTTPConflict(detail=f"Partial upload {upload_id} is not finished")
+    return part
+
+
 @api.head(
     f"/{KB_PREFIX}/{{kbid}}/{RSLUG_PREFIX}/{{rslug}}/file/{{field}}/{TUSUPLOAD}/{{upload_id}}",
     tags=["Resource field TUS uploads"],
@@ -555,11 +731,17 @@ async def _tus_patch(
     if not upload_finished:
         validate_intermediate_tus_chunk(current_chunk_size, storage_manager)
 
-    read_bytes = await storage_manager.append(
-        dm,
-        storage_manager.iterate_body_chunks(request, storage_manager.chunk_size),
-        offset,
-    )
+    # Reserve the offset before writing, so concurrent appends can't write the same data
+    await dm.reserve(offset)
+    try:
+        read_bytes = await storage_manager.append(
+            dm,
+            storage_manager.iterate_body_chunks(request, storage_manager.chunk_size),
+            offset,
+        )
+    except Exception:
+        await dm.release(offset)
+        raise
 
     if to_upload and read_bytes != to_upload:  # pragma: no cover
         # check length matches if provided
@@ -573,7 +755,13 @@ async def _tus_patch(
             ["Upload-Offset", "Tus-Resumable", "Tus-Upload-Finished"]
         ),
     }
-    if upload_finished:
+    if upload_finished and dm.get("partial"):
+        # Partial uploads are only stored on NucliaDB once concatenated in a final upload
+        await storage_manager.finish(dm)
+        await dm.update(finished=True)
+        await dm.save()
+        headers["Tus-Upload-Finished"] = "1"
+    elif upload_finished:
         rid = dm.get("rid", rid)
         if rid is None:
             raise AttributeError()
@@ -585,41 +773,9 @@ async def _tus_patch(
         headers["NDB-Resource"] = f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}/{rid}"
         headers["NDB-Field"] = f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}/{rid}/field/{field}"
 
-        item_payload = dm.get("item")
-        creation_payload = None
-        if item_payload is not None:
-            creation_payload = CreateResourcePayload.model_validate(item_payload)
-
-        content_type = dm.get("metadata", {}).get("content_type")
-        if content_type is not None and not content_types.valid(content_type):
-            return HTTPClientError(
-                status_code=415,
-                detail=f"Unsupported content type: {content_type}",
-            )
-
-        try:
-            seqid = await store_file_on_nuclia_db(
-                size=dm.get("size"),
-                content_type=content_type,
-                override_resource_title=dm.get("metadata", {}).get("implies_resource_creation", False),
-                filename=dm.get("metadata", {}).get("filename"),
-                password=dm.get("metadata", {}).get("password"),
-                language=dm.get("metadata", {}).get("language"),
-                md5=dm.get("metadata", {}).get("md5"),
-                source=storage_manager.storage.source,
-                field=field,
-                rid=rid,
-                kbid=kbid,
-                path=path,
-                request=request,
-                bucket=storage_manager.storage.get_bucket_name(kbid),
-                item=creation_payload,
-                extract_strategy=dm.get("extract_strategy") or None,
-                split_strategy=dm.get("split_strategy") or None,
-            )
-        except LimitsExceededError as exc:
-            raise HTTPException(status_code=exc.status_code, detail=exc.detail)
-
+        seqid = await _store_finished_upload(
+            request, kbid, dm, storage_manager, rid=rid, field=field, path=path
+        )
         headers["NDB-Seq"] = f"{seqid}"
     else:
         await dm.save()
@@ -627,6 +783,48 @@ async def _tus_patch(
     return Response(headers=headers)
 
 
+async def _store_finished_upload(
+    request: Request,
+    kbid: str,
+    dm: FileDataManager,
+    storage_manager: FileStorageManager,
+    *,
+    rid: str,
+    field: str,
+    path: str,
+) -> int | None:
+    item_payload = dm.get("item")
+    creation_payload = None
+    if item_payload is not None:
+        creation_payload = CreateResourcePayload.model_validate(item_payload)
+
+    content_type = dm.get("metadata", {}).get("content_type")
+    validate_content_type(content_type)
+
+    try:
+        return await store_file_on_nuclia_db(
+            size=dm.get("size"),
+            content_type=content_type,
+            override_resource_title=dm.get("metadata", {}).get("implies_resource_creation", False),
+            filename=dm.get("metadata", {}).get("filename"),
+            password=dm.get("metadata", {}).get("password"),
+            language=dm.get("metadata", {}).get("language"),
+            md5=dm.get("metadata", {}).get("md5"),
+            source=storage_manager.storage.source,
+            field=field,
+            rid=rid,
+            kbid=kbid,
+            path=path,
+            request=request,
+            bucket=storage_manager.storage.get_bucket_name(kbid),
+            item=creation_payload,
+            extract_strategy=dm.get("extract_strategy") or None,
+            split_strategy=dm.get("split_strategy") or None,
+        )
+    except LimitsExceededError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+
+
 def validate_intermediate_tus_chunk(read_bytes: int, storage_manager: FileStorageManager):
     try:
         storage_manager.validate_intermediate_chunk(read_bytes)
@@ -935,7 +1133,7 @@ async def store_file_on_nuclia_db(
 
         toprocess.processing_options = item.processing_options
 
-        kb_config = await datamanagers.atomic.kb.get_config(kbid=kbid)
+        kb_config = await get_kb_config(kbid)
         parse_basic_creation(writer, item, toprocess, kb_config)
         if item.origin is not None:
             parse_origin(writer.origin, item.origin)
@@ -957,7 +1155,7 @@ async def store_file_on_nuclia_db(
         )
     else:
         # Use defaults for everything, but don't forget hidden which depends on KB config
-        kb_config = await datamanagers.atomic.kb.get_config(kbid=kbid)
+        kb_config = await get_kb_config(kbid)
         if kb_config and kb_config.hidden_resources_hide_on_creation:
             writer.basic.hidden = True
 
@@ -0,0 +1,160 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+import logging
+import uuid
+from typing import Any
+
+from cachetools import TTLCache
+
+from nucliadb.common import datamanagers
+from nucliadb.writer.settings import settings
+from nucliadb_models.kv_schemas import KBKVSchemas, KVSchema
+from nucliadb_protos.knowledgebox_pb2 import KnowledgeBoxConfig
+from nucliadb_telemetry import metrics
+from nucliadb_utils import const
+from nucliadb_utils.utilities import get_pubsub
+
+logger = logging.getLogger(__name__)
+
+kb_cache_ops = metrics.Counter("nucliadb_writer_kb_cache_ops", labels={"type": "", "op": ""})
+
+
+class KBCache:
+    """
+    Process-level cache of the KB config and key-value schemas, which are read
+    on every resource creation and modification but rarely change.
+
+    Entries expire after `kb_cache_ttl` seconds. Changes made through this
+    writer invalidate them immediately and, when pubsub is available, are
+    broadcast so other writers drop their copies too.
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self.enabled = ttl > 0
+        self._configs: TTLCache[str, KnowledgeBoxConfig] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._kv_schemas: TTLCache[str, KBKVSchemas] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get_config(self, kbid: str) -> KnowledgeBoxConfig | None:
+        config = self._configs.get(kbid)
+        if config is not None:
+            kb_cache_ops.inc({"type": "config", "op": "hit"})
+            return config
+        kb_cache_ops.inc({"type": "config", "op": "miss"})
+        config = await datamanagers.atomic.kb.get_config(kbid=kbid)
+        # Do not cache missing configs, the KB may be created right after
+        if config is not None and self.enabled:
+            self._configs[kbid] = config
+        return config
+
+    async def get_kv_schemas(self, kbid: str) -> KBKVSchemas:
+        schemas = self._kv_schemas.get(kbid)
+        if schemas is not None:
+            kb_cache_ops.inc({"type": "kv_schemas", "op": "hit"})
+            return schemas
+        kb_cache_ops.inc({"type": "kv_schemas", "op": "miss"})
+        async with datamanagers.with_ro_transaction() as txn:
+            schemas = await datamanagers.kv_schemas.get_all(txn, kbid=kbid)
+        if self.enabled:
+            self._kv_schemas[kbid] = schemas
+        return schemas
+
+    def invalidate(self, kbid: str) -> None:
+        self._configs.pop(kbid, None)
+        self._kv_schemas.pop(kbid, None)
+
+    def clear(self) -> None:
+        self._configs.clear()
+        self._kv_schemas.clear()
+
+
+_cache = KBCache(ttl=settings.kb_cache_ttl, maxsize=settings.kb_cache_size)
+_subscription_id: str | None = None
+
+
+async def get_kb_config(kbid: str) -> KnowledgeBoxConfig | None:
+    """
+    Cached equivalent of `datamanagers.atomic.kb.get_config`. The returned
+    config is shared, do not modify it.
+    """
+    return await _cache.get_config(kbid)
+
+
+async def get_kv_schema(kbid: str, id: str) -> KVSchema | None:
+    """
+    Cached equivalent of `datamanagers.kv_schemas.get`
+    """
+    schemas = await _cache.get_kv_schemas(kbid)
+    return schemas.schemas.get(id)
+
+
+async def invalidate_kb_cache(kbid: str) -> None:
+    """
+    Drop the cached config and kv schemas of a KB in this process and, if
+    pubsub is configured, in the rest of writers. Call it after changing any
+    of them.
+    """
+    _cache.invalidate(kbid)
+    pubsub = await get_pubsub()
+    if pubsub is None:
+        return
+    try:
+        await pubsub.publish(const.PubSubChannels.KB_CACHE_INVALIDATE.format(kbid=kbid), kbid.encode())
+    except Exception:
+        # Other writers will pick up the change once their entries expire
+        logger.warning("Could not publish KB cache invalidation", exc_info=True, extra={"kbid": kbid})
+
+
+def clear_kb_cache() -> None:
+    """
+    Drop all cached entries in this process
+    """
+    _cache.clear()
+
+
+async def start_kb_cache_invalidation() -> None:
+    global _subscription_id
+
+    pubsub = await get_pubsub()
+    if pubsub is None or not _cache.enabled:
+        return
+
+    async def handle_message(msg: Any) -> None:
+        kbid = pubsub.parse(msg).decode()
+        _cache.invalidate(kbid)
+
+    _subscription_id = str(uuid.uuid4())
+    # No group: every writer needs to receive all invalidations
+    await pubsub.subscribe(
+        handler=handle_message,
+        key=const.PubSubChannels.KB_CACHE_INVALIDATE.format(kbid="*"),
+        subscription_id=_subscription_id,
+    )
+
+
+async def stop_kb_cache_invalidation() -> None:
+    global _subscription_id
+
+    _cache.clear()
+    if _subscription_id is None:
+        return
+    pubsub = await get_pubsub()
+    if pubsub is not None:
+        await pubsub.unsubscribe(key=_subscription_id)
+    _subscription_id = None
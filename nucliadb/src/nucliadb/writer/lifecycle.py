@@ -27,6 +27,7 @@ from nucliadb.common.context.fastapi import inject_app_context
 from nucliadb.ingest.processing import start_processing_engine, stop_processing_engine
 from nucliadb.ingest.utils import start_ingest, stop_ingest
 from nucliadb.writer import SERVICE_NAME
+from nucliadb.writer.cache import start_kb_cache_invalidation, stop_kb_cache_invalidation
 from nucliadb.writer.tus import finalize as storage_finalize
 from nucliadb.writer.tus import initialize as storage_initialize
 from nucliadb_telemetry.utils import clean_telemetry, setup_telemetry
@@ -49,6 +50,7 @@ async def lifespan(app: FastAPI):
     start_partitioning_utility()
     await start_transaction_utility(SERVICE_NAME)
     await storage_initialize()
+    await start_kb_cache_invalidation()
 
     # Inject application context into the fastapi app's state
     async with inject_app_context(app) as context:
@@ -58,6 +60,7 @@ async def lifespan(app: FastAPI):
 
     if back_pressure_enabled:
         await stop_materializer()
+    await stop_kb_cache_invalidation()
     await stop_transaction_utility()
     await stop_ingest()
     await stop_processing_engine()
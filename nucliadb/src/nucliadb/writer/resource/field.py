@@ -40,6 +40,7 @@ from nucliadb.models.internal.processing import (
     PushPayload,
 )
 from nucliadb.writer import SERVICE_NAME, logger
+from nucliadb.writer.cache import get_kv_schema
 from nucliadb.writer.utilities import get_processing
 from nucliadb_models.common import FieldTypeName
 from nucliadb_models.content_types import GENERIC_MIME_TYPE
@@ -325,8 +326,7 @@ async def parse_key_value_field(
     if txn is not None:
         schema = await datamanagers.kv_schemas.get(txn, kbid=kbid, id=key)
     else:
-        async with datamanagers.with_ro_transaction() as ro_txn:
-            schema = await datamanagers.kv_schemas.get(ro_txn, kbid=kbid, id=key)
+        schema = await get_kv_schema(kbid, key)
 
     if schema is None:
         raise HTTPException(
@@ -18,13 +18,49 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from enum import Enum
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
+class DMDriver(Enum):
+    REDIS = "redis"
+    PG = "pg"
+
+    @classmethod
+    def _missing_(cls, value):
+        """
+        allow case insensitive enum values
+        """
+        for member in cls:
+            if member.value == value.lower():
+                return member
+
+
 class Settings(BaseSettings):
     dm_enabled: bool = True
+    dm_driver: DMDriver = Field(
+        default=DMDriver.REDIS,
+        description="Where to store the state of TUS uploads when dm_enabled is set. `redis` uses dm_redis_host and dm_redis_port, `pg` uses the maindb.",
+    )
     dm_redis_host: str | None = None
     dm_redis_port: int | None = None
+    kb_cache_ttl: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds the writer caches KB config and key-value schemas in memory. Local changes and, when pubsub is configured, changes made by other writers invalidate the cache immediately. Set to 0 to disable caching.",
+    )
+    kb_cache_size: int = Field(
+        default=1024,
+        gt=0,
+        description="Maximum number of KBs whose config and key-value schemas are cached by the writer",
+    )
+    create_resources_concurrency: int = Field(
+        default=10,
+        gt=0,
+        description="Maximum number of resources of a batch creation request that are created concurrently",
+    )
 
 
 settings = Settings()
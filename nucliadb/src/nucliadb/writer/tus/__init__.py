@@ -19,8 +19,9 @@
 #
 from dataclasses import dataclass
 
+from nucliadb.writer.settings import DMDriver
 from nucliadb.writer.settings import settings as writer_settings
-from nucliadb.writer.tus.dm import FileDataManager, RedisFileDataManagerFactory
+from nucliadb.writer.tus.dm import FileDataManager, PGFileDataManager, RedisFileDataManagerFactory
 from nucliadb.writer.tus.exceptions import ManagerNotAvailable
 from nucliadb.writer.tus.storage import BlobStore, FileStorageManager
 from nucliadb_utils.exceptions import ConfigurationError
@@ -29,6 +30,9 @@ from nucliadb_utils.settings import FileBackendConfig, storage_settings
 TUSUPLOAD = "tusupload"
 UPLOAD = "upload"
 
+# Where partial uploads (TUS concatenation extension) are stored until concatenated
+TUS_PARTIAL_UPLOAD_PATH = "kbs/{kbid}/tusparts/{upload_id}"
+
 
 @dataclass
 class TusStorageDriver:
@@ -133,6 +137,8 @@ async def finalize():
 
 
 def get_dm() -> FileDataManager:
+    if writer_settings.dm_enabled and writer_settings.dm_driver == DMDriver.PG:
+        return PGFileDataManager()
     if writer_settings.dm_enabled:
         global REDIS_FILE_DATA_MANAGER_FACTORY
         if REDIS_FILE_DATA_MANAGER_FACTORY is None:
@@ -19,6 +19,8 @@
 #
 from __future__ import annotations
 
+import asyncio
+
 from nucliadb.writer import logger
 from nucliadb.writer.tus.dm import FileDataManager
 from nucliadb.writer.tus.storage import BlobStore, FileStorageManager
@@ -104,6 +106,17 @@ class AzureFileStorageManager(FileStorageManager):
         await dm.finish()
         return path
 
+    async def concat(self, dm: FileDataManager, path: str, kbid: str, parts: list[str]) -> None:
+        # Append blobs can't be composed server side, so parts are streamed into
+        # the final blob one after the other
+        await self.start(dm, path=path, kbid=kbid)
+        bucket = self.storage.get_bucket_name(kbid)
+        for part in parts:
+            await self.object_store.upload_multipart_append(
+                bucket, path, self.object_store.download_stream(bucket, part)
+            )
+        await asyncio.gather(*(self.delete_upload(part, kbid) for part in parts))
+
     def validate_intermediate_chunk(self, uploaded_bytes: int):
         if uploaded_bytes < self.min_upload_size:
             raise ValueError(f"Intermediate chunks cannot be smaller than {self.min_upload_size} bytes")
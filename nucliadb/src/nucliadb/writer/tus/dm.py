@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import random
 import time
 from typing import Any
 
@@ -25,9 +26,10 @@ import orjson
 from redis import asyncio as aioredis
 from starlette.requests import Request
 
+from nucliadb.common import datamanagers
 from nucliadb.writer import logger
 
-from .exceptions import HTTPPreconditionFailed
+from .exceptions import HTTPConflict, HTTPPreconditionFailed
 
 
 class NoRedisConfigured(Exception):
@@ -87,6 +89,15 @@ class FileDataManager:
         assert self._data is not None
         self._data.update(kwargs)
 
+    async def reserve(self, offset: int):
+        """
+        Reserve the upload at `offset` before appending data to it. Released by
+        the next save or by `release`.
+        """
+
+    async def release(self, offset: int):
+        pass
+
     async def finish(self, values=None):
         await self._delete_key()
 
@@ -187,3 +198,104 @@ class RedisFileDataManager(FileDataManager):
             raise Exception("Not initialized")
         # and clear the cache key
         await self.redis.delete(self.key)
+
+
+class PGFileDataManager(FileDataManager):
+    """
+    Stores the upload state in the maindb `tus_uploads` table, so it's shared by
+    all writer replicas. An append reserves the offset before writing its data, so
+    two concurrent appends to the same upload can't both write to storage, and
+    saves with a changed offset are a compare-and-swap on the offset loaded.
+    """
+
+    _reservation_ttl = 60 * 5
+
+    def __init__(self):
+        # Offset stored in the table when loaded or last saved, None if there is no row
+        self._stored_offset: int | None = None
+
+    async def load(self, key):
+        # preload data
+        self.key = key
+        if self._data is None:
+            async with datamanagers.with_ro_transaction() as txn:
+                row = await datamanagers.tus_uploads.get(txn, upload_id=key, now=time.time())
+            if row is None:
+                self._data = {}
+            else:
+                self._stored_offset, self._data = row
+                self._data["offset"] = self._stored_offset
+                self._loaded = True
+
+    async def save(self):
+        if self.key is None:
+            raise Exception("Not initialized")
+        assert self._data is not None
+        self._data["last_activity"] = time.time()
+        offset = self.offset
+        expires_at = time.time() + self._ttl
+        async with datamanagers.with_rw_transaction() as txn:
+            if self._stored_offset is None:
+                await datamanagers.tus_uploads.set(
+                    txn, upload_id=self.key, offset=offset, data=self._data, expires_at=expires_at
+                )
+            else:
+                updated = await datamanagers.tus_uploads.update(
+                    txn,
+                    upload_id=self.key,
+                    expected_offset=self._stored_offset,
+                    offset=offset,
+                    data=self._data,
+                    expires_at=expires_at,
+                )
+                if not updated:
+                    raise HTTPConflict(
+                        detail="The upload has been modified concurrently by another request"
+                    )
+            await txn.commit()
+        self._stored_offset = offset
+        await self._maybe_cleanup_expired()
+
+    async def reserve(self, offset: int):
+        if self.key is None:
+            raise Exception("Not initialized")
+        now = time.time()
+        async with datamanagers.with_rw_transaction() as txn:
+            reserved = await datamanagers.tus_uploads.reserve(
+                txn, upload_id=self.key, offset=offset, now=now, until=now + self._reservation_ttl
+            )
+            await txn.commit()
+        if not reserved:
+            raise HTTPConflict(detail="The upload is being modified concurrently by another request")
+
+    async def release(self, offset: int):
+        if self.key is None:
+            raise Exception("Not initialized")
+        async with datamanagers.with_rw_transaction() as txn:
+            await datamanagers.tus_uploads.release(txn, upload_id=self.key, offset=offset)
+            await txn.commit()
+
+    async def start(self, request):
+        await super().start(request)
+        # Restarting an upload overwrites whatever is stored for it
+        self._stored_offset = None
+
+    async def _delete_key(self):
+        if self.key is None:
+            raise Exception("Not initialized")
+        async with datamanagers.with_rw_transaction() as txn:
+            await datamanagers.tus_uploads.delete(txn, upload_id=self.key)
+            await txn.commit()
+        self._stored_offset = None
+
+    async def _maybe_cleanup_expired(self):
+        # Probabilistically clean up expired uploads (1% chance) to distribute
+        # the cleanup load without adding overhead to every save
+        if random.random() >= 0.01:
+            return
+        try:
+            async with datamanagers.with_rw_transaction() as txn:
+                await datamanagers.tus_uploads.delete_expired(txn, now=time.time())
+                await txn.commit()
+        except Exception:
+            logger.warning("Failed to cleanup expired TUS uploads", exc_info=True)
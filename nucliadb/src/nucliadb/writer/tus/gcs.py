@@ -58,6 +58,8 @@ class GoogleCloudException(Exception):
 
 SCOPES = ["https://www.googleapis.com/auth/devstorage.read_write"]
 MAX_RETRIES = 5
+# Maximum number of source objects GCS accepts in a single compose request
+MAX_COMPOSE_SOURCES = 32
 
 
 RETRIABLE_EXCEPTIONS = (
@@ -373,6 +375,61 @@ class GCloudFileStorageManager(FileStorageManager):
         await dm.finish()
         return path
 
+    async def concat(self, dm: FileDataManager, path: str, kbid: str, parts: list[str]) -> None:
+        bucket = self.storage.get_bucket_name(kbid)
+        # Compose can take a limited number of sources, so bigger uploads are composed
+        # in rounds through intermediate objects
+        sources = parts
+        intermediates: list[str] = []
+        while len(sources) > MAX_COMPOSE_SOURCES:
+            groups = [
+                sources[i : i + MAX_COMPOSE_SOURCES] for i in range(0, len(sources), MAX_COMPOSE_SOURCES)
+            ]
+            names = [f"{path}.compose-{len(intermediates) + idx}" for idx in range(len(groups))]
+            await asyncio.gather(
+                *(self._compose(bucket, group, name) for group, name in zip(groups, names))
+            )
+            intermediates.extend(names)
+            sources = names
+
+        if dm.filename == 0:
+            filename = "file"
+        else:
+            filename = dm.filename
+        destination = {
+            "contentType": dm.content_type or "application/octet-stream",
+            "metadata": {
+                "FILENAME": filename,
+                "CONTENT_TYPE": dm.content_type,
+                "SIZE": str(dm.size),
+            },
+        }
+        await self._compose(bucket, sources, path, destination=destination)
+        await dm.update(path=path)
+        await asyncio.gather(*(self.delete_upload(name, kbid) for name in parts + intermediates))
+
+    @backoff.on_exception(backoff.expo, RETRIABLE_EXCEPTIONS, jitter=backoff.random_jitter, max_tries=4)
+    async def _compose(
+        self, bucket: str, sources: list[str], name: str, destination: dict | None = None
+    ) -> None:
+        url = "{}/{}/o/{}/compose".format(
+            self.storage.object_base_url,
+            bucket,
+            quote_plus(name),
+        )
+        headers = await self.storage.get_access_headers()
+        async with self.storage.session.post(
+            url,
+            headers=headers,
+            json={
+                "sourceObjects": [{"name": source} for source in sources],
+                "destination": destination or {},
+            },
+        ) as call:
+            if call.status != 200:
+                text = await call.text()
+                raise GoogleCloudException(f"{call.status}: {text}")
+
     def validate_intermediate_chunk(self, uploaded_bytes: int):
         if uploaded_bytes < self.min_upload_size:
             raise ValueError(f"Intermediate chunks cannot be smaller than {self.min_upload_size} bytes")
@@ -114,6 +114,29 @@ class LocalFileStorageManager(FileStorageManager):
         await dm.finish()
         return path
 
+    async def concat(self, dm: FileDataManager, path: str, kbid: str, parts: list[str]) -> None:
+        bucket = self.storage.get_bucket_name(kbid)
+        to_url = self.get_file_path(bucket, path)
+        os.makedirs(os.path.dirname(to_url), exist_ok=True)
+        async with aiofiles.open(to_url, "wb") as aio_fo:
+            for part in parts:
+                async with aiofiles.open(self.get_file_path(bucket, part), "rb") as aio_fi:
+                    while chunk := await aio_fi.read(self.chunk_size):
+                        await aio_fo.write(chunk)
+
+        metadata = {
+            "FILENAME": dm.filename,
+            "CONTENT_TYPE": dm.content_type,
+            "SIZE": dm.size,
+        }
+        await self.set_metadata(kbid, path, metadata)
+        await dm.update(path=path, bucket=bucket, kbid=kbid)
+
+        for part in parts:
+            part_url = self.get_file_path(bucket, part)
+            os.remove(part_url)
+            os.remove(self.metadata_key(part_url))
+
     async def delete_upload(self, uri: str, kbid: str):
         bucket = self.storage.get_bucket_name(kbid)
         file_path = self.get_file_path(bucket, uri)
@@ -19,6 +19,7 @@
 #
 from __future__ import annotations
 
+import asyncio
 import base64
 import uuid
 from contextlib import AsyncExitStack
@@ -144,6 +145,38 @@ class S3FileStorageManager(FileStorageManager):
             MultipartUpload=dm.get("multipart"),
         )
 
+    async def concat(self, dm: FileDataManager, path: str, kbid: str, parts: list[str]) -> None:
+        # Copy each part server side as a part of a new multipart upload
+        await self.start(dm, path=path, kbid=kbid)
+        etags = await asyncio.gather(
+            *(
+                self._upload_part_copy(dm, part_number, part)
+                for part_number, part in enumerate(parts, start=1)
+            )
+        )
+        await dm.update(
+            multipart={
+                "Parts": [
+                    {"PartNumber": part_number, "ETag": etag}
+                    for part_number, etag in enumerate(etags, start=1)
+                ]
+            },
+            block=len(parts) + 1,
+        )
+        await self._complete_multipart_upload(dm)
+        await asyncio.gather(*(self.delete_upload(part, kbid) for part in parts))
+
+    @backoff.on_exception(backoff.expo, RETRIABLE_EXCEPTIONS, jitter=backoff.random_jitter, max_tries=3)
+    async def _upload_part_copy(self, dm: FileDataManager, part_number: int, source: str) -> str:
+        response = await self.storage._s3aioclient.upload_part_copy(
+            Bucket=dm.get("bucket"),
+            Key=dm.get("path"),
+            PartNumber=part_number,
+            UploadId=dm.get("mpu")["UploadId"],
+            CopySource={"Bucket": dm.get("bucket"), "Key": source},
+        )
+        return response["CopyPartResult"]["ETag"]
+
     @backoff.on_exception(backoff.expo, RETRIABLE_EXCEPTIONS, jitter=backoff.random_jitter, max_tries=3)
     async def _download(self, uri: str, kbid: str, **kwargs):
         bucket = self.storage.get_bucket_name(kbid)
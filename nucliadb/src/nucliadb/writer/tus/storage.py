@@ -66,6 +66,13 @@ class FileStorageManager:
     async def finish(self, dm: FileDataManager):
         raise NotImplementedError()
 
+    async def concat(self, dm: FileDataManager, path: str, kbid: str, parts: list[str]) -> None:
+        """
+        Store at `path` the concatenation, in order, of the objects of some finished
+        partial uploads and delete them afterwards.
+        """
+        raise NotImplementedError()
+
     async def delete_upload(self, uri, kbid):
         raise NotImplementedError()
 
@@ -71,3 +71,19 @@ def parse_tus_metadata(header: str) -> dict[str, str]:
 
         metadata[key] = value
     return metadata
+
+
+def parse_upload_concat_final(header: str) -> list[str]:
+    """
+    https://tus.io/protocols/resumable-upload#concatenation
+
+    Return the upload ids of the partial uploads referenced by a final
+    `Upload-Concat` header, in order.
+    """
+    kind, _, urls = header.partition(";")
+    if kind.strip() != "final":
+        raise InvalidTUSMetadata(f"Unknown Upload-Concat value: {kind}")
+    upload_ids = [url.rstrip("/").rsplit("/", 1)[-1] for url in urls.split()]
+    if not upload_ids or not all(upload_ids):
+        raise InvalidTUSMetadata("Final Upload-Concat must reference at least one partial upload")
+    return upload_ids
@@ -25,7 +25,7 @@ from nidx_protos import noderesources_pb2
 from nucliadb.common.cluster.settings import settings as cluster_settings
 from nucliadb.ingest.orm.exceptions import ResourceNotIndexable
 from nucliadb.ingest.orm.processor import Processor
-from nucliadb.ingest.orm.processor.processor import validate_indexable_resource
+from nucliadb.ingest.orm.processor.processor import get_paragraph_counts, validate_indexable_resource
 
 
 @pytest.fixture()
@@ -102,3 +102,19 @@ def test_validate_indexable_resource_throws_error_for_max():
         resource.paragraphs["test"].paragraphs[f"test{i}"].sentences["test"].vector.append(1.0)
     with pytest.raises(ResourceNotIndexable):
         validate_indexable_resource(resource)
+
+
+def test_get_paragraph_counts():
+    index_message = noderesources_pb2.Resource()
+    for field_key, n in [("t/text", 2), ("c/replaced", 3), ("c/appended", 1)]:
+        for i in range(n):
+            index_message.paragraphs[field_key].paragraphs[f"rid/{field_key}/{i}-{i + 1}"].CopyFrom(
+                noderesources_pb2.IndexParagraph()
+            )
+    index_message.paragraphs_to_delete.extend(["rid/t/text", "rid/c/replaced", "rid/f/deleted"])
+
+    counts, appended, deleted = get_paragraph_counts(index_message)
+    assert counts == {"t/text": 2, "c/replaced": 3}
+    # Conversation appends only carry the paragraphs of the new splits
+    assert appended == {"c/appended": 1}
+    assert deleted == ["t/text", "c/replaced", "f/deleted"]
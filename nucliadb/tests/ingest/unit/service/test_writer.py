@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
@@ -28,7 +29,7 @@ from nucliadb.ingest.orm.exceptions import KnowledgeBoxConflict
 from nucliadb.ingest.service.writer import WriterServicer
 from nucliadb_protos import writer_pb2
 from nucliadb_protos.knowledgebox_pb2 import SemanticModelMetadata, StoredExternalIndexProviderMetadata
-from nucliadb_protos.resources_pb2 import FieldText
+from nucliadb_protos.resources_pb2 import Basic, FieldText
 from nucliadb_protos.utils_pb2 import VectorSimilarity
 from nucliadb_utils.utilities import Utility, clean_utility, set_utility
 
@@ -467,6 +468,47 @@ class TestWriterServicer:
             assert resp.status == writer_pb2.RestoreBackupResponse.Status.NOT_FOUND
             nats_manager.js.publish.assert_not_called()
 
+    async def test_ProcessMessages(self, writer: WriterServicer):
+        messages = [
+            writer_pb2.BrokerMessage(kbid="kbid", uuid="r1", basic=Basic(title="first")),
+            writer_pb2.BrokerMessage(kbid="kbid", uuid="r2"),
+            writer_pb2.BrokerMessage(kbid="kbid", uuid="r1", basic=Basic(title="second")),
+            writer_pb2.BrokerMessage(kbid="kbid", uuid="r3"),
+            writer_pb2.BrokerMessage(kbid="kbid", uuid="r3", basic=Basic(title="after error")),
+        ]
+        r2_processed = asyncio.Event()
+        processed = []
+
+        async def process(message, seqid, partition, transaction_check):
+            if message.uuid == "r1" and message.basic.title == "first":
+                # r2 can only be processed if it does not wait for r1
+                await r2_processed.wait()
+            if message.uuid == "r3":
+                raise Exception("boom")
+            processed.append((message.uuid, message.basic.title))
+            if message.uuid == "r2":
+                r2_processed.set()
+
+        writer.proc.process.side_effect = process
+
+        async def request_iterator():
+            for message in messages:
+                yield message
+
+        statuses = [status async for status in writer.ProcessMessages(request_iterator())]
+
+        # Messages after a failed one for the same resource are not processed
+        assert processed == [("r2", ""), ("r1", "first"), ("r1", "second")]
+        assert writer.proc.process.await_count == 4
+        assert sorted(status.index for status in statuses) == [0, 1, 2, 3, 4]
+        by_index = {status.index: status for status in statuses}
+        assert by_index[0].uuid == "r1"
+        for index in (3, 4):
+            assert by_index[index].uuid == "r3"
+            assert by_index[index].status == writer_pb2.OpStatusWriter.Status.ERROR
+        for index in (0, 1, 2):
+            assert by_index[index].status == writer_pb2.OpStatusWriter.Status.OK
+
     async def test_DeleteBackup_ok(self, writer: WriterServicer, nats_manager):
         with patch(f"{WRITER_MODULE}.backup_utils.exists_backup", return_value=True):
             request = writer_pb2.DeleteBackupRequest(backup_id="backup_id")
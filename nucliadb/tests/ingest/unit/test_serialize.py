@@ -0,0 +1,48 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+from unittest.mock import AsyncMock, Mock
+
+from nucliadb.ingest.serialize import serialize_resource
+from nucliadb_models.common import FieldTypeName
+from nucliadb_models.search import ResourceProperties
+from nucliadb_protos.resources_pb2 import FieldText, FieldType
+
+
+async def test_serialize_resource_with_fields():
+    fields = {}
+    for i in range(5):
+        field = Mock(id=f"text{i}")
+        field.get_value = AsyncMock(return_value=FieldText(body=f"body {i}"))
+        fields[(FieldType.TEXT, field.id)] = field
+    orm_resource = Mock(uuid="rid", fields=fields)
+    orm_resource.get_fields = AsyncMock(return_value=fields)
+
+    resource = await serialize_resource(
+        orm_resource,
+        [ResourceProperties.VALUES],
+        [FieldTypeName.TEXT],
+        [],
+        max_parallel_field_serializations=2,
+    )
+
+    assert resource.data is not None
+    assert resource.data.texts is not None
+    bodies = {field_id: text.value.body for field_id, text in resource.data.texts.items()}  # type: ignore[union-attr]
+    assert bodies == {f"text{i}": f"body {i}" for i in range(5)}
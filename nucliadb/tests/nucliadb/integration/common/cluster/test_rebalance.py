@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -27,13 +28,16 @@ from nucliadb.common.cluster import rebalance
 from nucliadb.common.cluster.rebalance import (
     RebalanceShard,
     count_resources_in_shard,
+    fill_capacity,
     get_resources_from_shard,
+    get_resources_to_move,
     needs_merge,
 )
 from nucliadb.common.cluster.settings import settings
 from nucliadb.common.cluster.utils import get_shard_manager
 from nucliadb.common.context import ApplicationContext
 from nucliadb.common.maindb.driver import Driver
+from nucliadb.common.maindb.pg import PGTransaction
 from nucliadb_protos import writer_pb2
 from tests.utils.dirty_index import mark_dirty, wait_for_sync
 
@@ -240,6 +244,74 @@ async def test_build_shard_resources_index(
     assert set(resources_batch) == set(rids)
 
 
+@pytest.mark.deploy_modes("standalone")
+async def test_get_resources_to_move_uses_stored_paragraph_counts(
+    app_context,
+    standalone_knowledgebox,
+    nucliadb_writer: AsyncClient,
+):
+    kbid = standalone_knowledgebox
+
+    rids = []
+    for i in range(0, 10):
+        rids.append(await create_resource_with_paragraph(nucliadb_writer, kbid, i))
+
+    shard_id = (await get_kb_shards(kbid)).shards[0].shard
+
+    # Each resource has a single paragraph (its title) and the count is known
+    # from indexing time
+    candidates = await get_resources_to_move(app_context.kv_driver, kbid, shard_id, n=100)
+    assert len(candidates) == 10
+    assert {paragraphs for _, paragraphs in candidates} == {1}
+    assert [rid for rid, _ in candidates] == sorted(rids)
+
+    chosen = await fill_capacity(candidates, "nidx-shard", capacity=4)
+    assert chosen == candidates[:4]
+
+    candidates = await get_resources_to_move(app_context.kv_driver, kbid, shard_id, n=3)
+    assert [rid for rid, _ in candidates] == sorted(rids)[:3]
+    candidates = await get_resources_to_move(
+        app_context.kv_driver, kbid, shard_id, n=100, after=candidates[-1][0]
+    )
+    assert [rid for rid, _ in candidates] == sorted(rids)[3:]
+
+
+@pytest.mark.deploy_modes("standalone")
+async def test_fill_capacity_counts_unknown_paragraphs_lazily(
+    app_context,
+    standalone_knowledgebox,
+    nucliadb_writer: AsyncClient,
+):
+    kbid = standalone_knowledgebox
+
+    for i in range(0, 30):
+        await create_resource_with_paragraph(nucliadb_writer, kbid, i)
+
+    shard_id = (await get_kb_shards(kbid)).shards[0].shard
+
+    # Resources not indexed since paragraph counts are stored have no count
+    async with app_context.kv_driver.rw_transaction() as txn:
+        async with cast(PGTransaction, txn).connection.cursor() as cur:
+            await cur.execute(
+                "UPDATE kb_resources SET paragraphs = NULL WHERE kbid = %(kbid)s",
+                {"kbid": kbid},
+            )
+        await txn.commit()
+
+    candidates = await get_resources_to_move(app_context.kv_driver, kbid, shard_id, n=100)
+    assert len(candidates) == 30
+    assert {paragraphs for _, paragraphs in candidates} == {None}
+
+    # Only the candidates needed to fill the capacity are counted in nidx
+    with (
+        patch.object(settings, "rebalance_max_concurrent_moves", 5),
+        patch.object(rebalance, "get_resource_paragraphs_count", return_value=1) as count,
+    ):
+        chosen = await fill_capacity(candidates, "nidx-shard", capacity=7)
+    assert chosen == [(rid, 1) for rid, _ in candidates[:7]]
+    assert count.await_count == 10
+
+
 async def build_shard_resources_index(driver: Driver, kbid: str) -> dict[str, int]:
     shards = await get_kb_shards(kbid)
     result = {}
@@ -17,12 +17,13 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
-from typing import AsyncIterator
+from typing import AsyncIterator, cast
 
 import pytest
 
 from nucliadb.common import datamanagers
 from nucliadb.common.maindb.driver import Driver
+from nucliadb.common.maindb.pg import PGTransaction
 from nucliadb.common.models_utils import from_proto
 from nucliadb.ingest.orm.knowledgebox import KnowledgeBox
 from nucliadb.ingest.orm.resource import Resource
@@ -127,3 +128,58 @@ async def test_all_fields(maindb_driver: Driver, resource_with_slug: tuple[str,
         assert len(all_fields.fields) == 0
 
         assert (await datamanagers.fields.exists(txn, kbid=kbid, rid=rid, field_id=field)) is False
+
+
+async def test_exists_many(maindb_driver: Driver, resource_with_slug: tuple[str, str, str]):
+    kbid, rid, _ = resource_with_slug
+    unexisting = Resource.new_unique_rid()
+
+    async with maindb_driver.ro_transaction() as txn:
+        existing = await datamanagers.resources.exists_many(
+            txn,
+            resources=[
+                (kbid, rid),
+                (kbid, unexisting),
+                (KnowledgeBox.new_unique_kbid(), rid),
+                (kbid, "not-a-uuid"),
+            ],
+        )
+        assert existing == {(kbid, rid)}
+
+        assert await datamanagers.resources.exists_many(txn, resources=[]) == set()
+
+
+async def test_update_paragraph_counts(maindb_driver: Driver, resource_with_slug: tuple[str, str, str]):
+    kbid, rid, _ = resource_with_slug
+
+    async def get_counts() -> dict[str, int]:
+        async with maindb_driver.rw_transaction() as txn:
+            async with cast(PGTransaction, txn).connection.cursor() as cur:
+                await cur.execute(
+                    "SELECT paragraphs FROM kb_resources WHERE kbid = %(kbid)s AND rid = %(rid)s",
+                    {"kbid": kbid, "rid": rid},
+                )
+                row = await cur.fetchone()
+                return row[0]
+
+    async with maindb_driver.rw_transaction() as txn:
+        await datamanagers.resources.update_paragraph_counts(
+            txn, kbid=kbid, rid=rid, counts={"t/text": 3, "c/chat": 2}, deleted=[]
+        )
+        await txn.commit()
+    assert await get_counts() == {"t/text": 3, "c/chat": 2}
+
+    # Appended paragraphs are added to the stored count
+    async with maindb_driver.rw_transaction() as txn:
+        await datamanagers.resources.update_paragraph_counts(
+            txn, kbid=kbid, rid=rid, counts={}, appended={"c/chat": 4, "c/other": 1}, deleted=[]
+        )
+        await txn.commit()
+    assert await get_counts() == {"t/text": 3, "c/chat": 6, "c/other": 1}
+
+    async with maindb_driver.rw_transaction() as txn:
+        await datamanagers.resources.update_paragraph_counts(
+            txn, kbid=kbid, rid=rid, counts={"c/chat": 1}, deleted=["c/chat", "t/text"]
+        )
+        await txn.commit()
+    assert await get_counts() == {"c/chat": 1, "c/other": 1}
@@ -47,6 +47,7 @@ from nucliadb.purge import (
 )
 from nucliadb.purge.orphan_shards import detect_orphan_shards, purge_orphan_shards
 from nucliadb_protos import utils_pb2, writer_pb2
+from nucliadb_utils.storages.exceptions import CouldNotDeleteObjects
 from nucliadb_utils.storages.storage import Storage
 from tests.utils.dirty_index import wait_for_sync
 
@@ -289,10 +290,27 @@ async def test_purge_resources_deleted_storage(
 
     to_purge = await _count_resources_storage_to_purge(maindb_driver)
     assert to_purge == 10
-    purged = await _purge_resources_storage_batch(maindb_driver, storage, batch_size=5)
+
+    # Resources whose storage can't be deleted are kept to be purged later
+    error = CouldNotDeleteObjects("bucket", ["key"])
+    with unittest.mock.patch.object(storage, "delete_resource", side_effect=error):
+        purged, last_key = await _purge_resources_storage_batch(maindb_driver, storage, batch_size=5)
+    assert purged == 0
+    assert await _count_resources_storage_to_purge(maindb_driver) == 10
+
+    # and they don't block purging the ones after them
+    purged, last_key = await _purge_resources_storage_batch(
+        maindb_driver, storage, batch_size=10, after=last_key
+    )
     assert purged == 5
-    purged = await _purge_resources_storage_batch(maindb_driver, storage, batch_size=10)
+    assert await _count_resources_storage_to_purge(maindb_driver) == 5
+
+    purged, last_key = await _purge_resources_storage_batch(maindb_driver, storage, batch_size=10)
     assert purged == 5
+    purged, last_key = await _purge_resources_storage_batch(
+        maindb_driver, storage, batch_size=10, after=last_key
+    )
+    assert (purged, last_key) == (0, None)
 
     # Check task cancellation
     task = asyncio.create_task(purge_deleted_resource_storage(maindb_driver, storage))
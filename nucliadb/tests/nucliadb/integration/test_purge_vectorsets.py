@@ -81,6 +81,49 @@ async def test_purge_vectorsets__kb_with_vectorsets(
         assert storage_key.endswith(f"/{vectorset_id}/extracted_vectors")
 
 
+@pytest.mark.deploy_modes("standalone")
+async def test_purge_vectorsets__resumes_from_checkpoint(
+    maindb_driver: Driver,
+    storage: Storage,
+    nucliadb_ingest_grpc: WriterStub,
+    knowledgebox_with_vectorsets: str,
+):
+    kbid = knowledgebox_with_vectorsets
+    vectorset_id = "my-semantic-model-A"
+
+    rids = []
+    for i in range(5):
+        bm = await create_broker_message_with_vectorset(kbid, maindb_driver)
+        await inject_message(nucliadb_ingest_grpc, bm)
+        rids.append(bm.uuid)
+    rids.sort()
+
+    async with maindb_driver.rw_transaction() as txn:
+        kb_obj = KnowledgeBox(txn, storage, kbid)
+        await kb_obj.delete_vectorset(vectorset_id)
+        await txn.commit()
+
+    # Simulate a previous purge that was interrupted after purging 2 resources
+    key = KB_VECTORSET_TO_DELETE.format(kbid=kbid, vectorset=vectorset_id)
+    async with maindb_driver.rw_transaction() as txn:
+        purge_payload = VectorSetPurge()
+        purge_payload.ParseFromString(await txn.get(key))  # type: ignore
+        purge_payload.last_purged_rid = rids[1]
+        await txn.set(key, purge_payload.SerializeToString())
+        await txn.commit()
+
+    with patch.object(
+        storage, "delete_upload", new=AsyncMock(side_effect=storage.delete_upload)
+    ) as mock:
+        await purge_kb_vectorsets(maindb_driver, storage)
+
+        async with maindb_driver.ro_transaction() as txn:
+            assert await txn.get(key) is None
+
+        purged_rids = {call.args[0].split("/")[3] for call in mock.await_args_list}
+        assert purged_rids == set(rids[2:])
+
+
 async def create_broker_message_with_vectorset(
     kbid: str,
     driver: Driver,
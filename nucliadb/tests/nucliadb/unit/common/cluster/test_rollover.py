@@ -61,6 +61,8 @@ def resources_datamanager(resource_ids):
     mock.iter = iter
     mock.get_shard = AsyncMock()
     mock.get_shard.return_value = "1"
+    mock.get_shards = AsyncMock()
+    mock.get_shards.return_value = {"1": "1"}
 
     with (
         patch("nucliadb.common.cluster.rollover.datamanagers.resources", mock),
@@ -112,7 +114,7 @@ def rollover_datamanager(resource_ids, kb_datamanager):
     mock.update_kb_rollover_shards = AsyncMock()
     mock.delete_kb_rollover_shard = AsyncMock()
     mock.delete_kb_rollover_shards = AsyncMock()
-    mock.get_to_index = AsyncMock(side_effect=["1", None])
+    mock.get_to_index = AsyncMock(side_effect=[["1"], None])
     mock.add_indexed = AsyncMock()
     mock.remove_to_index = AsyncMock()
     mock.get_indexed_data = AsyncMock(return_value=("1", 1))
@@ -225,6 +227,34 @@ async def test_index_to_rollover_index(
     )
 
 
+async def test_index_to_rollover_index_pages_resources(
+    app_context,
+    rollover_datamanager,
+    resources_datamanager,
+    shards,
+    get_resource_index_message,
+):
+    rollover_datamanager.get_kb_rollover_shards.return_value = shards
+    rollover_datamanager.get_rollover_state.return_value = RolloverState(
+        rollover_shards_created=True,
+        resources_scheduled=True,
+    )
+    rollover_datamanager.get_to_index.side_effect = [["1", "2"], ["3"], None]
+    resources_datamanager.get_shards.side_effect = [{"1": "1", "2": "2"}, {"3": "1"}]
+
+    await rollover.index_to_rollover_index(app_context, "kbid")
+
+    assert [call.kwargs["after"] for call in rollover_datamanager.get_to_index.call_args_list] == [
+        None,
+        "2",
+        "3",
+    ]
+    assert rollover_datamanager.add_indexed.call_count == 3
+    rollover_datamanager.add_indexed.assert_any_call(
+        ANY, kbid="kbid", resource_id="2", shard_id="2", modification_time=ANY
+    )
+
+
 async def test_index_to_rollover_index_handles_missing_shards(
     app_context, rollover_datamanager, resources_datamanager, shards, resource_ids
 ):
@@ -241,9 +271,12 @@ async def test_index_to_rollover_index_handles_missing_shard_id(
         rollover_shards_created=True,
         resources_scheduled=True,
     )
-    resources_datamanager.get_shard.return_value = None
+    resources_datamanager.get_shards.return_value = {}
     await rollover.index_to_rollover_index(app_context, "kbid")
 
+    rollover_datamanager.remove_to_index.assert_called_with(ANY, kbid="kbid", resource="1")
+    rollover_datamanager.add_indexed.assert_not_called()
+
 
 async def test_index_to_rollover_index_handles_missing_res(
     app_context, rollover_datamanager, resources_datamanager, shards, resource_ids, get_resource
@@ -122,6 +122,15 @@ def test_vector_ids():
     assert vector_id.vector_end == 20
 
 
+def test_parsed_ids_are_not_shared():
+    # Field id parsing is cached, but ids are mutable
+    first = ParagraphId.from_string("rid/u/field_id/0-10")
+    first.field_id.subfield_id = "subfield_id"
+    second = ParagraphId.from_string("rid/u/field_id/10-20")
+    assert second.field_id.subfield_id is None
+    assert FieldId.from_string("rid/u/field_id") is not FieldId.from_string("rid/u/field_id")
+
+
 @pytest.mark.parametrize(
     "task_id,field_type,field_id,split",
     [
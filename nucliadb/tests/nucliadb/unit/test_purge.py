@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -113,6 +114,22 @@ async def test_purge_kb_storage_handle_errors(keys, driver, storage):
     await purge.purge_kbs_storage(driver, storage)
 
 
+async def test_purge_expired_partial_uploads(keys, txn, driver, storage):
+    keys.append("/tuspartstodelete/kbid/expired")
+    keys.append("/tuspartstodelete/kbid/recent")
+    created_at = {
+        "/tuspartstodelete/kbid/expired": str(time.time() - purge.TUS_PARTIAL_UPLOAD_EXPIRATION - 1),
+        "/tuspartstodelete/kbid/recent": str(time.time()),
+    }
+    txn.get.side_effect = lambda key: created_at[key].encode()
+    storage.get_bucket_name = MagicMock(return_value="bucket")
+
+    await purge.purge_expired_partial_uploads(driver, storage)
+
+    storage.delete_upload.assert_awaited_once_with("kbs/kbid/tusparts/expired", "bucket")
+    txn.delete.assert_awaited_once_with("/tuspartstodelete/kbid/expired")
+
+
 async def test_main(driver, storage, dummy_nidx_utility):
     with (
         patch("nucliadb.purge.purge_kbs", AsyncMock()) as purge_kbs,
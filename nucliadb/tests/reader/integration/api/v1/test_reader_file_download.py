@@ -18,13 +18,20 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from unittest.mock import patch
+
 import pytest
 from httpx import AsyncClient
 
 from nucliadb.ingest.orm.resource import Resource
-from nucliadb.reader.api.v1.download import parse_media_range, safe_http_header_encode
+from nucliadb.reader.api.v1.download import (
+    MAX_MULTIPART_RANGES,
+    parse_media_ranges,
+    safe_http_header_encode,
+)
 from nucliadb.reader.api.v1.router import KB_PREFIX, RESOURCE_PREFIX, RSLUG_PREFIX
 from nucliadb_protos.resources_pb2 import FieldType
+from nucliadb_utils.settings import storage_settings
 from tests.ndbfixtures.ingest import INGEST_TESTS_DIR, TEST_CLOUDFILE, THUMBNAIL
 
 
@@ -75,10 +82,36 @@ async def test_resource_download_field_file(
     assert resp.status_code == 416
     assert resp.json()["detail"]["reason"] == "rangeNotParsable"
 
-    # Check that multipart ranges not implemented is handled
+    # Multipart ranges
+    filename = f"{INGEST_TESTS_DIR}/{TEST_CLOUDFILE.bucket_name}/{TEST_CLOUDFILE.uri}"
+    content = open(filename, "rb").read()
+    size = len(content)
+    resp = await nucliadb_reader.get(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/file/{field_id}/download/field",
+    )
+    part_content_type = resp.headers["Content-Type"]
+    resp = await nucliadb_reader.get(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/file/{field_id}/download/field",
+        headers={"range": "bytes=0-3, 8-20"},
+    )
+    assert resp.status_code == 206
+    content_type, _, boundary = resp.headers["Content-Type"].partition("; boundary=")
+    assert content_type == "multipart/byteranges"
+    assert int(resp.headers["Content-Length"]) == len(resp.content)
+    expected = b""
+    for start, end in ((0, 3), (8, 20)):
+        end = min(end, size - 1)
+        expected += (
+            f"--{boundary}\r\nContent-Type: {part_content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        expected += content[start : end + 1] + b"\r\n"
+    expected += f"--{boundary}--\r\n".encode()
+    assert resp.content == expected
+
     resp = await nucliadb_reader.get(
         f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/file/{field_id}/download/field",
-        headers={"range": "bytes=0-50, 100-150"},
+        headers={"range": "bytes=" + ", ".join(["0-1"] * (MAX_MULTIPART_RANGES + 1))},
     )
     assert resp.status_code == 416
     assert resp.json()["detail"]["reason"] == "rangeNotSupported"
@@ -90,10 +123,36 @@ async def test_resource_download_field_file(
     assert resp.status_code == 206
     assert resp.headers["Content-Disposition"]
 
-    filename = f"{INGEST_TESTS_DIR}/{TEST_CLOUDFILE.bucket_name}/{TEST_CLOUDFILE.uri}"
-
     open(filename, "rb").read() == resp.content
 
+    # Conditional requests
+    resp = await nucliadb_reader.get(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/file/{field_id}/download/field",
+    )
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    last_modified = resp.headers["Last-Modified"]
+
+    resp = await nucliadb_reader.get(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/file/{field_id}/download/field",
+        headers={"If-None-Match": etag},
+    )
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    assert resp.content == b""
+
+    resp = await nucliadb_reader.get(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/file/{field_id}/download/field",
+        headers={"If-Modified-Since": last_modified},
+    )
+    assert resp.status_code == 304
+
+    resp = await nucliadb_reader.get(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/file/{field_id}/download/field",
+        headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified},
+    )
+    assert resp.status_code == 200
+
     resp = await nucliadb_reader.get(
         f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}?show=values",
     )
@@ -106,6 +165,34 @@ async def test_resource_download_field_file(
     )
 
 
+@pytest.mark.deploy_modes("component")
+async def test_resource_download_direct(
+    local_files,
+    nucliadb_reader: AsyncClient,
+    full_resource: Resource,
+) -> None:
+    kbid = full_resource.kbid
+    rid = full_resource.uuid
+    url = f"/{KB_PREFIX}/{kbid}/{RESOURCE_PREFIX}/{rid}/text/text1/download/extracted/thumbnail"
+    expected = open(f"{INGEST_TESTS_DIR}{THUMBNAIL.bucket_name}/{THUMBNAIL.uri}", "rb").read()
+
+    with patch.object(storage_settings, "direct_downloads", True):
+        resp = await nucliadb_reader.get(url, follow_redirects=False)
+        if resp.status_code == 307:
+            # Cloud backend able to sign URLs
+            assert resp.headers["Location"].startswith("http")
+            assert resp.headers["Cache-Control"] == "no-store"
+        else:
+            # Served from disk (local backend) or proxied (can't sign URLs)
+            assert resp.status_code == 200
+            assert resp.content == expected
+            assert resp.headers["Content-Disposition"].startswith("attachment")
+
+            resp = await nucliadb_reader.get(url, headers={"Range": "bytes=0-9"})
+            assert resp.status_code == 206
+            assert resp.content == expected[:10]
+
+
 @pytest.mark.deploy_modes("component")
 async def test_resource_download_field_conversation(
     local_files, nucliadb_reader: AsyncClient, test_resource: Resource
@@ -177,35 +264,36 @@ async def _get_message_with_file(test_resource):
 
 
 @pytest.mark.parametrize(
-    "range_request,filesize,start,end,range_size,exception",
+    "range_request,filesize,expected,exception",
     [
         # No end range specified
-        ("bytes=0-", 10, 0, 9, 10, None),
+        ("bytes=0-", 10, [(0, 9, 10)], None),
         # End range == file size
-        (f"bytes=0-10", 10, 0, 9, 10, None),
+        ("bytes=0-10", 10, [(0, 9, 10)], None),
         # End range < file size
-        (f"bytes=0-5", 10, 0, 5, 6, None),
+        ("bytes=0-5", 10, [(0, 5, 6)], None),
         # End range > file size
-        (f"bytes=0-11", 10, 0, 9, 10, None),
+        ("bytes=0-11", 10, [(0, 9, 10)], None),
         # Starting at a middle point until the end
-        (f"bytes=2-", 10, 2, 9, 8, None),
+        ("bytes=2-", 10, [(2, 9, 8)], None),
         # A slice of bytes in the middle of the file
-        (f"bytes=2-8", 10, 2, 8, 7, None),
-        # Invalid range
-        ("bytes=something", 10, None, None, None, ValueError),
-        # Multi-part ranges not supported yet
-        ("bytes=0-50, 100-150", 10, None, None, None, NotImplementedError),
+        ("bytes=2-8", 10, [(2, 8, 7)], None),
         # Only the first byte
-        ("bytes=0-0", 10, 0, 0, 1, None),
+        ("bytes=0-0", 10, [(0, 0, 1)], None),
+        # Invalid range
+        ("bytes=something", 10, None, ValueError),
+        ("bytes=0-1, 5-", 10, [(0, 1, 2), (5, 9, 5)], None),
+        ("bytes=0-1,3-4,8-20", 10, [(0, 1, 2), (3, 4, 2), (8, 9, 2)], None),
+        ("bytes=0-1, something", 10, None, ValueError),
+        ("bytes=0-1,", 10, None, ValueError),
     ],
 )
-def test_parse_media_range(range_request, filesize, start, end, range_size, exception):
+def test_parse_media_ranges(range_request, filesize, expected, exception):
     if not exception:
-        result = parse_media_range(range_request, filesize)
-        assert result == (start, end, range_size)
+        assert parse_media_ranges(range_request, filesize) == expected
     else:
         with pytest.raises(exception):
-            parse_media_range(range_request, filesize)
+            parse_media_ranges(range_request, filesize)
 
 
 @pytest.mark.deploy_modes("component")
@@ -354,3 +354,57 @@ async def test_head_resource(nucliadb_reader: AsyncClient, test_resource: Resour
         f"/kb/{kbid}/slug/non-existent-slug",
     )
     assert resp.status_code == 404
+
+
+@pytest.mark.deploy_modes("component")
+async def test_get_resource_conditional(nucliadb_reader: AsyncClient, test_resource: Resource):
+    kbid = test_resource.kbid
+    slug = test_resource.basic.slug  # type: ignore
+    ruuid = test_resource.uuid
+
+    resp = await nucliadb_reader.get(f"/kb/{kbid}/resource/{ruuid}")
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    assert etag.startswith('W/"')
+    last_modified = resp.headers["Last-Modified"]
+
+    # Same resource and params, same validator whatever the path
+    resp = await nucliadb_reader.get(f"/kb/{kbid}/slug/{slug}")
+    assert resp.headers["ETag"] == etag
+
+    resp = await nucliadb_reader.get(f"/kb/{kbid}/resource/{ruuid}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    assert resp.content == b""
+
+    resp = await nucliadb_reader.get(
+        f"/kb/{kbid}/slug/{slug}", headers={"If-None-Match": f'"other", {etag}'}
+    )
+    assert resp.status_code == 304
+
+    resp = await nucliadb_reader.get(
+        f"/kb/{kbid}/resource/{ruuid}", headers={"If-Modified-Since": last_modified}
+    )
+    assert resp.status_code == 304
+    assert resp.headers["Last-Modified"] == last_modified
+
+    resp = await nucliadb_reader.get(
+        f"/kb/{kbid}/resource/{ruuid}", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+    )
+    assert resp.status_code == 200
+
+    # A different representation of the resource does not match
+    resp = await nucliadb_reader.get(
+        f"/kb/{kbid}/resource/{ruuid}?show=values", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+    # Fields
+    resp = await nucliadb_reader.get(f"/kb/{kbid}/resource/{ruuid}/text/text1")
+    assert resp.status_code == 200
+    field_etag = resp.headers["ETag"]
+    resp = await nucliadb_reader.get(
+        f"/kb/{kbid}/resource/{ruuid}/text/text1", headers={"If-None-Match": field_etag}
+    )
+    assert resp.status_code == 304
@@ -0,0 +1,77 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from starlette.requests import Request
+
+from nucliadb.reader.api.conditional import (
+    etag_matches,
+    http_date,
+    is_not_modified,
+    not_modified_since,
+)
+
+
+def _request(headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "if_none_match,etag,matches",
+    [
+        ('"a"', '"a"', True),
+        ('"a"', '"b"', False),
+        ('W/"a"', '"a"', True),
+        ('"a"', 'W/"a"', True),
+        ('"b", W/"a"', 'W/"a"', True),
+        ("*", '"a"', True),
+    ],
+)
+def test_etag_matches(if_none_match, etag, matches):
+    assert etag_matches(if_none_match, etag) is matches
+
+
+def test_not_modified_since():
+    last_modified = datetime(2024, 1, 1, 10, 0, 0, 500, tzinfo=timezone.utc)
+    assert not_modified_since(http_date(last_modified), last_modified)
+    assert not_modified_since(http_date(last_modified + timedelta(hours=1)), last_modified)
+    assert not not_modified_since(http_date(last_modified - timedelta(hours=1)), last_modified)
+    assert not not_modified_since("not a date", last_modified)
+
+
+def test_is_not_modified():
+    last_modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    since = http_date(last_modified)
+
+    assert not is_not_modified(_request({}), etag='"a"', last_modified=last_modified)
+    assert is_not_modified(_request({"If-None-Match": '"a"'}), etag='"a"')
+    assert is_not_modified(_request({"If-Modified-Since": since}), last_modified=last_modified)
+    # If-None-Match takes precedence over If-Modified-Since
+    assert not is_not_modified(
+        _request({"If-None-Match": '"b"', "If-Modified-Since": since}),
+        etag='"a"',
+        last_modified=last_modified,
+    )
@@ -0,0 +1,114 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+import time
+from unittest import mock
+
+import pytest
+from nidx_protos.nodereader_pb2 import (
+    DocumentScored,
+    FacetResult,
+    FacetResults,
+    ParagraphResult,
+    ParagraphSearchResponse,
+    VectorSearchResponse,
+)
+
+from nucliadb.common.ids import ParagraphId, VectorId
+from nucliadb.search.search.merge import merge_paragraph_results, merge_vectors_results
+from nucliadb_models.search import SortField, SortOptions, SortOrder
+from nucliadb_utils.tests.asyncbenchmark import AsyncBenchmarkFixture
+
+RESULTS = 10_000
+# Results are usually spread over a few fields
+FIELDS = 100
+
+
+def paragraph_ids() -> list[str]:
+    return [f"rid{i % FIELDS:032}/f/file/{i * 100}-{i * 100 + 99}" for i in range(RESULTS)]
+
+
+def vector_ids() -> list[str]:
+    return [f"rid{i % FIELDS:032}/f/file/{i}/{i * 100}-{i * 100 + 99}" for i in range(RESULTS)]
+
+
+@pytest.fixture()
+def no_augment():
+    with mock.patch("nucliadb.search.search.merge.augment_paragraphs", return_value={}):
+        yield
+
+
+@pytest.mark.benchmark(group="merge", min_rounds=5, timer=time.perf_counter, warmup=True)
+def test_parse_paragraph_ids(benchmark) -> None:
+    ids = paragraph_ids()
+    parsed = benchmark(lambda: [ParagraphId.from_string(id) for id in ids])
+    assert len(parsed) == RESULTS
+
+
+@pytest.mark.benchmark(group="merge", min_rounds=5, timer=time.perf_counter, warmup=True)
+def test_parse_vector_ids(benchmark) -> None:
+    ids = vector_ids()
+    parsed = benchmark(lambda: [VectorId.from_string(id) for id in ids])
+    assert len(parsed) == RESULTS
+
+
+@pytest.mark.benchmark(group="merge", min_rounds=5, timer=time.perf_counter, warmup=True)
+async def test_merge_paragraph_results(no_augment, asyncbenchmark: AsyncBenchmarkFixture) -> None:
+    response = ParagraphSearchResponse(total=RESULTS)
+    for i, paragraph_id in enumerate(paragraph_ids()):
+        result = ParagraphResult(
+            uuid=paragraph_id.split("/")[0],
+            field="/f/file",
+            paragraph=paragraph_id,
+            labels=["/l/labelset/label", "/n/i/application/pdf"],
+        )
+        result.score.bm25 = RESULTS - i
+        result.metadata.position.index = i
+        result.metadata.position.start = i * 100
+        result.metadata.position.end = i * 100 + 99
+        response.results.append(result)
+    response.facets["/l/labelset"].CopyFrom(
+        FacetResults(facetresults=[FacetResult(tag=f"/l/labelset/{i}", total=i) for i in range(100)])
+    )
+
+    paragraphs, _ = await asyncbenchmark(
+        merge_paragraph_results,
+        "kbid",
+        response,
+        top_k=RESULTS,
+        highlight=False,
+        sort=SortOptions(field=SortField.SCORE, order=SortOrder.DESC),
+        min_score=0,
+        offset=0,
+    )
+    assert len(paragraphs.results) == RESULTS
+
+
+@pytest.mark.benchmark(group="merge", min_rounds=5, timer=time.perf_counter, warmup=True)
+async def test_merge_vectors_results(no_augment, asyncbenchmark: AsyncBenchmarkFixture) -> None:
+    response = VectorSearchResponse()
+    for i, vector_id in enumerate(vector_ids()):
+        result = DocumentScored(score=1 / (i + 1))
+        result.doc_id.id = vector_id
+        result.metadata.position.start = i * 100
+        result.metadata.position.end = i * 100 + 99
+        response.documents.append(result)
+
+    sentences, _ = await asyncbenchmark(merge_vectors_results, response, "kbid", top_k=RESULTS)
+    assert len(sentences.results) == RESULTS
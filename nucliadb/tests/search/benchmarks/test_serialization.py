@@ -0,0 +1,120 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+import json
+import time
+from datetime import datetime
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from nucliadb.common.external_index_providers.base import TextBlockMatch
+from nucliadb.common.ids import ParagraphId
+from nucliadb.models.responses import ModelResponse
+from nucliadb.search.search.find_merge import compose_find_resources
+from nucliadb_models.metadata import Metadata, ResourceProcessingStatus
+from nucliadb_models.resource import Resource
+from nucliadb_models.retrieval import KeywordScore, RrfScore, SemanticScore
+from nucliadb_models.search import SCORE_TYPE, KnowledgeboxFindResults, MinScore, TextPosition
+
+TOP_K = 200
+RESOURCES = 50
+
+
+def text_blocks() -> list[TextBlockMatch]:
+    return [
+        TextBlockMatch(
+            paragraph_id=ParagraphId.from_string(
+                f"rid{i % RESOURCES:029}/f/file/{i * 100}-{i * 100 + 99}"
+            ),
+            score_type=SCORE_TYPE.BOTH,
+            scores=[
+                SemanticScore(score=0.8),
+                KeywordScore(score=3.2),
+                RrfScore(score=1 / (i + 1)),
+            ],
+            position=TextPosition(index=i, start=i * 100, end=i * 100 + 99),
+            order=i,
+            fuzzy_search=False,
+            paragraph_labels=["/l/labelset/label", "/n/i/application/pdf"],
+            text="Lorem ipsum dolor sit amet, consectetur adipiscing elit " * 8,
+        )
+        for i in range(TOP_K)
+    ]
+
+
+def resources() -> list[Resource]:
+    return [
+        Resource(
+            id=f"rid{i:029}",
+            slug=f"resource-{i}",
+            title=f"Resource {i}",
+            summary="Sed ut perspiciatis unde omnis iste natus error sit voluptatem " * 4,
+            icon="application/pdf",
+            created=datetime(2024, 1, 1),
+            modified=datetime(2024, 1, 2),
+            metadata=Metadata(status=ResourceProcessingStatus.PROCESSED, language="en"),
+        )
+        for i in range(RESOURCES)
+    ]
+
+
+def find_results() -> KnowledgeboxFindResults:
+    blocks = text_blocks()
+    return KnowledgeboxFindResults(
+        query="lorem ipsum",
+        resources=compose_find_resources(blocks, resources()),
+        best_matches=[block.paragraph_id.full() for block in blocks],
+        total=TOP_K,
+        page_number=0,
+        page_size=TOP_K,
+        next_page=False,
+        min_score=MinScore(bm25=0, semantic=0.5),
+    )
+
+
+def validate_and_serialize(results: KnowledgeboxFindResults) -> bytes:
+    # What FastAPI does for a `response_model` route: dump the returned model,
+    # validate it again and encode the validated copy with the json module
+    content = results.model_dump(by_alias=True, exclude_unset=True)
+    validated = KnowledgeboxFindResults.model_validate(content)
+    data = validated.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    return bytes(JSONResponse(data).body)
+
+
+@pytest.mark.benchmark(group="serialization", min_rounds=5, timer=time.perf_counter, warmup=True)
+def test_compose_find_resources(benchmark) -> None:
+    blocks = text_blocks()
+    hydrated = resources()
+    find_resources = benchmark(compose_find_resources, blocks, hydrated)
+    assert sum(len(f.paragraphs) for r in find_resources.values() for f in r.fields.values()) == TOP_K
+
+
+@pytest.mark.benchmark(group="serialization", min_rounds=5, timer=time.perf_counter, warmup=True)
+def test_serialize_find_results_validated(benchmark) -> None:
+    results = find_results()
+    body = benchmark(validate_and_serialize, results)
+    assert len(json.loads(body)["best_matches"]) == TOP_K
+
+
+@pytest.mark.benchmark(group="serialization", min_rounds=5, timer=time.perf_counter, warmup=True)
+def test_serialize_find_results_direct(benchmark) -> None:
+    results = find_results()
+    response = benchmark(ModelResponse, results)
+    assert json.loads(response.body) == json.loads(validate_and_serialize(results))
@@ -16,19 +16,34 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from unittest.mock import MagicMock, patch
 
+import pytest
 
-from nucliadb.search.search.chat.ask import calculate_prequeries_for_json_schema, compute_best_matches
+from nucliadb.search.predict import RephraseResponse
+from nucliadb.search.search.chat.ask import (
+    NotEnoughContextAskResult,
+    ask,
+    calculate_prequeries_for_json_schema,
+    compute_best_matches,
+    retrieval_in_kb,
+)
+from nucliadb.search.search.chat.exceptions import NoRetrievalResultsError
+from nucliadb.search.search.metrics import Metrics
 from nucliadb_models.search import (
     SCORE_TYPE,
     AskRequest,
+    ChatContextMessage,
     ChatOptions,
     FindField,
     FindOptions,
     FindParagraph,
     FindRequest,
     FindResource,
+    GraphStrategy,
     KnowledgeboxFindResults,
+    NucliaDBClientType,
     PreQuery,
 )
 
@@ -216,3 +231,124 @@ def test_compute_best_matches():
     assert best_matches[3].weighted_score == best_matches[3].paragraph.score * 90 / 1100
     assert best_matches[4].weighted_score == best_matches[4].paragraph.score * 10 / 1100
     assert best_matches[5].weighted_score == best_matches[5].paragraph.score * 10 / 1100
+
+
+async def test_retrieval_in_kb_runs_graph_and_find_concurrently():
+    find_running = asyncio.Event()
+    graph_running = asyncio.Event()
+    main_results = KnowledgeboxFindResults(
+        resources={"rid": FindResource(id="rid", fields={})},
+    )
+    graph_results = KnowledgeboxFindResults(resources={})
+
+    async def find(**kwargs):
+        # would time out if graph retrieval waited for find to finish
+        find_running.set()
+        await asyncio.wait_for(graph_running.wait(), timeout=1)
+        return main_results, None, MagicMock(), MagicMock()
+
+    async def graph(**kwargs):
+        graph_running.set()
+        await asyncio.wait_for(find_running.wait(), timeout=1)
+        return graph_results, FindRequest(query="query")
+
+    ask_request = AskRequest(query="query", rag_strategies=[GraphStrategy()])
+    with (
+        patch("nucliadb.search.search.chat.ask.get_find_results", side_effect=find),
+        patch("nucliadb.search.search.chat.ask.get_graph_results", side_effect=graph),
+    ):
+        results = await retrieval_in_kb(
+            "kbid",
+            "query",
+            ask_request,
+            NucliaDBClientType.API,
+            "user",
+            "origin",
+            Metrics("ask"),
+        )
+
+    assert results.main_query is main_results
+    assert results.prequeries is not None
+    [(prequery, prequery_results)] = results.prequeries
+    assert prequery.id == "graph"
+    assert prequery_results is graph_results
+
+
+async def test_retrieval_in_kb_cancels_graph_on_find_error():
+    graph_cancelled = asyncio.Event()
+
+    async def find(**kwargs):
+        await asyncio.sleep(0)
+        raise ValueError("find failed")
+
+    async def graph(**kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            graph_cancelled.set()
+            raise
+
+    ask_request = AskRequest(query="query", rag_strategies=[GraphStrategy()])
+    with (
+        patch("nucliadb.search.search.chat.ask.get_find_results", side_effect=find),
+        patch("nucliadb.search.search.chat.ask.get_graph_results", side_effect=graph),
+        pytest.raises(ValueError),
+    ):
+        await retrieval_in_kb(
+            "kbid",
+            "query",
+            ask_request,
+            NucliaDBClientType.API,
+            "user",
+            "origin",
+            Metrics("ask"),
+        )
+
+    await asyncio.wait_for(graph_cancelled.wait(), timeout=1)
+
+
+@pytest.mark.parametrize(
+    "rephrased_query,use_chat_history,expected_queries",
+    [
+        # rephrase is a no-op, speculative retrieval is used
+        ("query", True, ["query"]),
+        # chat history is ignored but the query is rephrased, retrieval is done again
+        ("rephrased", False, ["query", "rephrased"]),
+        # rephrase changes the query, retrieval is done again
+        ("rephrased", True, ["query", "rephrased"]),
+    ],
+)
+async def test_ask_speculative_retrieval(rephrased_query, use_chat_history, expected_queries):
+    queries = []
+    retrieval_started = asyncio.Event()
+
+    async def retrieval_step(**kwargs):
+        queries.append(kwargs["main_query"])
+        retrieval_started.set()
+        raise NoRetrievalResultsError()
+
+    async def rephrase_query(*args, **kwargs):
+        # Rephrase once the speculative retrieval is running
+        await retrieval_started.wait()
+        return RephraseResponse(rephrased_query=rephrased_query, use_chat_history=use_chat_history)
+
+    ask_request = AskRequest(
+        query="query",
+        chat_history=[ChatContextMessage(author="USER", text="previous question")],
+    )
+    with (
+        patch("nucliadb.search.search.chat.ask.settings.ask_speculative_retrieval", True),
+        patch("nucliadb.search.search.chat.ask.rephrase_query", side_effect=rephrase_query),
+        patch("nucliadb.search.search.chat.ask.retrieval_step", side_effect=retrieval_step),
+        patch("nucliadb.search.search.chat.ask.maybe_audit_chat"),
+    ):
+        result = await ask(
+            kbid="kbid",
+            ask_request=ask_request,
+            user_id="user",
+            client_type=NucliaDBClientType.API,
+            origin="origin",
+        )
+
+    assert isinstance(result, NotEnoughContextAskResult)
+    assert queries == expected_queries
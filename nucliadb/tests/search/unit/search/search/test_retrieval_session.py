@@ -0,0 +1,89 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from nucliadb.search.search.retrieval_session import (
+    _get_many,
+    get_retrieval_session,
+    retrieval_session,
+)
+
+
+async def test_get_many_fetches_missing_keys_once() -> None:
+    store: dict = {}
+    fetched = []
+
+    async def fetch(keys):
+        fetched.append(keys)
+        await asyncio.sleep(0)
+        # key "c" doesn't exist
+        return {key: key.upper() for key in keys if key != "c"}
+
+    results = await asyncio.gather(
+        _get_many(store, ["a", "b"], fetch),
+        _get_many(store, ["b", "c"], fetch),
+    )
+    assert results == [{"a": "A", "b": "B"}, {"b": "B"}]
+    # "b" was in-flight for the second call, so only "c" is fetched
+    assert fetched == [["a", "b"], ["c"]]
+
+    assert await _get_many(store, ["a", "c"], fetch) == {"a": "A"}
+    assert len(fetched) == 2
+
+
+async def test_get_many_does_not_store_errors() -> None:
+    store: dict = {}
+
+    async def failing_fetch(keys):
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        await _get_many(store, ["a"], failing_fetch)
+    assert store == {}
+
+    async def fetch(keys):
+        return {key: key.upper() for key in keys}
+
+    assert await _get_many(store, ["a"], fetch) == {"a": "A"}
+
+
+async def test_retrieval_session_deduplicates_predict_queries() -> None:
+    predict = MagicMock()
+    predict.query = AsyncMock(return_value=MagicMock())
+    item = MagicMock()
+    item.model_dump_json.return_value = "{}"
+
+    assert get_retrieval_session() is None
+    with (
+        patch("nucliadb.search.search.retrieval_session.get_predict", return_value=predict),
+        retrieval_session(),
+    ):
+        session = get_retrieval_session()
+        assert session is not None
+        first, second = await asyncio.gather(
+            session.query_information("kbid", item),
+            session.query_information("kbid", item),
+        )
+        assert first is second
+        assert predict.query.call_count == 1
+    assert get_retrieval_session() is None
@@ -533,6 +533,44 @@ async def test_prompt_context_image_context_builder():
         }
 
 
+async def test_prompt_context_image_context_builder_page_images_limit():
+    paragraphs = [
+        FindParagraph(
+            id=f"rid{i}/f/file/0-1",
+            score=1,
+            score_type=SCORE_TYPE.BM25,
+            order=i,
+            text="text",
+            page_with_visual=True,
+        )
+        for i in range(4)
+    ]
+    builder = chat_prompt.PromptContextBuilder(
+        kbid="kbid",
+        ordered_paragraphs=paragraphs,
+        image_strategies=[PageImageStrategy(count=2)],
+    )
+
+    async def get_page_image(kbid, pid, page_number):
+        # the first page can't be found
+        if pid.rid == "rid0":
+            return None
+        return Image(b64encoded=pid.rid, content_type="image/png")
+
+    with (
+        mock.patch("nucliadb.search.search.chat.prompt.get_paragraph_page_number", return_value=1),
+        mock.patch(
+            "nucliadb.search.search.chat.prompt.get_page_image", side_effect=get_page_image
+        ) as get_page_image_mock,
+    ):
+        context = chat_prompt.CappedPromptContext(max_size=int(1e6))
+        await builder._build_context_images(context)
+
+    # same pages as fetching them one by one, in paragraph order
+    assert list(context.images.keys()) == ["rid1/f/file/1", "rid2/f/file/1"]
+    assert get_page_image_mock.call_count == 3
+
+
 async def test_prompt_context_builder_with_extra_image_context():
     image_content = base64.b64encode(b"my-image").decode()
     user_image = Image(content_type="image/png", b64encoded=image_content)
@@ -360,3 +360,50 @@ def test_get_paragraph_info_from_relations():
     assert merged_paragraph.paragraph_id.paragraph_end == 30
 
     assert len(merged_paragraph.relations.entities[entity_name_3].related_to) == 2
+
+
+@patch("nucliadb.search.search.graph_strategy.get_predict")
+async def test_rank_relations_reranker_only_scores_new_triplets(mocker):
+    predict_mock = AsyncMock()
+    mocker.return_value = predict_mock
+
+    def _relation(entity: str) -> DirectionalRelation:
+        return DirectionalRelation(
+            entity=entity,
+            entity_type=EntityType.ENTITY,
+            entity_subtype="PERSON",
+            relation_label="knows",
+            relation=RelationType.ENTITY,
+            direction=RelationDirection.OUT,
+            resource_id="resource_uuid",
+        )
+
+    scored_triplets: dict[tuple[str, str, str], float] = {}
+
+    # first hop
+    predict_mock.rerank.return_value = RerankResponse(context_scores={"0": 5})
+    relations = Relations(entities={"Alice": EntitySubgraph(related_to=[_relation("Bob")])})
+    await rank_relations_reranker(
+        relations, "query", "kbid", "user", top_k=5, scored_triplets=scored_triplets
+    )
+    assert scored_triplets == {("Alice", "knows", "Bob"): 5}
+
+    # second hop, only the new triplet is sent to predict
+    predict_mock.rerank.return_value = RerankResponse(context_scores={"0": 3})
+    relations = Relations(
+        entities={"Alice": EntitySubgraph(related_to=[_relation("Bob"), _relation("Carol")])}
+    )
+    result, scores = await rank_relations_reranker(
+        relations, "query", "kbid", "user", top_k=5, scored_triplets=scored_triplets
+    )
+    rerank_model = predict_mock.rerank.call_args.args[1]
+    assert rerank_model.context == {"0": "Alice knows Carol"}
+    assert [rel.entity for rel in result.entities["Alice"].related_to] == ["Bob", "Carol"]
+    assert scores == {"Alice": [5, 3]}
+
+    # nothing new to score
+    predict_mock.rerank.reset_mock()
+    await rank_relations_reranker(
+        relations, "query", "kbid", "user", top_k=5, scored_triplets=scored_triplets
+    )
+    predict_mock.rerank.assert_not_called()
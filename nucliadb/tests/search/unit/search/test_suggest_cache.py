@@ -0,0 +1,156 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from nucliadb.search.search.suggest_cache import (
+    SuggestCache,
+    filters_key,
+    fuzzy_prefix_match,
+    normalize_query,
+    results_key,
+)
+from nucliadb_models.search import KnowledgeboxSuggestResults, RelatedEntities, RelatedEntity
+from nucliadb_models.suggest import SuggestOptions
+
+
+def entities(*values: str) -> RelatedEntities:
+    items = [RelatedEntity(family="PERSON", value=value) for value in values]
+    return RelatedEntities(entities=items, total=len(items))
+
+
+def no_filters() -> str:
+    return filters_key(
+        filter_expression=None,
+        fields=[],
+        label_filters=[],
+        range_creation_start=None,
+        range_creation_end=None,
+        range_modification_start=None,
+        range_modification_end=None,
+        show_hidden=False,
+        security_groups=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "value,prefix,expected",
+    [
+        ("annie", "ann", True),
+        ("annie", "annie", True),
+        ("annie", "anni", True),
+        ("annie", "anne", True),  # substitution
+        ("annie", "anie", True),  # deletion
+        ("annie", "aninie", True),  # insertion
+        ("annie", "nanie", True),  # transposition
+        ("annie", "axxi", False),
+        ("john", "ann", False),
+        ("jo", "joh", True),
+        ("", "a", True),
+        ("", "ab", False),
+    ],
+)
+def test_fuzzy_prefix_match(value, prefix, expected):
+    assert fuzzy_prefix_match(value, prefix, 1) is expected
+
+
+def test_normalize_query():
+    assert normalize_query("  hello   world ") == "hello world"
+
+
+def test_filters_key_is_order_independent():
+    kwargs = dict(
+        filter_expression=None,
+        label_filters=[],
+        range_creation_start=None,
+        range_creation_end=None,
+        range_modification_start=None,
+        range_modification_end=None,
+        show_hidden=False,
+    )
+    assert filters_key(fields=["a", "b"], security_groups=["x", "y"], **kwargs) == filters_key(
+        fields=["b", "a"], security_groups=["y", "x"], **kwargs
+    )
+    assert filters_key(fields=[], security_groups=None, **kwargs) != filters_key(
+        fields=[], security_groups=[], **kwargs
+    )
+
+
+def test_results_cache():
+    cache = SuggestCache(ttl=10, maxsize=10, max_kbs=10)
+    key = results_key(no_filters(), "ann", [SuggestOptions.PARAGRAPH], False, False)
+    results = KnowledgeboxSuggestResults()
+    assert cache.get_results("kbid", key) is None
+    cache.set_results("kbid", key, results)
+    assert cache.get_results("kbid", key) is results
+    assert cache.get_results("other", key) is None
+
+    cache.invalidate("kbid")
+    assert cache.get_results("kbid", key) is None
+
+
+def test_results_cache_disabled():
+    cache = SuggestCache(ttl=0, maxsize=10, max_kbs=10)
+    key = results_key(no_filters(), "ann", [SuggestOptions.PARAGRAPH], False, False)
+    cache.set_results("kbid", key, KnowledgeboxSuggestResults())
+    assert cache.get_results("kbid", key) is None
+
+
+def test_entities_served_from_superset():
+    cache = SuggestCache(ttl=10, maxsize=10, max_kbs=10)
+    filters = no_filters()
+    cache.set_entities("kbid", filters, "An", entities("Anna", "Annie Hall", "Ada"), found=3)
+
+    # Exact prefix
+    found = cache.get_entities("kbid", filters, "an")
+    assert found is not None
+    assert {e.value for e in found.entities} == {"Anna", "Annie Hall", "Ada"}
+
+    # Growing prefixes are filtered with the same fuzzy matching as nidx
+    found = cache.get_entities("kbid", filters, "Anni")
+    assert found is not None
+    assert {e.value for e in found.entities} == {"Anna", "Annie Hall"}
+
+    found = cache.get_entities("kbid", filters, "annie h")
+    assert found is None
+
+    # Other filters or KBs are not served
+    assert cache.get_entities("kbid", "other", "anni") is None
+    assert cache.get_entities("other", filters, "anni") is None
+
+    # Nor unrelated or shorter words
+    assert cache.get_entities("kbid", filters, "bob") is None
+    assert cache.get_entities("kbid", filters, "a") is None
+
+
+def test_entities_superset_must_be_complete():
+    cache = SuggestCache(ttl=10, maxsize=10, max_kbs=10)
+    filters = no_filters()
+
+    # nidx returned as many entities as allowed, some may be missing
+    cache.set_entities("kbid", filters, "an", entities("Anna"), found=10)
+    assert cache.get_entities("kbid", filters, "ann") is None
+
+    # We can't normalize non ascii values as nidx does
+    cache.set_entities("kbid", filters, "an", entities("Anna", "Añez"), found=2)
+    assert cache.get_entities("kbid", filters, "ann") is None
+
+    # Nor multiple words
+    cache.set_entities("kbid", filters, "an ha", entities("Anna"), found=1)
+    assert cache.get_entities("kbid", filters, "an ha") is None
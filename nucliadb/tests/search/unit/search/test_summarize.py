@@ -0,0 +1,116 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from nucliadb.search.search import summarize as summarize_module
+from nucliadb.search.search.summarize import get_extracted_texts, summarize, summary_key
+from nucliadb_models.search import (
+    SummarizedResource,
+    SummarizedResponse,
+    SummarizeModel,
+    SummarizeRequest,
+    SummarizeResourceModel,
+)
+from nucliadb_protos.utils_pb2 import ExtractedText
+
+
+@pytest.fixture(autouse=True)
+def summaries_cache():
+    summarize_module._summaries.clear()
+    yield summarize_module._summaries
+    summarize_module._summaries.clear()
+
+
+@pytest.fixture()
+def extracted_texts():
+    texts = [
+        ("rid1", "t/text", ExtractedText(text="Some text")),
+        ("rid1", "a/title", ExtractedText(text="Title")),
+        ("rid2", "t/text", None),
+    ]
+    with mock.patch.object(summarize_module, "get_extracted_texts", return_value=texts):
+        yield texts
+
+
+@pytest.fixture()
+def predict():
+    predict = mock.Mock()
+    predict.summarize = mock.AsyncMock(
+        return_value=SummarizedResponse(
+            resources={"rid1": SummarizedResource(summary="summary", tokens=10)},
+            summary="summary",
+        )
+    )
+    with mock.patch.object(summarize_module, "get_predict", return_value=predict):
+        yield predict
+
+
+async def test_summarize_is_memoized(extracted_texts, predict):
+    request = SummarizeRequest(resources=["rid1", "rid2"])
+
+    first = await summarize("kbid", request, None)
+    second = await summarize("kbid", request, None)
+    assert predict.summarize.call_count == 1
+    assert first.summary == second.summary == "summary"
+
+    # Other options or KBs are summarized again
+    await summarize("kbid", SummarizeRequest(resources=["rid1"], user_prompt="Be brief"), None)
+    await summarize("other", request, None)
+    assert predict.summarize.call_count == 3
+
+    # As well as resources whose extracted text changed
+    extracted_texts[0] = ("rid1", "t/text", ExtractedText(text="Some new text"))
+    await summarize("kbid", request, None)
+    assert predict.summarize.call_count == 4
+
+
+def test_summary_key():
+    def request(**fields: str) -> SummarizeModel:
+        return SummarizeModel(resources={"rid": SummarizeResourceModel(fields=fields)})
+
+    assert summary_key("kbid", request(a="A", b="B")) == summary_key("kbid", request(b="B", a="A"))
+    assert summary_key("kbid", request(a="A")) != summary_key("kbid", request(a="B"))
+    assert summary_key("kbid", request(a="A")) != summary_key("kbid", request(b="A"))
+    assert summary_key("kbid", request(a="A")) != summary_key("other", request(a="A"))
+
+
+async def test_get_extracted_texts_does_not_leave_tasks_behind():
+    async def get_resource_fields(kbid, uuid_or_slug, max_operations):
+        if uuid_or_slug == "failing":
+            raise ValueError(uuid_or_slug)
+        if uuid_or_slug == "slow":
+            await asyncio.sleep(0.1)
+        return [mock.Mock()]
+
+    async def get_extracted_text(uuid_or_slug, field, max_operations):
+        await asyncio.Event().wait()
+
+    with (
+        mock.patch.object(summarize_module.datamanagers.atomic.kb, "exists", return_value=True),
+        mock.patch.object(summarize_module, "get_resource_fields", get_resource_fields),
+        mock.patch.object(summarize_module, "get_extracted_text", get_extracted_text),
+    ):
+        with pytest.raises(ValueError):
+            await get_extracted_texts("kbid", ["rid", "slow", "failing"])
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
@@ -50,25 +50,25 @@ async def test_knowledgebox_file_tus_options(nucliadb_writer: AsyncClient, knowl
     assert resp.status_code == 204
     assert resp.headers["tus-resumable"] == "1.0.0"
     assert resp.headers["tus-version"] == "1.0.0"
-    assert resp.headers["tus-extension"] == "creation-defer-length"
+    assert resp.headers["tus-extension"] == "creation-defer-length,concatenation"
 
     resp = await nucliadb_writer.options(f"/{KB_PREFIX}/{kbid}/resource/{rid}/file/xxx/{TUSUPLOAD}")
     assert resp.status_code == 204
     assert resp.headers["tus-resumable"] == "1.0.0"
     assert resp.headers["tus-version"] == "1.0.0"
-    assert resp.headers["tus-extension"] == "creation-defer-length"
+    assert resp.headers["tus-extension"] == "creation-defer-length,concatenation"
 
     resp = await nucliadb_writer.options(f"/{KB_PREFIX}/{kbid}/{TUSUPLOAD}")
     assert resp.status_code == 204
     assert resp.headers["tus-resumable"] == "1.0.0"
     assert resp.headers["tus-version"] == "1.0.0"
-    assert resp.headers["tus-extension"] == "creation-defer-length"
+    assert resp.headers["tus-extension"] == "creation-defer-length,concatenation"
 
     resp = await nucliadb_writer.options(f"/{KB_PREFIX}/{kbid}/{TUSUPLOAD}/xxx")
     assert resp.status_code == 204
     assert resp.headers["tus-resumable"] == "1.0.0"
     assert resp.headers["tus-version"] == "1.0.0"
-    assert resp.headers["tus-extension"] == "creation-defer-length"
+    assert resp.headers["tus-extension"] == "creation-defer-length,concatenation"
 
 
 @pytest.mark.deploy_modes("component")
@@ -161,6 +161,93 @@ async def test_knowledgebox_file_tus_upload_root(nucliadb_writer: AsyncClient, k
     assert resp.status_code == 409
 
 
+@pytest.mark.deploy_modes("component")
+async def test_knowledgebox_file_tus_upload_concatenation(
+    nucliadb_writer: AsyncClient, knowledgebox: str
+):
+    kbid = knowledgebox
+
+    min_chunk_size = get_storage_manager().min_upload_size
+    assert min_chunk_size is not None, "File storage not properly set up"
+    parts = [b"x" * min_chunk_size, b"y" * min_chunk_size, b"z" * 500]
+
+    async def upload_part(data: bytes) -> str:
+        resp = await nucliadb_writer.post(
+            f"/{KB_PREFIX}/{kbid}/{TUSUPLOAD}",
+            headers={
+                "tus-resumable": "1.0.0",
+                "upload-concat": "partial",
+                "upload-length": f"{len(data)}",
+            },
+        )
+        assert resp.status_code == 201, resp.text
+        url = resp.headers["location"]
+        resp = await nucliadb_writer.patch(
+            url,
+            content=data,
+            headers={"upload-offset": "0", "content-length": f"{len(data)}"},
+        )
+        assert resp.status_code == 200, resp.text
+        assert resp.headers["Tus-Upload-Finished"] == "1"
+        assert "ndb-field" not in resp.headers
+        return url
+
+    # Parts are uploaded in parallel and finish in any order
+    urls = await asyncio.gather(*(upload_part(part) for part in parts))
+
+    filename = base64.b64encode(b"data.bin").decode()
+
+    # An invalid content type is rejected without consuming the parts
+    content_type = base64.b64encode(b"invalid").decode()
+    resp = await nucliadb_writer.post(
+        f"/{KB_PREFIX}/{kbid}/{TUSUPLOAD}",
+        headers={
+            "tus-resumable": "1.0.0",
+            "upload-concat": f"final;{' '.join(urls)}",
+            "upload-metadata": f"filename {filename},content_type {content_type}",
+        },
+    )
+    assert resp.status_code == 415, resp.text
+
+    resp = await nucliadb_writer.post(
+        f"/{KB_PREFIX}/{kbid}/{TUSUPLOAD}",
+        headers={
+            "tus-resumable": "1.0.0",
+            "upload-concat": f"final;{' '.join(urls)}",
+            "upload-metadata": f"filename {filename}",
+            "content-type": "application/octet-stream",
+        },
+    )
+    assert resp.status_code == 201, resp.text
+    assert resp.headers["Tus-Upload-Finished"] == "1"
+    assert resp.headers["Upload-Offset"] == f"{sum(len(part) for part in parts)}"
+
+    transaction = get_transaction_utility()
+    sub = await transaction.js.pull_subscribe(const.Streams.INGEST.subject.format(partition="1"), "auto")
+    msgs = await sub.fetch(1)
+    writer = BrokerMessage()
+    writer.ParseFromString(msgs[0].data)
+    await msgs[0].ack()
+
+    field = resp.headers["ndb-field"].split("/")[-1]
+    assert writer.files[field].file.filename == "data.bin"
+    assert writer.files[field].file.size == sum(len(part) for part in parts)
+
+    storage = await get_storage()
+    download_data = await storage.downloadbytes(
+        bucket=writer.files[field].file.bucket_name,
+        key=writer.files[field].file.uri,
+    )
+    assert download_data.read() == b"".join(parts)
+
+    # Parts are consumed by the final upload
+    resp = await nucliadb_writer.post(
+        f"/{KB_PREFIX}/{kbid}/{TUSUPLOAD}",
+        headers={"tus-resumable": "1.0.0", "upload-concat": f"final;{urls[0]}"},
+    )
+    assert resp.status_code == 412
+
+
 @pytest.mark.deploy_modes("component")
 async def test_knowledgebox_file_upload_root(
     nucliadb_writer: AsyncClient,
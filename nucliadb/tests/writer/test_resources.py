@@ -527,3 +527,74 @@ async def test_hide_on_creation(
     async with datamanagers.utils.with_ro_transaction() as txn:
         basic = await datamanagers.resources.get_basic(txn, kbid=kbid, rid=rid)
         assert basic and basic.hidden is True
+
+
+@pytest.mark.deploy_modes("component")
+async def test_create_resources_batch(
+    nucliadb_writer: AsyncClient,
+    knowledgebox: str,
+    mocker: MockerFixture,
+):
+    kbid = knowledgebox
+
+    resp = await nucliadb_writer.post(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}",
+        json={"slug": "taken", "title": "My resource"},
+    )
+    assert resp.status_code == 201
+
+    from nucliadb.writer.api.v1.resource import maybe_back_pressure
+
+    back_pressure = mocker.patch(
+        "nucliadb.writer.api.v1.resource.maybe_back_pressure", wraps=maybe_back_pressure
+    )
+
+    resp = await nucliadb_writer.post(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}/batch",
+        json={
+            "resources": [
+                {"slug": "resource1", "title": "First", "texts": {"text1": TEST_TEXT_PAYLOAD}},
+                {"slug": "taken", "title": "Taken slug"},
+                {"title": "No slug", "hidden": True},
+                {"slug": "resource1", "title": "Repeated slug"},
+                {"slug": "resource2", "title": "Second"},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+    assert [result["status_code"] for result in results] == [201, 409, 422, 409, 201]
+    assert back_pressure.call_count == 1
+
+    for idx in (1, 2, 3):
+        assert "uuid" not in results[idx]
+        assert results[idx]["error"]
+
+    for idx, slug in ((0, "resource1"), (4, "resource2")):
+        rid = results[idx]["uuid"]
+        assert await datamanagers.atomic.resources.get_rid(kbid=kbid, slug=slug) == rid
+
+    # Unexpected errors are reported per resource, without failing the others
+    from nucliadb.writer.api.v1.resource import _create_resource
+
+    async def create_resource(request, kbid, item, *args, **kwargs):
+        if item.title == "Broken":
+            raise ValueError("boom")
+        return await _create_resource(request, kbid, item, *args, **kwargs)
+
+    mocker.patch("nucliadb.writer.api.v1.resource._create_resource", side_effect=create_resource)
+    resp = await nucliadb_writer.post(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}/batch",
+        json={"resources": [{"title": "Broken"}, {"slug": "resource3", "title": "Third"}]},
+    )
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+    assert results[0]["status_code"] == 500
+    assert "uuid" not in results[0]
+    assert await datamanagers.atomic.resources.get_rid(kbid=kbid, slug="resource3") == results[1]["uuid"]
+
+    resp = await nucliadb_writer.post(
+        f"/{KB_PREFIX}/{kbid}/{RESOURCES_PREFIX}/batch",
+        json={"resources": []},
+    )
+    assert resp.status_code == 422
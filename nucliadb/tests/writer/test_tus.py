@@ -23,8 +23,10 @@ import uuid
 import pytest
 
 from nucliadb.ingest.orm.resource import Resource
-from nucliadb.writer.settings import settings
+from nucliadb.writer.settings import DMDriver, settings
 from nucliadb.writer.tus import get_dm
+from nucliadb.writer.tus.dm import PGFileDataManager
+from nucliadb.writer.tus.exceptions import HTTPConflict
 from nucliadb.writer.tus.gcs import GCloudBlobStore, GCloudFileStorageManager
 from nucliadb.writer.tus.local import LocalBlobStore, LocalFileStorageManager
 from nucliadb.writer.tus.s3 import S3BlobStore, S3FileStorageManager
@@ -103,6 +105,61 @@ async def redis_dm(valkey):
     settings.dm_enabled = prev
 
 
+@pytest.fixture(scope="function")
+async def pg_dm(maindb_driver):
+    prev = (settings.dm_enabled, settings.dm_driver)
+
+    settings.dm_enabled = True
+    settings.dm_driver = DMDriver.PG
+
+    yield get_dm()
+
+    settings.dm_enabled, settings.dm_driver = prev
+
+
+async def test_pg_dm(pg_dm):
+    assert isinstance(pg_dm, PGFileDataManager)
+
+    upload_id = uuid.uuid4().hex
+    await pg_dm.load(upload_id)
+    await pg_dm.start({})
+    await pg_dm.update(upload_file_id=upload_id, metadata={"filename": "file"}, offset=0, size=10)
+    await pg_dm.save()
+
+    # Two requests appending to the same upload at the same offset
+    first = get_dm()
+    await first.load(upload_id)
+    second = get_dm()
+    await second.load(upload_id)
+    assert first.offset == second.offset == 0
+    assert first.metadata == {"filename": "file"}
+
+    # Only the first one can reserve the offset and append its data
+    await first.reserve(0)
+    with pytest.raises(HTTPConflict):
+        await second.reserve(0)
+
+    await first.update(offset=5)
+    await first.save()
+    await second.update(offset=5)
+    with pytest.raises(HTTPConflict):
+        await second.save()
+
+    # Saving releases the reservation, a failed append releases it explicitly
+    await first.reserve(5)
+    await first.release(5)
+
+    reloaded = get_dm()
+    await reloaded.load(upload_id)
+    assert reloaded.offset == 5
+    assert reloaded.size == 10
+
+    await reloaded.finish()
+    finished = get_dm()
+    await finished.load(upload_id)
+    assert finished.metadata == {}
+
+
 async def test_s3_driver(redis_dm, s3_storage_tus: S3BlobStore):
     await storage_test(s3_storage_tus, S3FileStorageManager(s3_storage_tus))
 
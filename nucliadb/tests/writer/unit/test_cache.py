@@ -0,0 +1,71 @@
+# Copyright (C) 2021 Bosutech XXI S.L.
+#
+# nucliadb is offered under the AGPL v3.0 and as commercial software.
+# For commercial licensing, contact us at info@nuclia.com.
+#
+# AGPL:
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from nucliadb.writer.cache import KBCache
+from nucliadb_models.kv_schemas import KBKVSchemas
+from nucliadb_protos.knowledgebox_pb2 import KnowledgeBoxConfig
+
+CACHE_MODULE = "nucliadb.writer.cache"
+
+
+async def test_kb_cache_config():
+    cache = KBCache(ttl=60, maxsize=10)
+    with patch(f"{CACHE_MODULE}.datamanagers.atomic.kb.get_config", new=AsyncMock()) as get_config:
+        get_config.return_value = KnowledgeBoxConfig(title="foo")
+        assert (await cache.get_config("kbid")).title == "foo"  # type: ignore
+        assert (await cache.get_config("kbid")).title == "foo"  # type: ignore
+        assert get_config.await_count == 1
+
+        cache.invalidate("kbid")
+        get_config.return_value = KnowledgeBoxConfig(title="bar")
+        assert (await cache.get_config("kbid")).title == "bar"  # type: ignore
+        assert get_config.await_count == 2
+
+        # Missing configs are not cached
+        get_config.return_value = None
+        assert await cache.get_config("other") is None
+        assert await cache.get_config("other") is None
+        assert get_config.await_count == 4
+
+
+async def test_kb_cache_kv_schemas():
+    cache = KBCache(ttl=60, maxsize=10)
+    with (
+        patch(f"{CACHE_MODULE}.datamanagers.with_ro_transaction", return_value=MagicMock()),
+        patch(f"{CACHE_MODULE}.datamanagers.kv_schemas.get_all", new=AsyncMock()) as get_all,
+    ):
+        get_all.return_value = KBKVSchemas()
+        assert (await cache.get_kv_schemas("kbid")).schemas == {}
+        assert (await cache.get_kv_schemas("kbid")).schemas == {}
+        assert get_all.await_count == 1
+
+        cache.invalidate("kbid")
+        await cache.get_kv_schemas("kbid")
+        assert get_all.await_count == 2
+
+
+async def test_kb_cache_disabled():
+    cache = KBCache(ttl=0, maxsize=10)
+    with patch(f"{CACHE_MODULE}.datamanagers.atomic.kb.get_config", new=AsyncMock()) as get_config:
+        get_config.return_value = KnowledgeBoxConfig()
+        await cache.get_config("kbid")
+        await cache.get_config("kbid")
+        assert get_config.await_count == 2
@@ -13,6 +13,13 @@
 # limitations under the License.
 
 # Mapping to transform a text/labels onto tokens and multilabelbinarizer
+#
+# Batches are converted column-wise: every output column is built with a single
+# comprehension over the repeated protobuf field and list columns are assembled
+# from a flat values array plus a preallocated offsets buffer, so we never build
+# one Python list per record.
+from array import array
+from collections.abc import Iterable, Sequence
 from typing import Any, TypeVar
 
 import pyarrow as pa  # type: ignore[import-untyped]
@@ -40,165 +47,188 @@ def bytes_to_batch(klass: Any):
     return func
 
 
+def _offsets(lengths: Iterable[int], size: int) -> pa.Array:
+    """
+    Build an arrow int32 offsets array from the lengths of each list. The
+    buffer is preallocated and handed to arrow without copying it.
+    """
+    offsets = array("i", bytes(4 * (size + 1)))
+    total = 0
+    for index, length in enumerate(lengths, start=1):
+        total += length
+        offsets[index] = total
+    return pa.Array.from_buffers(pa.int32(), size + 1, [None, pa.py_buffer(offsets)])
+
+
+def _list_array(
+    values: Sequence[Any], lengths: Iterable[int], size: int, value_type: pa.DataType
+) -> pa.Array:
+    return pa.ListArray.from_arrays(_offsets(lengths, size), pa.array(values, type=value_type))
+
+
+def _value_type(schema: pa.schema, index: int) -> pa.DataType:
+    return schema.field(index).type.value_type
+
+
+def _labels(data: Any) -> list[str]:
+    return [f"{label.labelset}/{label.label}" for label in data.labels]
+
+
 def batch_to_text_classification_arrow():
     def func(batch: BatchType, schema: pa.schema):
-        TEXT = []
-        LABELS = []
-        for data in batch.data:
-            if data.text:
-                TEXT.append(data.text)
-                LABELS.append([f"{label.labelset}/{label.label}" for label in data.labels])
-        if len(TEXT):
-            pa_data = [pa.array(TEXT), pa.array(LABELS)]
-            output_batch = pa.record_batch(pa_data, schema=schema)
-        else:
-            output_batch = None
-        return output_batch
+        items = [data for data in batch.data if data.text]
+        if len(items) == 0:
+            return None
+        labels = [_labels(data) for data in items]
+        pa_data = [
+            pa.array([data.text for data in items], type=schema.field(0).type),
+            _list_array(
+                [label for item_labels in labels for label in item_labels],
+                map(len, labels),
+                len(items),
+                _value_type(schema, 1),
+            ),
+        ]
+        return pa.record_batch(pa_data, schema=schema)
 
     return func
 
 
 def batch_to_token_classification_arrow():
     def func(batch: TokenClassificationBatch, schema: pa.schema):
-        X = []
-        Y = []
-        for data in batch.data:
-            X.append([x for x in data.token])
-            Y.append([x for x in data.label])
-        if len(X):
-            pa_data = [pa.array(X), pa.array(Y)]
-            output_batch = pa.record_batch(pa_data, schema)
-        else:
-            output_batch = None
-        return output_batch
+        items = batch.data
+        if len(items) == 0:
+            return None
+        pa_data = [
+            _list_array(
+                [token for data in items for token in data.token],
+                (len(data.token) for data in items),
+                len(items),
+                _value_type(schema, 0),
+            ),
+            _list_array(
+                [label for data in items for label in data.label],
+                (len(data.label) for data in items),
+                len(items),
+                _value_type(schema, 1),
+            ),
+        ]
+        return pa.record_batch(pa_data, schema)
 
     return func
 
 
 def batch_to_text_classification_normalized_arrow():
     def func(batch: SentenceClassificationBatch, schema: pa.schema):
-        TEXT = []
-        LABELS = []
-        for data in batch.data:
-            batch_labels = [f"{label.labelset}/{label.label}" for label in data.labels]
-            for sentence in data.text:
-                TEXT.append(sentence)
-                LABELS.append(batch_labels)
-        if len(TEXT):
-            pa_data = [pa.array(TEXT), pa.array(LABELS)]
-            output_batch = pa.record_batch(pa_data, schema=schema)
-        else:
-            output_batch = None
-        return output_batch
+        # Every sentence of an item shares the item labels: repeat the labels
+        # once per sentence while building the flat values column.
+        texts = [sentence for data in batch.data for sentence in data.text]
+        if len(texts) == 0:
+            return None
+        labels = [_labels(data) for data in batch.data]
+        sentences_per_item = [len(data.text) for data in batch.data]
+        pa_data = [
+            pa.array(texts, type=schema.field(0).type),
+            _list_array(
+                [
+                    label
+                    for item_labels, sentences in zip(labels, sentences_per_item)
+                    for _ in range(sentences)
+                    for label in item_labels
+                ],
+                (
+                    len(item_labels)
+                    for item_labels, sentences in zip(labels, sentences_per_item)
+                    for _ in range(sentences)
+                ),
+                len(texts),
+                _value_type(schema, 1),
+            ),
+        ]
+        return pa.record_batch(pa_data, schema=schema)
 
     return func
 
 
 def batch_to_image_classification_arrow():
     def func(batch: ImageClassificationBatch, schema: pa.schema):
-        IMAGE = []
-        SELECTION = []
-        for data in batch.data:
-            IMAGE.append(data.page_uri)
-            SELECTION.append(data.selections)
-
-        if len(IMAGE):
-            pa_data = [pa.array(IMAGE), pa.array(SELECTION)]
-            output_batch = pa.record_batch(pa_data, schema=schema)
-        else:
-            output_batch = None
-        return output_batch
+        items = batch.data
+        if len(items) == 0:
+            return None
+        pa_data = [
+            pa.array([data.page_uri for data in items], type=schema.field(0).type),
+            pa.array([data.selections for data in items], type=schema.field(1).type),
+        ]
+        return pa.record_batch(pa_data, schema=schema)
 
     return func
 
 
 def batch_to_paragraph_streaming_arrow():
     def func(batch: ParagraphStreamingBatch, schema: pa.schema):
-        PARARGAPH_ID = []
-        TEXT = []
-        for data in batch.data:
-            PARARGAPH_ID.append(data.id)
-            TEXT.append(data.text)
-
-        if len(PARARGAPH_ID):
-            pa_data = [pa.array(PARARGAPH_ID), pa.array(TEXT)]
-            output_batch = pa.record_batch(pa_data, schema=schema)
-        else:
-            output_batch = None
-        return output_batch
+        items = batch.data
+        if len(items) == 0:
+            return None
+        pa_data = [
+            pa.array([data.id for data in items], type=schema.field(0).type),
+            pa.array([data.text for data in items], type=schema.field(1).type),
+        ]
+        return pa.record_batch(pa_data, schema=schema)
 
     return func
 
 
 def batch_to_question_answer_streaming_arrow():
     def func(batch: QuestionAnswerStreamingBatch, schema: pa.schema):
-        QUESTION = []
-        ANSWER = []
-        QUESTION_PARAGRAPHS = []
-        ANSWER_PARAGRAPHS = []
-        QUESTION_LANGUAGE = []
-        ANSWER_LANGUAGE = []
-        CANCELLED_BY_USER = []
-        for data in batch.data:
-            QUESTION.append(data.question.text)
-            ANSWER.append(data.answer.text)
-            QUESTION_PARAGRAPHS.append([paragraph for paragraph in data.question.paragraphs])
-            ANSWER_PARAGRAPHS.append([paragraph for paragraph in data.answer.paragraphs])
-            QUESTION_LANGUAGE.append(data.question.language)
-            ANSWER_LANGUAGE.append(data.answer.language)
-            CANCELLED_BY_USER.append(data.cancelled_by_user)
-
-        if len(QUESTION):
-            pa_data = [
-                pa.array(QUESTION),
-                pa.array(ANSWER),
-                pa.array(QUESTION_PARAGRAPHS),
-                pa.array(ANSWER_PARAGRAPHS),
-                pa.array(QUESTION_LANGUAGE),
-                pa.array(ANSWER_LANGUAGE),
-                pa.array(CANCELLED_BY_USER),
-            ]
-            output_batch = pa.record_batch(pa_data, schema=schema)
-        else:
-            output_batch = None
-        return output_batch
+        items = batch.data
+        if len(items) == 0:
+            return None
+        questions = [data.question for data in items]
+        answers = [data.answer for data in items]
+        pa_data = [
+            pa.array([question.text for question in questions], type=schema.field(0).type),
+            pa.array([answer.text for answer in answers], type=schema.field(1).type),
+            _list_array(
+                [paragraph for question in questions for paragraph in question.paragraphs],
+                (len(question.paragraphs) for question in questions),
+                len(items),
+                _value_type(schema, 2),
+            ),
+            _list_array(
+                [paragraph for answer in answers for paragraph in answer.paragraphs],
+                (len(answer.paragraphs) for answer in answers),
+                len(items),
+                _value_type(schema, 3),
+            ),
+            pa.array([question.language for question in questions], type=schema.field(4).type),
+            pa.array([answer.language for answer in answers], type=schema.field(5).type),
+            pa.array([data.cancelled_by_user for data in items], type=schema.field(6).type),
+        ]
+        return pa.record_batch(pa_data, schema=schema)
 
     return func
 
 
 def batch_to_field_streaming_arrow():
     def func(batch: FieldStreamingBatch, schema: pa.schema):
-        SPLIT = []
-        RID = []
-        FIELD = []
-        FIELD_TYPE = []
-        LABELS = []
-        EXTRACTED_TEXT = []
-        METADATA = []
-        BASIC = []
-        for data in batch.data:
-            SPLIT.append(data.split)
-            RID.append(data.rid)
-            FIELD.append(data.field)
-            FIELD_TYPE.append(data.field_type)
-            LABELS.append([x for x in data.labels])
-            EXTRACTED_TEXT.append(data.text.SerializeToString())
-            METADATA.append(data.metadata.SerializeToString())
-            BASIC.append(data.basic.SerializeToString())
-        if len(RID):
-            pa_data = [
-                pa.array(SPLIT),
-                pa.array(RID),
-                pa.array(FIELD),
-                pa.array(FIELD_TYPE),
-                pa.array(LABELS),
-                pa.array(EXTRACTED_TEXT),
-                pa.array(BASIC),
-                pa.array(METADATA),
-            ]
-            output_batch = pa.record_batch(pa_data, schema)
-        else:
-            output_batch = None
-        return output_batch
+        items = batch.data
+        if len(items) == 0:
+            return None
+        pa_data = [
+            pa.array([data.split for data in items], type=schema.field(0).type),
+            pa.array([data.rid for data in items], type=schema.field(1).type),
+            pa.array([data.field for data in items], type=schema.field(2).type),
+            pa.array([data.field_type for data in items], type=schema.field(3).type),
+            _list_array(
+                [label for data in items for label in data.labels],
+                (len(data.labels) for data in items),
+                len(items),
+                _value_type(schema, 4),
+            ),
+            pa.array([data.text.SerializeToString() for data in items], type=schema.field(5).type),
+            pa.array([data.basic.SerializeToString() for data in items], type=schema.field(6).type),
+            pa.array([data.metadata.SerializeToString() for data in items], type=schema.field(7).type),
+        ]
+        return pa.record_batch(pa_data, schema)
 
     return func
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import logging
+from typing import Protocol
 
 import requests
 
@@ -22,10 +23,67 @@ from nucliadb_protos.dataset_pb2 import TrainSet as TrainSetPB
 logger = logging.getLogger("nucliadb_dataset")
 
 SIZE_BYTES = 4
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+class RawStream(Protocol):
+    def read(self, amt: int, decode_content: bool = ...) -> bytes: ...
+
+
+class FrameReader:
+    """
+    Reads size-prefixed frames (4 bytes big endian length + payload) from a raw
+    stream. Instead of issuing two reads per frame, it reads big chunks and
+    splits as many frames as they contain, so many small messages are parsed
+    per syscall.
+    """
+
+    def __init__(self, raw: RawStream, buffer_size: int = READ_BUFFER_SIZE):
+        self.raw = raw
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.position = 0
+        self.eof = False
+
+    def _fill(self, needed: int) -> bool:
+        """
+        Make sure at least `needed` unread bytes are buffered. Returns False if
+        the stream ended before that.
+        """
+        while len(self.buffer) - self.position < needed:
+            if self.eof:
+                return False
+            # Compact consumed bytes before growing the buffer
+            if self.position > 0:
+                del self.buffer[: self.position]
+                self.position = 0
+            chunk = self.raw.read(max(self.buffer_size, needed - len(self.buffer)), decode_content=True)
+            if not chunk:
+                self.eof = True
+            else:
+                self.buffer.extend(chunk)
+        return True
+
+    def read_frame(self) -> bytes | None:
+        if not self._fill(SIZE_BYTES):
+            if len(self.buffer) > self.position:
+                logger.warning("Stream ended with an incomplete frame header")
+            return None
+        header_end = self.position + SIZE_BYTES
+        payload_size = int.from_bytes(
+            self.buffer[self.position : header_end], byteorder="big", signed=False
+        )
+        if not self._fill(SIZE_BYTES + payload_size):
+            logger.warning("Stream ended with an incomplete frame payload")
+            return None
+        payload_start = self.position + SIZE_BYTES
+        self.position = payload_start + payload_size
+        return bytes(self.buffer[payload_start : self.position])
 
 
 class Streamer:
     resp: requests.Response | None
+    reader: FrameReader | None
 
     def __init__(
         self,
@@ -39,6 +97,7 @@ class Streamer:
         self.trainset = trainset
         self.kbid = kbid
         self.resp = None
+        self.reader = None
 
     @property
     def initialized(self):
@@ -65,23 +124,20 @@ class Streamer:
         else:  # pragma: no cover
             raise ValueError("Invalid trainset type")
         self.resp.raise_for_status()
+        self.reader = FrameReader(self.resp.raw)
 
     def finalize(self):
         if self.resp is not None:
             self.resp.close()
         self.resp = None
+        self.reader = None
 
     def __iter__(self):
         return self
 
     def read(self) -> bytes | None:
-        assert self.resp is not None, "Streamer not initialized"
-        header = self.resp.raw.read(4, decode_content=True)
-        if header == b"":
-            return None
-        payload_size = int.from_bytes(header, byteorder="big", signed=False)
-        data = self.resp.raw.read(payload_size)
-        return data
+        assert self.reader is not None, "Streamer not initialized"
+        return self.reader.read_frame()
 
     def __next__(self) -> bytes | None:
         payload = self.read()
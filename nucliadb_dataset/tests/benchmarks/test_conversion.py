@@ -0,0 +1,109 @@
+# Copyright 2025 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import time
+
+import pyarrow as pa  # type: ignore[import-untyped]
+import pytest
+
+from nucliadb_dataset.streamer import FrameReader
+from nucliadb_dataset.tasks import TASK_DEFINITIONS, Task
+from nucliadb_protos.dataset_pb2 import ParagraphClassificationBatch
+
+BATCHES = 50
+ITEMS_PER_BATCH = 1000
+
+
+def rowwise_text_classification_arrow(batch: ParagraphClassificationBatch, schema: pa.schema):
+    # Reference implementation building one python list per record, used as the
+    # baseline for the column-wise conversion
+    texts = []
+    labels = []
+    for data in batch.data:
+        if data.text:
+            texts.append(data.text)
+            labels.append([f"{label.labelset}/{label.label}" for label in data.labels])
+    return pa.record_batch([pa.array(texts), pa.array(labels)], schema=schema)
+
+
+def make_stream() -> bytes:
+    stream = bytearray()
+    for b in range(BATCHES):
+        batch = ParagraphClassificationBatch()
+        for i in range(ITEMS_PER_BATCH):
+            item = batch.data.add(text=f"paragraph {b}-{i} " * 10)
+            item.labels.add(labelset="topic", label=f"label-{i % 7}")
+            item.labels.add(labelset="lang", label="en")
+        payload = batch.SerializeToString()
+        stream.extend(len(payload).to_bytes(4, byteorder="big", signed=False))
+        stream.extend(payload)
+    return bytes(stream)
+
+
+class Raw(io.BytesIO):
+    def read(self, amt: int = -1, decode_content: bool = False) -> bytes:  # type: ignore[override]
+        return super().read(amt)
+
+
+def unbuffered_read(raw: Raw):
+    # Previous streamer behaviour: one read for the header and one for the payload
+    while header := raw.read(4):
+        yield raw.read(int.from_bytes(header, byteorder="big", signed=False))
+
+
+def buffered_read(raw: Raw):
+    reader = FrameReader(raw)
+    while (payload := reader.read_frame()) is not None:
+        yield payload
+
+
+def convert_stream(stream: bytes, read, convert) -> int:
+    definition = TASK_DEFINITIONS[Task.PARAGRAPH_CLASSIFICATION]
+    to_batch = definition.mapping[0]
+    rows = 0
+    for payload in read(Raw(stream)):
+        rows += convert(to_batch(payload), definition.schema).num_rows
+    return rows
+
+
+@pytest.mark.parametrize(
+    "read,convert",
+    [
+        (unbuffered_read, rowwise_text_classification_arrow),
+        (buffered_read, TASK_DEFINITIONS[Task.PARAGRAPH_CLASSIFICATION].mapping[1]),
+    ],
+    ids=["rowwise", "columnar"],
+)
+@pytest.mark.benchmark(
+    group="trainset-conversion",
+    min_rounds=5,
+    timer=time.perf_counter,
+    disable_gc=True,
+    warmup=True,
+)
+def test_convert_paragraph_classification_stream(benchmark, read, convert):
+    stream = make_stream()
+    rows = benchmark(convert_stream, stream, read, convert)
+    assert rows == BATCHES * ITEMS_PER_BATCH
+
+
+def test_columnar_conversion_matches_rowwise():
+    definition = TASK_DEFINITIONS[Task.PARAGRAPH_CLASSIFICATION]
+    to_batch, columnar = definition.mapping
+    for payload in buffered_read(Raw(make_stream())):
+        batch = to_batch(payload)
+        assert columnar(batch, definition.schema).equals(
+            rowwise_text_classification_arrow(batch, definition.schema)
+        )
@@ -0,0 +1,88 @@
+# Copyright 2025 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nucliadb_dataset.tasks import TASK_DEFINITIONS, Task
+from nucliadb_protos.dataset_pb2 import (
+    ParagraphClassificationBatch,
+    QuestionAnswerStreamingBatch,
+    SentenceClassificationBatch,
+    TokenClassificationBatch,
+)
+
+
+def convert(task: Task, batch) -> dict | None:
+    definition = TASK_DEFINITIONS[task]
+    data = batch.SerializeToString()
+    for func in definition.mapping:
+        data = func(data, definition.schema)
+    return None if data is None else data.to_pydict()
+
+
+def test_text_classification_skips_empty_texts():
+    batch = ParagraphClassificationBatch()
+    item = batch.data.add(text="first")
+    item.labels.add(labelset="ls", label="a")
+    item.labels.add(labelset="ls", label="b")
+    batch.data.add(text="")
+    batch.data.add(text="third")
+
+    assert convert(Task.PARAGRAPH_CLASSIFICATION, batch) == {
+        "text": ["first", "third"],
+        "labels": [["ls/a", "ls/b"], []],
+    }
+    assert convert(Task.PARAGRAPH_CLASSIFICATION, ParagraphClassificationBatch()) is None
+
+
+def test_sentence_classification_repeats_labels_per_sentence():
+    batch = SentenceClassificationBatch()
+    item = batch.data.add(text=["s1", "s2"])
+    item.labels.add(labelset="ls", label="a")
+    batch.data.add(text=[])
+    batch.data.add(text=["s3"])
+
+    assert convert(Task.SENTENCE_CLASSIFICATION, batch) == {
+        "text": ["s1", "s2", "s3"],
+        "labels": [["ls/a"], ["ls/a"], []],
+    }
+
+
+def test_token_classification():
+    batch = TokenClassificationBatch()
+    batch.data.add(token=["Hello", "Nuclia"], label=["O", "B-ORG"])
+    batch.data.add(token=[], label=[])
+
+    assert convert(Task.TOKEN_CLASSIFICATION, batch) == {
+        "text": [["Hello", "Nuclia"], []],
+        "labels": [["O", "B-ORG"], []],
+    }
+
+
+def test_question_answer_streaming():
+    batch = QuestionAnswerStreamingBatch()
+    item = batch.data.add(cancelled_by_user=True)
+    item.question.text = "question"
+    item.question.language = "en"
+    item.question.paragraphs.extend(["p1", "p2"])
+    item.answer.text = "answer"
+    item.answer.language = "ca"
+
+    assert convert(Task.QUESTION_ANSWER_STREAMING, batch) == {
+        "question": ["question"],
+        "answer": ["answer"],
+        "question_paragraphs": [["p1", "p2"]],
+        "answer_paragraphs": [[]],
+        "question_language": ["en"],
+        "answer_language": ["ca"],
+        "cancelled_by_user": [True],
+    }
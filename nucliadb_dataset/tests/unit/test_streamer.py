@@ -0,0 +1,64 @@
+# Copyright 2025 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+
+from nucliadb_dataset.streamer import FrameReader
+
+
+class FakeRaw:
+    def __init__(self, data: bytes, max_read: int):
+        self.stream = io.BytesIO(data)
+        self.max_read = max_read
+        self.reads = 0
+
+    def read(self, amt: int, decode_content: bool = False) -> bytes:
+        self.reads += 1
+        return self.stream.read(min(amt, self.max_read))
+
+
+def frame(payload: bytes) -> bytes:
+    return len(payload).to_bytes(4, byteorder="big", signed=False) + payload
+
+
+def read_all(reader: FrameReader) -> list[bytes]:
+    frames = []
+    while (payload := reader.read_frame()) is not None:
+        frames.append(payload)
+    return frames
+
+
+def test_frame_reader_reads_many_frames_per_read():
+    payloads = [f"message-{i}".encode() for i in range(100)]
+    raw = FakeRaw(b"".join(frame(p) for p in payloads), max_read=1024 * 1024)
+    reader = FrameReader(raw)
+
+    assert read_all(reader) == payloads
+    # One read with all data and one to detect the end of the stream
+    assert raw.reads == 2
+
+
+def test_frame_reader_frames_split_across_reads():
+    payloads = [b"a" * 10, b"", b"b" * 1000, b"c"]
+    raw = FakeRaw(b"".join(frame(p) for p in payloads), max_read=7)
+    reader = FrameReader(raw, buffer_size=7)
+
+    assert read_all(reader) == payloads
+
+
+def test_frame_reader_incomplete_frame():
+    raw = FakeRaw(frame(b"complete") + frame(b"incomplete")[:-3], max_read=1024)
+    reader = FrameReader(raw)
+
+    assert read_all(reader) == [b"complete"]
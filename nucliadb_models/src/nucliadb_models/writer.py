@@ -184,6 +184,41 @@ class ResourceCreated(BaseModel):
     seqid: int | None = None
 
 
+MAX_RESOURCES_PER_BATCH = 100
+
+
+class CreateResourcesPayload(BaseModel):
+    resources: list[CreateResourcePayload] = Field(
+        min_length=1,
+        max_length=MAX_RESOURCES_PER_BATCH,
+        title="Resources",
+        description=f"Resources to create in the Knowledge Box. At most {MAX_RESOURCES_PER_BATCH} resources can be created in a single request.",
+    )
+
+
+class ResourceCreationResult(BaseModel):
+    uuid: str | None = Field(
+        default=None,
+        description="Id of the created resource. Not set if the resource could not be created.",
+    )
+    elapsed: float | None = None
+    seqid: int | None = None
+    status_code: int = Field(
+        default=201,
+        description="HTTP status code that creating this resource alone would have returned",
+    )
+    error: str | None = Field(
+        default=None,
+        description="Reason why the resource could not be created, if any",
+    )
+
+
+class ResourcesCreated(BaseModel):
+    results: list[ResourceCreationResult] = Field(
+        description="One result per resource in the request, in the same order",
+    )
+
+
 class ResourceUpdated(BaseModel):
     seqid: int | None = None
 
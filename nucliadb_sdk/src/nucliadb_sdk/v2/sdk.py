@@ -13,17 +13,24 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
+import base64
 import enum
 import importlib.metadata
 import inspect
 import io
+import os
+import threading
+import uuid
 import warnings
 from collections.abc import AsyncGenerator, AsyncIterable, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from json import JSONDecodeError
 from typing import (
     Any,
     Awaitable,
+    BinaryIO,
     Literal,
     TypeVar,
 )
@@ -104,8 +111,11 @@ from nucliadb_models.trainset import TrainSetPartitions
 from nucliadb_models.vectorsets import CreatedVectorSet, VectorSetList
 from nucliadb_models.writer import (
     CreateResourcePayload,
+    CreateResourcesPayload,
     ResourceCreated,
     ResourceFieldAdded,
+    ResourceFileUploaded,
+    ResourcesCreated,
     ResourceUpdated,
     UpdateResourcePayload,
 )
@@ -121,6 +131,11 @@ USER_AGENT = f"nucliadb-sdk/{importlib.metadata.version('nucliadb_sdk')}"
 
 QUERY_PARAMS_TYPE = dict[str, str | int | float | bool | list[str]] | None
 
+# Parts of parallel file uploads must be a multiple of 5MB to be accepted by all the
+# storage backends
+UPLOAD_PART_SIZE = 50 * 1024 * 1024
+UPLOAD_CONCURRENCY = 4
+
 
 class Region(enum.Enum):
     EUROPE1 = "europe-1"
@@ -188,6 +203,11 @@ SDK_DEFINITION = {
         method="POST",
         path_params=("kbid",),
     ),
+    "create_resources": SdkEndpointDefinition(
+        path_template="/v1/kb/{kbid}/resources/batch",
+        method="POST",
+        path_params=("kbid",),
+    ),
     "update_resource": SdkEndpointDefinition(
         path_template="/v1/kb/{kbid}/resource/{rid}",
         method="PATCH",
@@ -747,6 +767,99 @@ def prepare_request(
     return path, data
 
 
+def _tus_upload_path(kbid: str, rid: str | None = None, field: str | None = None) -> str:
+    if rid is None:
+        return f"/v1/kb/{kbid}/tusupload"
+    if field is None:
+        field = uuid.uuid4().hex
+    return f"/v1/kb/{kbid}/resource/{rid}/file/{field}/tusupload"
+
+
+class _UploadParts:
+    """
+    Parts of a file to upload. Parts are read when they are uploaded, so only the
+    parts being uploaded are kept in memory.
+    """
+
+    def __init__(self, file: str | os.PathLike | BinaryIO, part_size: int):
+        if part_size <= 0 or part_size % (5 * 1024 * 1024) != 0:
+            raise ValueError("part_size must be a positive multiple of 5MB")
+        self.part_size = part_size
+        self._lock = threading.Lock()
+        self._path: str | os.PathLike | None = None
+        self._file: BinaryIO | None = None
+        if isinstance(file, (str, os.PathLike)):
+            self._path = file
+            self._start = 0
+            size = os.path.getsize(file)
+        else:
+            if not file.seekable():
+                raise ValueError("file must be seekable")
+            self._file = file
+            self._start = file.tell()
+            size = file.seek(0, io.SEEK_END) - self._start
+        self.count = max(1, -(-size // part_size))
+
+    def read(self, index: int) -> bytes:
+        offset = self._start + index * self.part_size
+        if self._file is None:
+            assert self._path is not None
+            with open(self._path, "rb") as f:
+                f.seek(offset)
+                return f.read(self.part_size)
+        # File objects are shared by the parts uploaded concurrently
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(self.part_size)
+
+
+def _tus_partial_upload_headers(part: bytes) -> dict[str, str]:
+    return {
+        "tus-resumable": "1.0.0",
+        "upload-concat": "partial",
+        "upload-length": str(len(part)),
+    }
+
+
+def _tus_patch_headers() -> dict[str, str]:
+    return {
+        "tus-resumable": "1.0.0",
+        "upload-offset": "0",
+        "content-type": "application/offset+octet-stream",
+    }
+
+
+def _tus_upload_id(response: httpx.Response) -> str:
+    return response.headers["location"].rstrip("/").rsplit("/", 1)[-1]
+
+
+def _tus_final_upload_headers(
+    kbid: str, upload_ids: list[str], filename: str | None, content_type: str
+) -> dict[str, str]:
+    metadata = {"content_type": content_type}
+    if filename is not None:
+        metadata["filename"] = filename
+    return {
+        "tus-resumable": "1.0.0",
+        "upload-concat": "final;"
+        + " ".join(f"/v1/kb/{kbid}/tusupload/{upload_id}" for upload_id in upload_ids),
+        "upload-metadata": ",".join(
+            f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in metadata.items()
+        ),
+        "content-type": content_type,
+    }
+
+
+def _tus_upload_result(response: httpx.Response) -> ResourceFileUploaded:
+    field_path = response.headers["ndb-field"].split("/")
+    seqid = response.headers.get("ndb-seq")
+    return ResourceFileUploaded(
+        seqid=int(seqid) if seqid and seqid != "None" else None,
+        uuid=field_path[-3],
+        field_id=field_path[-1],
+    )
+
+
 def _request_sync_builder(
     name: str,
     request_type: type[INPUT_TYPE],
@@ -1180,6 +1293,52 @@ class NucliaDB(_NucliaDBBase):
 
         return iter_bytes
 
+    def upload_file(
+        self,
+        *,
+        kbid: str,
+        file: str | os.PathLike | BinaryIO,
+        filename: str | None = None,
+        content_type: str = "application/octet-stream",
+        rid: str | None = None,
+        field: str | None = None,
+        part_size: int = UPLOAD_PART_SIZE,
+        concurrency: int = UPLOAD_CONCURRENCY,
+    ) -> ResourceFileUploaded:
+        """
+        Upload a file as a file field. A new resource is created unless `rid` is given.
+
+        `file` is a path or a seekable binary file object, uploaded from its current
+        position. It is split in parts of `part_size` bytes that are read and uploaded
+        in parallel as TUS partial uploads and concatenated on the server once all are
+        uploaded.
+        """
+        parts = _UploadParts(file, part_size)
+
+        def upload_part(index: int) -> str:
+            part = parts.read(index)
+            response = self._request(
+                _tus_upload_path(kbid), "POST", extra_headers=_tus_partial_upload_headers(part)
+            )
+            upload_id = _tus_upload_id(response)
+            self._request(
+                f"{_tus_upload_path(kbid)}/{upload_id}",
+                "PATCH",
+                content=part,
+                extra_headers=_tus_patch_headers(),
+            )
+            return upload_id
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            upload_ids = list(executor.map(upload_part, range(parts.count)))
+
+        response = self._request(
+            _tus_upload_path(kbid, rid, field),
+            "POST",
+            extra_headers=_tus_final_upload_headers(kbid, upload_ids, filename, content_type),
+        )
+        return _tus_upload_result(response)
+
     create_knowledge_box = _request_sync_builder(
         "create_knowledge_box", KnowledgeBoxConfig, KnowledgeBoxObj
     )
@@ -1193,6 +1352,9 @@ class NucliaDB(_NucliaDBBase):
     exists_resource = _request_bool_sync_builder("exists_resource")
     exists_resource_by_slug = _request_bool_sync_builder("exists_resource_by_slug")
     create_resource = _request_sync_builder("create_resource", CreateResourcePayload, ResourceCreated)
+    create_resources = _request_sync_builder(
+        "create_resources", CreateResourcesPayload, ResourcesCreated
+    )
     update_resource = _request_sync_builder("update_resource", UpdateResourcePayload, ResourceUpdated)
     update_resource_by_slug = _request_sync_builder(
         "update_resource_by_slug", UpdateResourcePayload, ResourceUpdated
@@ -1405,6 +1567,53 @@ class NucliaDBAsync(_NucliaDBBase):
 
         return iter_bytes
 
+    async def upload_file(
+        self,
+        *,
+        kbid: str,
+        file: str | os.PathLike | BinaryIO,
+        filename: str | None = None,
+        content_type: str = "application/octet-stream",
+        rid: str | None = None,
+        field: str | None = None,
+        part_size: int = UPLOAD_PART_SIZE,
+        concurrency: int = UPLOAD_CONCURRENCY,
+    ) -> ResourceFileUploaded:
+        """
+        Upload a file as a file field. A new resource is created unless `rid` is given.
+
+        `file` is a path or a seekable binary file object, uploaded from its current
+        position. It is split in parts of `part_size` bytes that are read and uploaded
+        in parallel as TUS partial uploads and concatenated on the server once all are
+        uploaded.
+        """
+        parts = _UploadParts(file, part_size)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload_part(index: int) -> str:
+            async with semaphore:
+                part = await asyncio.to_thread(parts.read, index)
+                response = await self._request(
+                    _tus_upload_path(kbid), "POST", extra_headers=_tus_partial_upload_headers(part)
+                )
+                upload_id = _tus_upload_id(response)
+                await self._request(
+                    f"{_tus_upload_path(kbid)}/{upload_id}",
+                    "PATCH",
+                    content=part,
+                    extra_headers=_tus_patch_headers(),
+                )
+                return upload_id
+
+        upload_ids = await asyncio.gather(*(upload_part(index) for index in range(parts.count)))
+
+        response = await self._request(
+            _tus_upload_path(kbid, rid, field),
+            "POST",
+            extra_headers=_tus_final_upload_headers(kbid, upload_ids, filename, content_type),
+        )
+        return _tus_upload_result(response)
+
     create_knowledge_box = _request_async_builder(
         "create_knowledge_box", KnowledgeBoxConfig, KnowledgeBoxObj
     )
@@ -1418,6 +1627,9 @@ class NucliaDBAsync(_NucliaDBBase):
     exists_resource = _request_bool_async_builder("exists_resource")
     exists_resource_by_slug = _request_bool_async_builder("exists_resource_by_slug")
     create_resource = _request_async_builder("create_resource", CreateResourcePayload, ResourceCreated)
+    create_resources = _request_async_builder(
+        "create_resources", CreateResourcesPayload, ResourcesCreated
+    )
     update_resource = _request_async_builder("update_resource", UpdateResourcePayload, ResourceUpdated)
     update_resource_by_slug = _request_async_builder(
         "update_resource_by_slug", UpdateResourcePayload, ResourceUpdated
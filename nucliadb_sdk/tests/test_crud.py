@@ -106,3 +106,54 @@ def test_modify_resource_slug(kb: KnowledgeBoxObj, sdk: nucliadb_sdk.NucliaDB):
         slug="my-next-new-slug",
     )
     assert resource.slug == "my-next-new-slug"
+
+
+def test_create_resources(kb: KnowledgeBoxObj, sdk: nucliadb_sdk.NucliaDB):
+    sdk.create_resource(kbid=kb.uuid, slug="taken")
+
+    created = sdk.create_resources(
+        kbid=kb.uuid,
+        resources=[
+            {"slug": "batch1", "texts": {"text": {"body": "First"}}},
+            {"slug": "taken"},
+            {"slug": "batch2", "texts": {"text": {"body": "Second"}}},
+            {"slug": "batch1"},
+        ],
+    )
+    assert [result.status_code for result in created.results] == [201, 409, 201, 409]
+    assert created.results[1].uuid is None
+    assert created.results[3].uuid is None
+
+    for idx, slug in ((0, "batch1"), (2, "batch2")):
+        resource = sdk.get_resource_by_slug(kbid=kb.uuid, slug=slug)
+        assert resource.id == created.results[idx].uuid
+
+
+def test_upload_file(kb: KnowledgeBoxObj, sdk: nucliadb_sdk.NucliaDB, tmp_path):
+    part_size = 5 * 1024 * 1024
+    content = b"x" * part_size + b"y" * 100
+    path = tmp_path / "data.bin"
+    path.write_bytes(content)
+
+    uploaded = sdk.upload_file(
+        kbid=kb.uuid, file=path, filename="data.bin", part_size=part_size, concurrency=2
+    )
+    assert uploaded.uuid is not None
+    assert uploaded.field_id is not None
+
+    field = sdk.get_resource_field(
+        kbid=kb.uuid, rid=uploaded.uuid, field_type="file", field_id=uploaded.field_id
+    )
+    assert field.value.file.filename == "data.bin"
+    assert field.value.file.size == len(content)
+
+    # File objects are uploaded from their current position
+    with path.open("rb") as f:
+        f.seek(100)
+        uploaded = sdk.upload_file(
+            kbid=kb.uuid, file=f, filename="data.bin", part_size=part_size, concurrency=2
+        )
+    field = sdk.get_resource_field(
+        kbid=kb.uuid, rid=uploaded.uuid, field_type="file", field_id=uploaded.field_id
+    )
+    assert field.value.file.size == len(content) - 100
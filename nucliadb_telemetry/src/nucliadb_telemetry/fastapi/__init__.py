@@ -25,6 +25,7 @@ from prometheus_client import CONTENT_TYPE_LATEST
 from starlette.responses import PlainTextResponse
 
 from nucliadb_telemetry.fastapi.metrics import PrometheusMiddleware
+from nucliadb_telemetry.fastapi.timings import RequestTimingsMiddleware
 from nucliadb_telemetry.fastapi.tracing import (
     CaptureTraceIdMiddleware,
     OpenTelemetryMiddleware,
@@ -87,6 +88,9 @@ def instrument_app(
         # so the capture middleware needs to be added before.
         app.add_middleware(CaptureTraceIdMiddleware)
 
+    if telemetry_settings.request_timings_enabled():
+        app.add_middleware(RequestTimingsMiddleware)
+
     app.add_middleware(ContextInjectorMiddleware)
     if tracer_provider is not None:
         app.add_middleware(
@@ -0,0 +1,91 @@
+# Copyright 2025 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import random
+
+from starlette.background import BackgroundTask, BackgroundTasks
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from nucliadb_telemetry.settings import telemetry_settings
+from nucliadb_telemetry.timings import RequestTimings, request_timings
+
+from .utils import get_path_template
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class RequestTimingsMiddleware(BaseHTTPMiddleware):
+    """
+    Track the latency breakdown of each request (see `nucliadb_telemetry.timings`)
+    and expose it in a `Server-Timing` header and/or a sampled log for slow
+    requests, depending on the telemetry settings.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        found_path_template = get_path_template(request.scope)
+        if not found_path_template.match:
+            return await call_next(request)
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        try:
+            response = await call_next(request)
+        finally:
+            # The request task already holds a copy of the context, so it keeps
+            # recording into `timings` while the response is streamed
+            request_timings.reset(token)
+
+        if telemetry_settings.server_timing_header:
+            response.headers[SERVER_TIMING_HEADER] = timings.server_timing()
+
+        if telemetry_settings.slow_request_log_threshold is not None:
+            # Run once the response has been sent, so streamed responses are
+            # fully accounted for
+            task = BackgroundTask(
+                log_slow_request,
+                request.method,
+                found_path_template.path,
+                response.status_code,
+                timings,
+            )
+            if response.background is None:
+                response.background = task
+            else:
+                response.background = BackgroundTasks([response.background, task])
+
+        return response
+
+
+def log_slow_request(method: str, path_template: str, status_code: int, timings: RequestTimings):
+    threshold = telemetry_settings.slow_request_log_threshold
+    if threshold is None or timings.elapsed() < threshold:
+        return
+    if random.random() >= telemetry_settings.slow_request_log_sample_rate:
+        return
+    logger.warning(
+        "Slow request: %s %s",
+        method,
+        path_template,
+        extra={
+            "method": method,
+            "path_template": path_template,
+            "status_code": status_code,
+            "timings": timings.to_dict(),
+        },
+    )
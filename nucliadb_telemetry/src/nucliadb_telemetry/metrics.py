@@ -23,6 +23,8 @@ from typing import TYPE_CHECKING, Any, Literal, TypeVar
 import prometheus_client
 from typing_extensions import assert_never
 
+from nucliadb_telemetry import timings
+
 if TYPE_CHECKING:  # pragma: no cover
     from traceback import StackSummary
 else:
@@ -49,6 +51,7 @@ class Observer:
         labels: dict[str, str] | None = None,
         buckets: list[float] | None = None,
     ):
+        self.name = name
         self.error_mappings = error_mappings or {}
         self.labels = labels or {}
 
@@ -142,6 +145,15 @@ class ObserverRecorder:
 
         self.observer.counter.labels(status=status, **self.labels).inc()
 
+        request_timings = timings.get_request_timings()
+        if request_timings is not None:
+            request_timings.record_duration(self.timing_name(), finished - self._start)
+
+    def timing_name(self) -> str:
+        # e.g. predict_engine.query for Observer("predict_engine", labels={"type": "query"})
+        values = [value for key, value in self.labels.items() if key != _VERSION_METRIC and value]
+        return ".".join([self.observer.name, *values])
+
     def __enter__(self):
         self.start()
         return self
@@ -47,9 +47,37 @@ class TelemetrySettings(BaseSettings):
         ),
     )
 
+    server_timing_header: bool = pydantic.Field(
+        default=False,
+        description=(
+            "Add a Server-Timing header to HTTP responses with the per-phase "
+            "latency breakdown of the request (index search, predict calls, "
+            "hydration...)"
+        ),
+    )
+
+    slow_request_log_threshold: float | None = pydantic.Field(
+        default=None,
+        gt=0,
+        description=(
+            "Requests slower than this many seconds are logged with their "
+            "per-phase latency breakdown. Disabled if not set"
+        ),
+    )
+
+    slow_request_log_sample_rate: float = pydantic.Field(
+        default=1.0,
+        ge=0,
+        le=1,
+        description="Fraction of slow requests to log",
+    )
+
     def tracing_enabled(self) -> bool:
         return self.otlp_collector_endpoint is not None
 
+    def request_timings_enabled(self) -> bool:
+        return self.server_timing_header or self.slow_request_log_threshold is not None
+
 
 telemetry_settings = TelemetrySettings()
 
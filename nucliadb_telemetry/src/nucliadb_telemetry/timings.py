@@ -0,0 +1,98 @@
+# Copyright 2025 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ABOUT
+# Request scoped latency breakdown. Code in the request path records phase
+# durations and counters here. Operators can then attribute the latency of a
+# single request to a specific phase without reproducing it. Recording only
+# happens while a request is being tracked (see
+# `nucliadb_telemetry.fastapi.timings`); otherwise, it's a no-op.
+#
+import contextvars
+import re
+import time
+
+_INVALID_TOKEN_CHARS = re.compile(r"[^A-Za-z0-9!#$%&'*+\-.^_`|~]")
+
+
+class RequestTimings:
+    def __init__(self) -> None:
+        self.start = time.monotonic()
+        # phase -> (accumulated duration in seconds, number of calls)
+        self.durations: dict[str, tuple[float, int]] = {}
+        self.values: dict[str, int | float] = {}
+
+    def record_duration(self, name: str, seconds: float) -> None:
+        total, calls = self.durations.get(name, (0.0, 0))
+        self.durations[name] = (total + seconds, calls + 1)
+
+    def increment(self, name: str, value: int | float = 1) -> None:
+        self.values[name] = self.values.get(name, 0) + value
+
+    def set_value(self, name: str, value: int | float) -> None:
+        self.values[name] = value
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def server_timing(self) -> str:
+        """Render the breakdown as a `Server-Timing` header value. Durations
+        are in milliseconds, as the spec mandates, and values go in the
+        description of a duration-less metric.
+        """
+        metrics = [f"total;dur={self.elapsed() * 1000:.1f}"]
+        for name, (total, _) in self.durations.items():
+            metrics.append(f"{_token(name)};dur={total * 1000:.1f}")
+        for name, value in self.values.items():
+            metrics.append(f'{_token(name)};desc="{value}"')
+        return ", ".join(metrics)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "duration": self.elapsed(),
+            "phases": {
+                name: {"duration": total, "calls": calls}
+                for name, (total, calls) in self.durations.items()
+            },
+            "values": self.values,
+        }
+
+
+request_timings = contextvars.ContextVar[RequestTimings | None]("request_timings", default=None)
+
+
+def get_request_timings() -> RequestTimings | None:
+    return request_timings.get()
+
+
+def record_duration(name: str, seconds: float) -> None:
+    timings = request_timings.get()
+    if timings is not None:
+        timings.record_duration(name, seconds)
+
+
+def increment(name: str, value: int | float = 1) -> None:
+    timings = request_timings.get()
+    if timings is not None:
+        timings.increment(name, value)
+
+
+def set_value(name: str, value: int | float) -> None:
+    timings = request_timings.get()
+    if timings is not None:
+        timings.set_value(name, value)
+
+
+def _token(name: str) -> str:
+    return _INVALID_TOKEN_CHARS.sub("_", name)
@@ -0,0 +1,88 @@
+# Copyright 2025 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from nucliadb_telemetry import timings
+from nucliadb_telemetry.fastapi.timings import RequestTimingsMiddleware
+from nucliadb_telemetry.settings import telemetry_settings
+
+app = FastAPI()
+app.add_middleware(RequestTimingsMiddleware)
+
+
+@app.get("/api/v1/kb/{kbid}/find")
+async def find(kbid: str):
+    timings.record_duration("index_search", 0.01)
+    timings.record_duration("predict_engine.query", 0.02)
+    timings.record_duration("predict_engine.query", 0.03)
+    timings.increment("augmentor.resources", 5)
+    return {"kbid": kbid}
+
+
+def client() -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test/api/v1")
+
+
+async def test_server_timing_header():
+    with patch.object(telemetry_settings, "server_timing_header", True):
+        resp = await client().get("/kb/123/find")
+
+    metrics = [metric.strip() for metric in resp.headers["Server-Timing"].split(",")]
+    assert metrics[0].startswith("total;dur=")
+    assert "index_search;dur=10.0" in metrics
+    assert "predict_engine.query;dur=50.0" in metrics
+    assert 'augmentor.resources;desc="5"' in metrics
+
+
+async def test_server_timing_header_is_opt_in():
+    resp = await client().get("/kb/123/find")
+    assert "Server-Timing" not in resp.headers
+
+
+async def test_slow_request_log():
+    with (
+        patch.object(telemetry_settings, "slow_request_log_threshold", 0.000001),
+        patch("nucliadb_telemetry.fastapi.timings.logger") as logger,
+    ):
+        # the transport waits for background tasks to finish
+        await client().get("/kb/123/find")
+
+    logger.warning.assert_called_once()
+    extra = logger.warning.call_args.kwargs["extra"]
+    assert extra["path_template"] == "/api/v1/kb/{kbid}/find"
+    assert extra["status_code"] == 200
+    assert extra["timings"]["phases"]["predict_engine.query"]["calls"] == 2
+    assert extra["timings"]["values"] == {"augmentor.resources": 5}
+
+
+async def test_slow_request_log_sampling():
+    with (
+        patch.object(telemetry_settings, "slow_request_log_threshold", 0.000001),
+        patch.object(telemetry_settings, "slow_request_log_sample_rate", 0),
+        patch("nucliadb_telemetry.fastapi.timings.logger") as logger,
+    ):
+        await client().get("/kb/123/find")
+
+    logger.warning.assert_not_called()
+
+
+def test_recording_outside_a_request_is_a_noop():
+    assert timings.get_request_timings() is None
+    timings.record_duration("index_search", 0.01)
+    timings.increment("augmentor.resources")
+    assert timings.get_request_timings() is None
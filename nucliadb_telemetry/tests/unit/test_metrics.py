@@ -19,7 +19,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from nucliadb_telemetry import metrics
+from nucliadb_telemetry import metrics, timings
 from nucliadb_telemetry.metrics import instrument_garbage_collector
 
 
@@ -58,6 +58,18 @@ class TestObserver:
         counter.labels.assert_called_once_with(status="my_error")
         counter.labels().inc.assert_called_once()
 
+    def test_observer_records_request_timings(self):
+        observer = metrics.Observer("my_metric", labels={"type": ""})
+        request_timings = timings.RequestTimings()
+        token = timings.request_timings.set(request_timings)
+        try:
+            with observer(labels={"type": "query"}):
+                pass
+        finally:
+            timings.request_timings.reset(token)
+
+        assert request_timings.durations["my_metric.query"][1] == 1
+
     def test_sync_decorator(self, histogram, counter):
         observer = metrics.Observer("my_metric")
 
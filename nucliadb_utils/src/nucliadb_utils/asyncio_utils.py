@@ -12,11 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
-from collections.abc import Coroutine
+import contextlib
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Coroutine
 from typing import Any, Sequence
 
+from nucliadb_telemetry import metrics
 from nucliadb_utils import logger
 
+adaptive_limit_gauge = metrics.Gauge("nucliadb_adaptive_concurrency_limit", labels={"limiter": ""})
+adaptive_in_flight_gauge = metrics.Gauge(
+    "nucliadb_adaptive_concurrency_in_flight", labels={"limiter": ""}
+)
+adaptive_queue_depth_gauge = metrics.Gauge(
+    "nucliadb_adaptive_concurrency_queue_depth", labels={"limiter": ""}
+)
+
 
 class ConcurrentRunner:
     """
@@ -71,3 +83,144 @@ async def run_concurrently(tasks: Sequence[Coroutine], max_concurrent: int | Non
     for task in tasks:
         runner.schedule(task)
     return await runner.wait()
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter whose limit adapts to the latency of the operations it
+    guards, following AIMD (as TCP congestion control does):
+
+    - an operation faster than `latency_threshold` grows the limit by 1/limit
+      (i.e., by one every limit operations) while the limit is being hit.
+    - a slower one shrinks it by `backoff_ratio`, at most once every
+      `latency_threshold` seconds, so the burst of slow operations started
+      under the previous limit doesn't collapse it.
+
+    Meant to be shared process-wide, so all requests back off together when the
+    guarded backend slows down. Use it as `async with limiter.slot(): ...`, or
+    through a RequestLimiter so a single request can't take all the slots.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_threshold: float,
+        backoff_ratio: float = 0.75,
+    ):
+        assert 0 < backoff_ratio < 1
+        self.name = name
+        # Limits come from settings that can be changed independently, clamp
+        # them instead of failing when they are inconsistent
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = min(max(min_limit, 1), self.max_limit)
+        initial_limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.latency_threshold = latency_threshold
+        self.backoff_ratio = backoff_ratio
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._last_backoff = 0.0
+        self._report()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self._acquire()
+        start = time.monotonic()
+        cancelled = False
+        try:
+            yield
+        except asyncio.CancelledError:
+            # a cancelled operation tells nothing about the backend latency
+            cancelled = True
+            raise
+        finally:
+            self._release(None if cancelled else time.monotonic() - start)
+
+    async def _acquire(self) -> None:
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            self._report()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._report()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # we were handed a slot right before being cancelled, give it back
+                self._release(None)
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+                self._report()
+            raise
+
+    def _release(self, latency: float | None) -> None:
+        saturated = self._in_flight >= self.limit
+        self._in_flight -= 1
+        if latency is not None:
+            self._adapt(latency, saturated)
+        self._wake()
+        self._report()
+
+    def _adapt(self, latency: float, saturated: bool) -> None:
+        if latency > self.latency_threshold:
+            now = time.monotonic()
+            if now - self._last_backoff >= self.latency_threshold:
+                self._last_backoff = now
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif saturated:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _report(self) -> None:
+        labels = {"limiter": self.name}
+        adaptive_limit_gauge.set(self.limit, labels=labels)
+        adaptive_in_flight_gauge.set(self._in_flight, labels=labels)
+        adaptive_queue_depth_gauge.set(len(self._waiters), labels=labels)
+
+
+class RequestLimiter:
+    """
+    Concurrency limit of the operations of a single request. When `shared` is
+    given, each operation also takes a slot of that process-wide limiter, and a
+    single request can't hold more than `max_ops` of its slots.
+    """
+
+    def __init__(self, max_ops: int, *, shared: AdaptiveLimiter | None = None):
+        self._semaphore = asyncio.Semaphore(max(max_ops, 1))
+        self._shared = shared
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._semaphore:
+            if self._shared is None:
+                yield
+            else:
+                async with self._shared.slot():
+                    yield
@@ -14,6 +14,8 @@
 class PubSubChannels:
     # stream that ingest/node publishes to for information
     RESOURCE_NOTIFY = "notify.{kbid}"
+    # writers publish here when a KB config or its kv schemas change
+    KB_CACHE_INVALIDATE = "kbcache.{kbid}"
 
 
 class Streams:
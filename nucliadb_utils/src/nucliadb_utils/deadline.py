@@ -0,0 +1,107 @@
+# Copyright 2021 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Request deadlines: a single time budget for everything done on behalf of a
+# request. The API sets it when the request arrives and calls to external
+# services (nidx, predict, storage...) derive their timeouts from the time left,
+# so work for a request whose client already gave up is cancelled promptly.
+#
+import asyncio
+import contextvars
+import time
+from collections.abc import AsyncIterator, Awaitable
+from typing import TypeVar
+
+from nucliadb_utils.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+_deadline = contextvars.ContextVar[float | None]("deadline", default=None)
+
+
+def set_deadline(timeout: float) -> None:
+    """Set the deadline of the current context `timeout` seconds from now. An
+    existing deadline can only be shortened.
+    """
+    deadline = time.monotonic() + timeout
+    current = _deadline.get()
+    if current is None or deadline < current:
+        _deadline.set(deadline)
+
+
+def remaining() -> float | None:
+    """Seconds left until the deadline, or None if there's no deadline"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def exceeded() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def get_timeout(timeout: float | None = None) -> float | None:
+    """Timeout to use for an operation: `timeout` bounded by the time left until
+    the deadline. Raises DeadlineExceededError if there's no time left.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceededError()
+    if timeout is None:
+        return left
+    return min(timeout, left)
+
+
+async def wait_for(aw: Awaitable[T], timeout: float | None = None) -> T:
+    """Like `asyncio.wait_for`, bounded by the deadline as well. Timeouts caused
+    by the deadline raise DeadlineExceededError.
+    """
+    try:
+        timeout = get_timeout(timeout)
+    except DeadlineExceededError:
+        if asyncio.iscoroutine(aw):
+            aw.close()
+        raise
+    try:
+        return await asyncio.wait_for(aw, timeout)
+    except asyncio.TimeoutError:
+        if exceeded():
+            raise DeadlineExceededError() from None
+        raise
+
+
+async def iter_until_deadline(iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Iterate `iterator` bounding every step by the time left until the
+    deadline.
+    """
+    if _deadline.get() is None:
+        async for item in iterator:
+            yield item
+        return
+
+    try:
+        while True:
+            try:
+                item = await wait_for(iterator.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+
 
 class SendToProcessError(Exception):
     pass
@@ -25,3 +27,7 @@ class LimitsExceededError(Exception):
 
 class ConfigurationError(Exception):
     pass
+
+
+class DeadlineExceededError(asyncio.TimeoutError):
+    pass
@@ -121,6 +121,15 @@ class StorageSettings(BaseSettings):
         default=3,
         description="Number of days that uploaded files are kept in Nulia's processing engine",
     )
+    direct_downloads: bool = Field(
+        default=False,
+        description="Serve binary file downloads without proxying their contents through the API. S3, GCS and Azure answer with a redirect to a short-lived signed URL, the local backend sends the file straight from disk. Falls back to proxying if the backend credentials can't sign URLs.",
+    )
+    direct_downloads_url_expiration: int = Field(
+        default=300,
+        gt=0,
+        description="Seconds the signed URLs used for direct downloads are valid",
+    )
 
     azure_account_url: str | None = Field(
         default=None,
@@ -17,11 +17,18 @@ from __future__ import annotations
 import base64
 import logging
 from collections.abc import AsyncGenerator, AsyncIterator
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.exceptions import AzureError, ResourceExistsError, ResourceNotFoundError
 from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobProperties, BlobType, ContentSettings
+from azure.storage.blob import (
+    BlobProperties,
+    BlobSasPermissions,
+    BlobType,
+    ContentSettings,
+    UserDelegationKey,
+    generate_blob_sas,
+)
 from azure.storage.blob.aio import BlobServiceClient
 
 from nucliadb_protos.resources_pb2 import CloudFile
@@ -34,6 +41,9 @@ logger = logging.getLogger(__name__)
 
 ops_observer = metrics.Observer("azure_ops", labels={"type": ""})
 
+# Max number of sub-requests accepted by a blob batch request
+MAX_BATCH_DELETE = 256
+
 
 class AzureStorageField(StorageField):
     storage: AzureStorage
@@ -204,6 +214,9 @@ class AzureStorage(Storage):
         except KeyError:
             pass
 
+    async def delete_objects(self, bucket: str, keys: list[str]) -> list[str]:
+        return await self.object_store_for_bucket(bucket).delete_many(bucket, keys)
+
     async def create_bucket(self, bucket_name: str, kbid: str | None = None):
         if await self.object_store_for_bucket(bucket_name).bucket_exists(bucket_name):
             return
@@ -234,12 +247,31 @@ class AzureStorage(Storage):
     async def insert_object(self, bucket: str, key: str, data: bytes) -> None:
         await self.object_store_for_bucket(bucket).insert(bucket, key, data)
 
+    async def presigned_url(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        expires_in: int,
+        content_type: str | None = None,
+        content_disposition: str | None = None,
+    ) -> str | None:
+        return await self.object_store_for_bucket(bucket).presigned_url(
+            bucket,
+            key,
+            expires_in=expires_in,
+            content_type=content_type,
+            content_disposition=content_disposition,
+        )
+
 
 class AzureObjectStore(ObjectStore):
     def __init__(self, account_url: str, connection_string: str | None = None):
         self.account_url = account_url
         self.connection_string = connection_string
         self._service_client: BlobServiceClient | None = None
+        self._user_delegation_key: UserDelegationKey | None = None
+        self._user_delegation_key_expiry: datetime | None = None
 
     @property
     def service_client(self) -> BlobServiceClient:
@@ -336,6 +368,37 @@ class AzureObjectStore(ObjectStore):
         except ResourceNotFoundError:
             raise KeyError(f"Not found: {bucket}/{key}")
 
+    @ops_observer.wrap({"type": "delete_many"})
+    async def delete_many(self, bucket: str, keys: list[str]) -> list[str]:
+        """
+        Delete many blobs using blob batch requests. Missing blobs are ignored.
+        Returns the keys that could not be deleted.
+        """
+        container_client = self.service_client.get_container_client(bucket)
+        failed: list[str] = []
+        for i in range(0, len(keys), MAX_BATCH_DELETE):
+            chunk = keys[i : i + MAX_BATCH_DELETE]
+            try:
+                responses = await container_client.delete_blobs(
+                    *chunk,
+                    delete_snapshots="include",
+                    raise_on_any_failure=False,
+                )
+                # Sub-responses come in the same order as the blobs of the request
+                statuses = [response.status_code async for response in responses]
+            except AzureError:
+                logger.warning("Error deleting blobs", exc_info=True, extra={"bucket": bucket})
+                failed.extend(chunk)
+                continue
+            for key, status in zip(chunk, statuses):
+                if status not in (200, 202, 404):
+                    logger.warning(
+                        "Error deleting blob in batch",
+                        extra={"bucket": bucket, "key": key, "status": status},
+                    )
+                    failed.append(key)
+        return failed
+
     @ops_observer.wrap({"type": "upload"})
     async def upload(
         self,
@@ -351,7 +414,7 @@ class AzureObjectStore(ObjectStore):
             metadata.size = length
         else:
             length = metadata.size or None
-        custom_metadata = {key: str(value) for key, value in metadata.model_dump().items()}
+        custom_metadata = {key: str(value) for key, value in metadata.custom_metadata().items()}
         await container_client.upload_blob(
             name=key,
             data=data,
@@ -420,6 +483,53 @@ class AzureObjectStore(ObjectStore):
         except ResourceNotFoundError:
             raise KeyError(f"Not found: {bucket}/{key}")
 
+    @ops_observer.wrap({"type": "presigned_url"})
+    async def presigned_url(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        expires_in: int,
+        content_type: str | None = None,
+        content_disposition: str | None = None,
+    ) -> str:
+        now = datetime.now(timezone.utc)
+        expiry = now + timedelta(seconds=expires_in)
+        # Shared key credentials (connection strings) sign locally. Otherwise, sign with
+        # a user delegation key, which needs a request to Azure, so it is reused for a day.
+        account_key = getattr(self.service_client.credential, "account_key", None)
+        user_delegation_key = None
+        if account_key is None:
+            user_delegation_key = await self._get_user_delegation_key(now, expiry)
+        sas = generate_blob_sas(
+            account_name=self.service_client.account_name,  # type: ignore[arg-type]
+            container_name=bucket,
+            blob_name=key,
+            account_key=account_key,
+            user_delegation_key=user_delegation_key,
+            permission=BlobSasPermissions(read=True),
+            # Tolerate some clock skew between us and Azure
+            start=now - timedelta(minutes=5),
+            expiry=expiry,
+            content_type=content_type,
+            content_disposition=content_disposition,
+        )
+        blob_url = self.service_client.get_blob_client(bucket, key).url
+        return f"{blob_url}?{sas}"
+
+    async def _get_user_delegation_key(self, now: datetime, expiry: datetime) -> UserDelegationKey:
+        if (
+            self._user_delegation_key is None
+            or self._user_delegation_key_expiry is None
+            or self._user_delegation_key_expiry < expiry
+        ):
+            key_expiry = max(now + timedelta(days=1), expiry)
+            self._user_delegation_key = await self.service_client.get_user_delegation_key(
+                key_start_time=now - timedelta(minutes=5), key_expiry_time=key_expiry
+            )
+            self._user_delegation_key_expiry = key_expiry
+        return self._user_delegation_key
+
     @ops_observer.wrap({"type": "multipart_start"})
     async def upload_multipart_start(self, bucket: str, key: str, metadata: ObjectMetadata) -> None:
         container_client = self.service_client.get_container_client(bucket)
@@ -475,4 +585,6 @@ def parse_object_metadata(properties: BlobProperties, key: str) -> ObjectMetadat
         filename=filename,
         size=size,
         content_type=content_type,
+        etag=properties.etag.strip('"') if properties.etag else None,
+        last_modified=properties.last_modified,
     )
@@ -65,3 +65,14 @@ class UnparsableResponse(Exception):
     Raised when trying to parse a response from a storage API and it's not
     possible
     """
+
+
+class CouldNotDeleteObjects(Exception):
+    """
+    Raised when some objects of a bucket could not be deleted
+    """
+
+    def __init__(self, bucket: str, keys: list[str]):
+        self.bucket = bucket
+        self.keys = keys
+        super().__init__(f"Could not delete {len(keys)} objects from {bucket}")
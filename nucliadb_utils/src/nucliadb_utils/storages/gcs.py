@@ -15,14 +15,17 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
 import json
+import re
 import socket
+import uuid
 from collections.abc import AsyncGenerator, AsyncIterator
 from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, cast
-from urllib.parse import quote_plus
+from urllib.parse import quote, quote_plus
 
 import aiohttp
 import aiohttp.client_exceptions
@@ -59,9 +62,20 @@ MB = 1024 * KB
 MIN_UPLOAD_SIZE = 256 * KB
 OBJECT_DATA_CHUNK_SIZE = 1 * MB
 
+DEFAULT_URL = "https://www.googleapis.com"
+SIGNED_URL_HOST = "storage.googleapis.com"
+SIGNED_URL_MAX_EXPIRATION = 7 * 24 * 3600
+
 
 DEFAULT_SCOPES = ["https://www.googleapis.com/auth/devstorage.read_write"]
 MAX_TRIES = 4
+# Max number of calls accepted by a single batch request
+MAX_BATCH_CALLS = 100
+# Status of each call in a batch response, along with the Content-ID of the call
+BATCH_RESPONSE_STATUS = re.compile(
+    rb"Content-ID: *<response-(\d+)>.*?^HTTP/\d(?:\.\d)? (\d{3})",
+    re.MULTILINE | re.DOTALL | re.IGNORECASE,
+)
 
 POLICY_DELETE = {
     "lifecycle": {
@@ -438,7 +452,7 @@ class GCSStorage(Storage):
         deadletter_bucket: str | None = None,
         indexing_bucket: str | None = None,
         labels: dict[str, str] | None = None,
-        url: str = "https://www.googleapis.com",
+        url: str = DEFAULT_URL,
         scopes: list[str] | None = None,
         anonymous: bool = False,
     ):
@@ -476,6 +490,9 @@ class GCSStorage(Storage):
         self._executor = executor
         self._upload_url = url + "/upload/storage/v1/b/{bucket}/o"
         self.object_base_url = url + "/storage/v1/b"
+        # Signed URLs are served by Google's XML API, not by custom endpoints (e.g. emulators)
+        self._can_sign_urls = url == DEFAULT_URL
+        self._batch_url = url + "/batch/storage/v1"
         self._session = None
 
     def _get_access_token(self):
@@ -523,6 +540,33 @@ class GCSStorage(Storage):
         token = await loop.run_in_executor(self._executor, self._get_access_token)
         return {"AUTHORIZATION": f"Bearer {token}"}
 
+    async def presigned_url(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        expires_in: int,
+        content_type: str | None = None,
+        content_disposition: str | None = None,
+    ) -> str | None:
+        # Only service account keys can sign locally. Other credentials (e.g. workload
+        # identity) would need a call to the IAM signBlob API for every URL.
+        if not self._can_sign_urls or not isinstance(self._credentials, google.auth.credentials.Signing):
+            return None
+        query: dict[str, str] = {}
+        if content_type:
+            query["response-content-type"] = content_type
+        if content_disposition:
+            query["response-content-disposition"] = content_disposition
+        return generate_signed_url(
+            self._credentials,
+            bucket,
+            key,
+            expires_in=expires_in,
+            query=query,
+            now=datetime.now(timezone.utc),
+        )
+
     @backoff.on_exception(
         backoff.expo,
         RETRIABLE_EXCEPTIONS,
@@ -546,6 +590,63 @@ class GCSStorage(Storage):
         else:
             raise AttributeError("No valid uri")
 
+    @storage_ops_observer.wrap({"type": "delete_objects"})
+    async def delete_objects(self, bucket: str, keys: list[str]) -> list[str]:
+        failed: list[str] = []
+        for i in range(0, len(keys), MAX_BATCH_CALLS):
+            chunk = keys[i : i + MAX_BATCH_CALLS]
+            try:
+                failed.extend(await self._batch_delete(bucket, chunk))
+            except Exception:
+                logger.warning("Error deleting objects", exc_info=True, extra={"bucket": bucket})
+                failed.extend(chunk)
+        return failed
+
+    @backoff.on_exception(
+        backoff.expo,
+        RETRIABLE_EXCEPTIONS,
+        jitter=backoff.random_jitter,
+        max_tries=MAX_TRIES,
+    )
+    async def _batch_delete(self, bucket: str, keys: list[str]) -> list[str]:
+        """
+        Delete up to MAX_BATCH_CALLS objects in a single HTTP request using the
+        JSON API batch endpoint. Each call is sent as an `application/http` part
+        of a multipart/mixed body. Returns the keys that could not be deleted.
+        """
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for index, key in enumerate(keys):
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <{index}>\r\n"
+                "\r\n"
+                f"DELETE /storage/v1/b/{bucket}/o/{quote_plus(key)} HTTP/1.1\r\n"
+                "\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+        headers = await self.get_access_headers()
+        headers["Content-Type"] = f"multipart/mixed; boundary={boundary}"
+        async with self.session.post(
+            self._batch_url, headers=headers, data="".join(parts).encode()
+        ) as resp:
+            body = await resp.read()
+            if resp.status != 200:
+                raise GoogleCloudException(f"{resp.status}: {body.decode(errors='replace')}")
+
+        statuses = {int(index): int(status) for index, status in BATCH_RESPONSE_STATUS.findall(body)}
+        failed = []
+        for index, key in enumerate(keys):
+            status = statuses.get(index)
+            if status not in (200, 204, 404):
+                logger.warning(
+                    "Error deleting object in batch",
+                    extra={"bucket": bucket, "key": key, "status": status},
+                )
+                failed.append(key)
+        return failed
+
     @storage_ops_observer.wrap({"type": "check_bucket_exists"})
     async def check_exists(self, bucket_name: str):
         headers = await self.get_access_headers()
@@ -746,6 +847,54 @@ class GCSStorage(Storage):
                 raise GoogleCloudException(f"{resp.status}: {text}")
 
 
+def generate_signed_url(
+    credentials: google.auth.credentials.Signing,
+    bucket: str,
+    key: str,
+    *,
+    expires_in: int,
+    query: dict[str, str],
+    now: datetime,
+) -> str:
+    """
+    V4 signed URL to GET an object: https://cloud.google.com/storage/docs/access-control/signing-urls-manually
+    """
+    timestamp = now.strftime("%Y%m%dT%H%M%SZ")
+    credential_scope = f"{now.strftime('%Y%m%d')}/auto/storage/goog4_request"
+    params = {
+        **query,
+        "X-Goog-Algorithm": "GOOG4-RSA-SHA256",
+        "X-Goog-Credential": f"{credentials.signer_email}/{credential_scope}",
+        "X-Goog-Date": timestamp,
+        "X-Goog-Expires": str(min(expires_in, SIGNED_URL_MAX_EXPIRATION)),
+        "X-Goog-SignedHeaders": "host",
+    }
+    canonical_uri = f"/{bucket}/{quote(key, safe='/~')}"
+    canonical_query = "&".join(
+        f"{quote(k, safe='')}={quote(v, safe='')}" for k, v in sorted(params.items())
+    )
+    canonical_request = "\n".join(
+        [
+            "GET",
+            canonical_uri,
+            canonical_query,
+            f"host:{SIGNED_URL_HOST}\n",
+            "host",
+            "UNSIGNED-PAYLOAD",
+        ]
+    )
+    string_to_sign = "\n".join(
+        [
+            "GOOG4-RSA-SHA256",
+            timestamp,
+            credential_scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ]
+    )
+    signature = credentials.sign_bytes(string_to_sign.encode()).hex()
+    return f"https://{SIGNED_URL_HOST}{canonical_uri}?{canonical_query}&X-Goog-Signature={signature}"
+
+
 def parse_object_metadata(object_data: dict[str, Any], key: str) -> ObjectMetadata:
     custom_metadata: dict[str, str] = object_data.get("metadata") or {}
     # Lowercase all keys for backwards compatibility with old custom metadata
@@ -769,4 +918,6 @@ def parse_object_metadata(object_data: dict[str, Any], key: str) -> ObjectMetada
         filename=filename,
         size=int(size),
         content_type=content_type,
+        etag=object_data.get("md5Hash") or object_data.get("etag"),
+        last_modified=object_data.get("updated"),
     )
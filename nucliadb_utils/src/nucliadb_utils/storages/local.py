@@ -18,7 +18,7 @@ import json
 import os
 import shutil
 from collections.abc import AsyncGenerator, AsyncIterator
-from datetime import datetime
+from datetime import datetime, timezone
 
 import aiofiles
 
@@ -142,7 +142,7 @@ class LocalStorageField(StorageField):
             content_type=cf.content_type,
             size=cf.size,
         )
-        raw_metadata = json.dumps(object_metadata.model_dump())
+        raw_metadata = json.dumps(object_metadata.custom_metadata())
         path_to_create = os.path.dirname(metadata_init_url)
         os.makedirs(path_to_create, exist_ok=True)
         async with aiofiles.open(metadata_init_url, "w+") as resp:
@@ -195,6 +195,12 @@ class LocalStorageField(StorageField):
                 raw_metadata = await metadata.read()
                 metadata_dict = json.loads(raw_metadata)
                 metadata_dict = {k.lower(): v for k, v in metadata_dict.items()}
+                if os.path.exists(file_path):
+                    stat = os.stat(file_path)
+                    metadata_dict["etag"] = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+                    metadata_dict["last_modified"] = datetime.fromtimestamp(
+                        stat.st_mtime, tz=timezone.utc
+                    )
                 return ObjectMetadata.model_validate(metadata_dict)
         return None
 
@@ -235,6 +241,9 @@ class LocalStorage(Storage):
     def get_file_path(self, bucket: str, key: str):
         return f"{self.get_bucket_path(bucket)}/{key}"
 
+    def local_file_path(self, bucket: str, key: str) -> str | None:
+        return self.get_file_path(bucket, key)
+
     async def create_kb(self, kbid: str):
         bucket = self.get_bucket_name(kbid)
         try:
@@ -311,4 +320,4 @@ class LocalStorage(Storage):
             size=len(data),
         )
         with open(metadata_path, "w") as file:
-            file.write(json.dumps(metadata.model_dump()))
+            file.write(json.dumps(metadata.custom_metadata()))
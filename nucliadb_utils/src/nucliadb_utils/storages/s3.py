@@ -41,6 +41,8 @@ MB = 1024 * 1024
 MIN_UPLOAD_SIZE = 5 * MB
 CHUNK_SIZE = MIN_UPLOAD_SIZE
 MAX_TRIES = 3
+# Max number of keys accepted by a single DeleteObjects request
+MAX_DELETE_OBJECTS = 1000
 
 RETRIABLE_EXCEPTIONS = (
     botocore.exceptions.ClientError,
@@ -457,6 +459,32 @@ class S3Storage(Storage):
         else:
             raise AttributeError("No valid uri")
 
+    @s3_ops_observer.wrap({"type": "delete_objects"})
+    async def delete_objects(self, bucket: str, keys: list[str]) -> list[str]:
+        failed: list[str] = []
+        for i in range(0, len(keys), MAX_DELETE_OBJECTS):
+            chunk = keys[i : i + MAX_DELETE_OBJECTS]
+            try:
+                response = await self._s3aioclient.delete_objects(
+                    Bucket=bucket,
+                    Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+                )
+            except botocore.exceptions.ClientError:
+                logger.warning("Error deleting objects", exc_info=True, extra={"bucket": bucket})
+                failed.extend(chunk)
+                continue
+            for error in response.get("Errors") or []:
+                logger.warning(
+                    "Error deleting object",
+                    extra={
+                        "key": error.get("Key"),
+                        "code": error.get("Code"),
+                        "error": error.get("Message"),
+                    },
+                )
+                failed.append(error["Key"])
+        return failed
+
     async def iterate_objects(
         self, bucket: str, prefix: str = "/", start: str | None = None
     ) -> AsyncGenerator[ObjectInfo]:
@@ -467,6 +495,25 @@ class S3Storage(Storage):
             for item in result.get("Contents") or []:
                 yield ObjectInfo(name=item["Key"])
 
+    async def presigned_url(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        expires_in: int,
+        content_type: str | None = None,
+        content_disposition: str | None = None,
+    ) -> str | None:
+        params = {"Bucket": bucket, "Key": key}
+        if content_type:
+            params["ResponseContentType"] = content_type
+        if content_disposition:
+            params["ResponseContentDisposition"] = content_disposition
+        # Signing happens locally, no request is made to S3
+        return await self._s3aioclient.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_in
+        )
+
     async def create_kb(self, kbid: str):
         bucket_name = self.get_bucket_name(kbid)
         return await self._create_bucket_if_not_exists(bucket_name)
@@ -657,4 +704,15 @@ def parse_object_metadata(obj: dict, key: str) -> ObjectMetadata:
     else:
         filename = custom_metadata.get("filename") or key.split("/")[-1]
 
-    return ObjectMetadata(size=size, content_type=content_type, filename=filename)
+    # ETag
+    etag = obj.get("ETag")
+    if etag:
+        etag = etag.strip('"')
+
+    return ObjectMetadata(
+        size=size,
+        content_type=content_type,
+        filename=filename,
+        etag=etag,
+        last_modified=obj.get("LastModified"),
+    )
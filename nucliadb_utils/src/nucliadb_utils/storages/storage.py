@@ -30,10 +30,14 @@ from nidx_protos.nodewriter_pb2 import IndexMessage
 
 from nucliadb_protos.resources_pb2 import CloudFile
 from nucliadb_protos.writer_pb2 import BrokerMessage
-from nucliadb_utils import logger
+from nucliadb_utils import deadline, logger
 from nucliadb_utils.helpers import async_gen_lookahead
 from nucliadb_utils.storages import CHUNK_SIZE
-from nucliadb_utils.storages.exceptions import IndexDataNotFound, InvalidCloudFile
+from nucliadb_utils.storages.exceptions import (
+    CouldNotDeleteObjects,
+    IndexDataNotFound,
+    InvalidCloudFile,
+)
 from nucliadb_utils.storages.utils import ObjectInfo, ObjectMetadata, Range
 from nucliadb_utils.utilities import get_local_storage, get_nuclia_storage
 
@@ -49,6 +53,9 @@ INDEXING_KEY = "index/{kb}/{shard}/{resource}/{txid}"
 # temporary storage for large stream data
 MESSAGE_KEY = "message/{kbid}/{rid}/{mid}"
 
+# Number of keys listed before deleting them with a bulk delete
+DELETE_OBJECTS_PAGE_SIZE = 1000
+
 
 class StorageField(abc.ABC, metaclass=abc.ABCMeta):
     storage: Storage
@@ -131,20 +138,46 @@ class Storage(abc.ABC, metaclass=abc.ABCMeta):
         Parameters:
         - kbid: the knowledge box id
         - uuid: the resource uuid
-        - max_parallel: the maximum number of parallel deletes
+
+        Raises CouldNotDeleteObjects if some of its keys could not be deleted.
         """
         bucket = self.get_bucket_name(kbid)
         resource_storage_base_path = STORAGE_RESOURCE.format(kbid=kbid, uuid=uuid)
+        failed: list[str] = []
+        keys = []
+        async for object_info in self.iterate_objects(bucket, resource_storage_base_path):
+            keys.append(object_info.name)
+            if len(keys) >= DELETE_OBJECTS_PAGE_SIZE:
+                failed.extend(await self.delete_objects(bucket, keys))
+                keys = []
+        if keys:
+            failed.extend(await self.delete_objects(bucket, keys))
+        if failed:
+            raise CouldNotDeleteObjects(bucket, failed)
+
+    async def delete_objects(self, bucket: str, keys: list[str]) -> list[str]:
+        """
+        Delete many objects of a bucket. Objects that don't exist are ignored.
+        Returns the keys that could not be deleted.
+
+        This default implementation deletes objects one by one with bounded
+        concurrency, drivers with a bulk delete API should override it.
+        """
         semaphore = asyncio.Semaphore(20)
 
-        async def _delete_object(object_info: ObjectInfo):
+        async def _delete_object(key: str) -> bool:
             async with semaphore:
-                await self.delete_upload(object_info.name, bucket)
-
-        tasks = []
-        async for object_info in self.iterate_objects(bucket, resource_storage_base_path):
-            tasks.append(asyncio.create_task(_delete_object(object_info)))
-        await asyncio.gather(*tasks)
+                try:
+                    await self.delete_upload(key, bucket)
+                except KeyError:
+                    pass
+                except Exception:
+                    logger.warning("Error deleting object", exc_info=True, extra={"key": key})
+                    return False
+                return True
+
+        deleted = await asyncio.gather(*(_delete_object(key) for key in keys))
+        return [key for key, ok in zip(keys, deleted) if not ok]
 
     async def deadletter(self, message: BrokerMessage, seq: int, seqid: int, partition: str):
         if self.deadletter_bucket is None:
@@ -428,11 +461,35 @@ class Storage(abc.ABC, metaclass=abc.ABCMeta):
     ) -> AsyncGenerator[bytes]:
         destination: StorageField = self.field_klass(storage=self, bucket=bucket, fullkey=key)
         try:
-            async for data in destination.iter_data(range=range):
+            async for data in deadline.iter_until_deadline(destination.iter_data(range=range)):
                 yield data
         except KeyError:
             pass
 
+    async def presigned_url(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        expires_in: int,
+        content_type: str | None = None,
+        content_disposition: str | None = None,
+    ) -> str | None:
+        """
+        Short-lived URL that lets a client GET the object (range requests
+        included) straight from the storage backend. The content type and
+        disposition of the response can be overridden. Returns None if the
+        backend or its credentials can't sign URLs.
+        """
+        return None
+
+    def local_file_path(self, bucket: str, key: str) -> str | None:
+        """
+        Path of the object in the local filesystem, if the backend stores
+        objects as plain files.
+        """
+        return None
+
     async def downloadbytes(self, bucket: str, key: str) -> BytesIO:
         result = BytesIO()
         async for data in self.download(bucket, key):
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel
 
@@ -25,6 +27,13 @@ class ObjectMetadata(BaseModel):
     filename: str
     content_type: str
     size: int
+    # Set by the storage when reading the object, never stored as custom metadata:
+    # an opaque version identifier of the contents and the last write time
+    etag: str | None = None
+    last_modified: datetime | None = None
+
+    def custom_metadata(self) -> dict[str, Any]:
+        return self.model_dump(exclude={"etag", "last_modified"})
 
 
 @dataclass
@@ -13,6 +13,8 @@
 # limitations under the License.
 from uuid import uuid4
 
+import aiohttp
+
 from nucliadb_protos.resources_pb2 import CloudFile
 from nucliadb_utils.storages.azure import AzureStorage
 from nucliadb_utils.storages.gcs import GCSStorage
@@ -51,6 +53,55 @@ async def test_local_driver(local_storage: LocalStorage):
     await delete_kb_test(local_storage)
 
 
+async def test_azure_presigned_url(azure_storage: AzureStorage):
+    await presigned_url_test(azure_storage)
+
+
+async def test_s3_presigned_url(s3_storage: S3Storage):
+    await presigned_url_test(s3_storage)
+
+
+async def test_local_file_path(local_storage: LocalStorage):
+    kbid = uuid4().hex
+    await local_storage.create_kb(kbid)
+    bucket = local_storage.get_bucket_name(kbid)
+    await local_storage.uploadbytes(bucket, "file", b"lorem ipsum")
+
+    path = local_storage.local_file_path(bucket, "file")
+    assert path is not None
+    with open(path, "rb") as f:
+        assert f.read() == b"lorem ipsum"
+    assert await local_storage.presigned_url(bucket, "file", expires_in=60) is None
+
+
+async def presigned_url_test(storage: Storage):
+    kbid = uuid4().hex
+    await storage.create_kb(kbid)
+    bucket = storage.get_bucket_name(kbid)
+    await storage.uploadbytes(bucket, "file", b"lorem ipsum")
+
+    url = await storage.presigned_url(
+        bucket,
+        "file",
+        expires_in=60,
+        content_type="text/plain",
+        content_disposition='attachment; filename="lorem.txt"',
+    )
+    assert url is not None
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as resp:
+            assert resp.status == 200
+            assert await resp.read() == b"lorem ipsum"
+            assert resp.headers["Content-Type"] == "text/plain"
+            assert resp.headers["Content-Disposition"] == 'attachment; filename="lorem.txt"'
+
+        async with session.get(url, headers={"Range": "bytes=6-"}) as resp:
+            assert resp.status == 206
+            assert await resp.read() == b"ipsum"
+
+    await storage.delete_kb(kbid)
+
+
 async def delete_kb_conflict_test(storage: Storage):
     kbid = uuid4().hex
     await storage.create_kb(kbid)
@@ -134,6 +185,7 @@ async def storage_test(storage: Storage):
 
     await _test_exists_object(storage)
     await _test_iterate_objects(storage)
+    await _test_delete_objects(storage)
 
     # Check insert object
     key = "barbafoo"
@@ -185,3 +237,18 @@ async def _test_iterate_objects(storage: Storage):
         async for object_info in storage.iterate_objects(bucket, prefix="key", start="key0/foo")
     ]
     assert keys == [f"key{i}/foo" for i in range(1, 10)]
+
+
+async def _test_delete_objects(storage: Storage):
+    bucket = "deletetest"
+    await storage.create_bucket(bucket)
+
+    for i in range(5):
+        await storage.upload_object(bucket, f"key{i}/foo", b"mytestinfo")
+
+    # Unexisting keys are ignored
+    failed = await storage.delete_objects(bucket, ["key0/foo", "key2/foo", "key4/foo", "unexisting"])
+    assert failed == []
+
+    keys = [object_info.name async for object_info in storage.iterate_objects(bucket, prefix="")]
+    assert keys == ["key1/foo", "key3/foo"]
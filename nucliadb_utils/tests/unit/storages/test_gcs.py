@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, Mock, call, patch
 
 import aiohttp
@@ -22,6 +23,7 @@ from nucliadb_utils.storages.gcs import (
     GCSStorageField,
     GoogleCloudException,
     ReadingResponseContentException,
+    generate_signed_url,
 )
 
 
@@ -107,3 +109,38 @@ async def test_delete_kb_errors():
     deleted, conflict = await storage.delete_kb(kbid)
     assert not deleted
     assert not conflict
+
+
+def test_generate_signed_url():
+    credentials = Mock(signer_email="sa@project.iam.gserviceaccount.com")
+    credentials.sign_bytes.return_value = b"\x01\xab"
+
+    url = generate_signed_url(
+        credentials,
+        "bucket",
+        "kbs/kbid/r/rid/f/f/file name",
+        expires_in=300,
+        query={"response-content-disposition": 'attachment; filename="a b.pdf"'},
+        now=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    )
+
+    assert url.startswith("https://storage.googleapis.com/bucket/kbs/kbid/r/rid/f/f/file%20name?")
+    assert url.endswith("&X-Goog-Signature=01ab")
+    assert "X-Goog-Algorithm=GOOG4-RSA-SHA256" in url
+    assert (
+        "X-Goog-Credential=sa%40project.iam.gserviceaccount.com%2F20240102%2Fauto%2Fstorage%2Fgoog4_request"
+        in url
+    )
+    assert "X-Goog-Date=20240102T030405Z" in url
+    assert "X-Goog-Expires=300" in url
+    assert "response-content-disposition=attachment%3B%20filename%3D%22a%20b.pdf%22" in url
+
+    string_to_sign = credentials.sign_bytes.call_args[0][0].decode()
+    assert string_to_sign.startswith(
+        "GOOG4-RSA-SHA256\n20240102T030405Z\n20240102/auto/storage/goog4_request\n"
+    )
+
+
+async def test_presigned_url_needs_signing_credentials():
+    storage = GCSStorage(anonymous=True)
+    assert await storage.presigned_url("bucket", "key", expires_in=60) is None
@@ -21,6 +21,7 @@ from nidx_protos.noderesources_pb2 import ResourceID
 from nidx_protos.nodewriter_pb2 import IndexMessage
 
 from nucliadb_protos.resources_pb2 import CloudFile
+from nucliadb_utils.storages.exceptions import CouldNotDeleteObjects
 from nucliadb_utils.storages.local import LocalStorageField
 from nucliadb_utils.storages.storage import (
     ObjectInfo,
@@ -106,6 +107,12 @@ class TestStorage:
         await storage.delete_resource("bucket", "uri")
         storage.delete_upload.assert_called_once_with("uri", "bucket")  # type: ignore[ty:unresolved-attribute]
 
+    async def test_delete_resource_failures(self, storage: StorageTest):
+        storage.delete_upload.side_effect = Exception("boom")  # type: ignore[ty:unresolved-attribute]
+        with pytest.raises(CouldNotDeleteObjects) as exc_info:
+            await storage.delete_resource("bucket", "uri")
+        assert exc_info.value.keys == ["uri"]
+
     async def test_indexing(self, storage: StorageTest):
         msg = BrainResource(resource=ResourceID(uuid="uuid"))
         await storage.indexing(msg, 1, "1", "kb", "shard")
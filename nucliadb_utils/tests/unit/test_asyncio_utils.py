@@ -18,7 +18,12 @@ from typing import Coroutine
 
 import pytest
 
-from nucliadb_utils.asyncio_utils import ConcurrentRunner, run_concurrently
+from nucliadb_utils.asyncio_utils import (
+    AdaptiveLimiter,
+    ConcurrentRunner,
+    RequestLimiter,
+    run_concurrently,
+)
 
 
 async def test_run_concurrently():
@@ -66,3 +71,95 @@ async def test_concurrent_runner():
         runner = ConcurrentRunner()
         runner.schedule(coro_with_exception())
         await runner.wait()
+
+
+class TestAdaptiveLimiter:
+    @staticmethod
+    async def run(limiter: AdaptiveLimiter | RequestLimiter, ops: int, duration: float) -> int:
+        running = 0
+        max_running = 0
+
+        async def op():
+            nonlocal running, max_running
+            async with limiter.slot():
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(duration)
+                running -= 1
+
+        await asyncio.gather(*[op() for _ in range(ops)])
+        return max_running
+
+    async def test_limits_concurrency(self):
+        limiter = AdaptiveLimiter("test", initial_limit=2, min_limit=2, max_limit=2, latency_threshold=1)
+        assert await self.run(limiter, ops=10, duration=0.01) == 2
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+
+    async def test_grows_with_fast_operations(self):
+        limiter = AdaptiveLimiter(
+            "test", initial_limit=2, min_limit=1, max_limit=10, latency_threshold=1
+        )
+        await self.run(limiter, ops=50, duration=0.001)
+        assert limiter.limit > 2
+
+    async def test_does_not_grow_when_not_saturated(self):
+        limiter = AdaptiveLimiter(
+            "test", initial_limit=5, min_limit=1, max_limit=10, latency_threshold=1
+        )
+        for _ in range(20):
+            await self.run(limiter, ops=1, duration=0)
+        assert limiter.limit == 5
+
+    async def test_backs_off_with_slow_operations(self):
+        limiter = AdaptiveLimiter(
+            "test", initial_limit=8, min_limit=2, max_limit=10, latency_threshold=0.01
+        )
+        await self.run(limiter, ops=8, duration=0.02)
+        # all operations were slow, but the limit only backs off once per
+        # latency threshold
+        assert limiter.limit == 6
+
+        for _ in range(10):
+            await self.run(limiter, ops=1, duration=0.02)
+        assert limiter.limit == 2
+
+    async def test_cancelled_waiters_do_not_leak_slots(self):
+        limiter = AdaptiveLimiter("test", initial_limit=1, min_limit=1, max_limit=1, latency_threshold=1)
+
+        async def op():
+            async with limiter.slot():
+                await asyncio.sleep(0.01)
+
+        running = asyncio.create_task(op())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(op())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+
+        waiting.cancel()
+        await asyncio.gather(running, waiting, return_exceptions=True)
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+        assert await self.run(limiter, ops=2, duration=0) == 1
+
+    def test_clamps_inconsistent_limits(self):
+        limiter = AdaptiveLimiter(
+            "test", initial_limit=100, min_limit=10, max_limit=5, latency_threshold=1
+        )
+        assert limiter.max_limit == 5
+        assert limiter.min_limit == 5
+        assert limiter.limit == 5
+
+    async def test_request_limiter_bounds_each_request(self):
+        shared = AdaptiveLimiter(
+            "test", initial_limit=10, min_limit=10, max_limit=10, latency_threshold=1
+        )
+        first, second = RequestLimiter(3, shared=shared), RequestLimiter(3, shared=shared)
+        # each request is bounded on its own while sharing the process-wide limit
+        assert await asyncio.gather(
+            self.run(first, ops=10, duration=0.01), self.run(second, ops=10, duration=0.01)
+        ) == [3, 3]
+        assert shared.in_flight == 0
+
+        assert await self.run(RequestLimiter(2), ops=10, duration=0) == 2
@@ -0,0 +1,91 @@
+# Copyright 2021 Bosutech XXI S.L.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+
+import pytest
+
+from nucliadb_utils import deadline
+from nucliadb_utils.exceptions import DeadlineExceededError
+
+
+async def test_no_deadline():
+    assert deadline.remaining() is None
+    assert not deadline.exceeded()
+    assert deadline.get_timeout() is None
+    assert deadline.get_timeout(5) == 5
+
+
+async def test_deadline_bounds_timeouts():
+    deadline.set_deadline(1)
+    assert deadline.get_timeout(5) <= 1
+    assert deadline.get_timeout(0.5) == 0.5
+    assert deadline.get_timeout() <= 1
+
+    # can only be shortened
+    deadline.set_deadline(10)
+    assert deadline.remaining() <= 1
+    deadline.set_deadline(0.1)
+    assert deadline.remaining() <= 0.1
+
+
+async def test_deadline_exceeded():
+    deadline.set_deadline(0.01)
+    await asyncio.sleep(0.02)
+    assert deadline.exceeded()
+    with pytest.raises(DeadlineExceededError):
+        deadline.get_timeout(5)
+
+
+async def test_wait_for():
+    deadline.set_deadline(0.1)
+    assert await deadline.wait_for(asyncio.sleep(0, result=1)) == 1
+
+    # a timeout shorter than the deadline is a regular timeout
+    with pytest.raises(asyncio.TimeoutError) as exc_info:
+        await deadline.wait_for(asyncio.sleep(1), timeout=0.01)
+    assert not isinstance(exc_info.value, DeadlineExceededError)
+
+    with pytest.raises(DeadlineExceededError):
+        await deadline.wait_for(asyncio.sleep(1))
+
+    # no time left, the awaitable is not even started
+    coro = asyncio.sleep(1)
+    with pytest.raises(DeadlineExceededError):
+        await deadline.wait_for(coro)
+    assert coro.cr_frame is None
+
+
+async def test_iter_until_deadline():
+    closed = False
+
+    async def iterator(delay: float):
+        nonlocal closed
+        try:
+            for i in range(5):
+                await asyncio.sleep(0 if i < 3 else delay)
+                yield i
+        finally:
+            closed = True
+
+    assert [i async for i in deadline.iter_until_deadline(iterator(0.01))] == list(range(5))
+    assert closed
+
+    closed = False
+    deadline.set_deadline(0.1)
+    items = []
+    with pytest.raises(DeadlineExceededError):
+        async for i in deadline.iter_until_deadline(iterator(1)):
+            items.append(i)
+    assert items == [0, 1, 2]
+    assert closed